@@ -0,0 +1,63 @@
+"""
+Measures the throughput of a FrozenProfile that is shared by several threads,
+and of transform(df, n_threads=...), which calls the converters of different columns concurrently.
+Also checks that all concurrent results equal the single-threaded result.
+
+Usage: python benchmarks/concurrent_transform.py [n_rows]
+"""
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from clevertable import Binary, ConversionProfile, HashedOneHot, Map
+
+
+def make_data(n_rows: int) -> pd.DataFrame:
+    rng = random.Random(0)
+    return pd.DataFrame({
+        "age": [rng.randint(18, 90) for _ in range(n_rows)],
+        "smoker": [rng.choice(["yes", "no"]) for _ in range(n_rows)],
+        "level": [rng.randint(0, 2) for _ in range(n_rows)],
+        "user": [f"user {rng.randint(0, 100_000)}" for _ in range(n_rows)],
+        "country": [rng.choice(["de", "fr", "it", "es", "pl", "nl"]) for _ in range(n_rows)],
+    })
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    df = make_data(n_rows)
+    profile = ConversionProfile({
+        "smoker": Binary(positive="yes"),
+        "level": Map({0: "low", 1: "mid", 2: "high"}),
+        "user": HashedOneHot(16),
+    }, pre_processing=None).fit(df)
+    frozen = profile.freeze()
+    expected = frozen.transform(df)
+
+    print(f"transform() of {n_rows} rows")
+    for n_threads in (1, 2, 4):
+        start = time.perf_counter()
+        result = frozen.transform(df, n_threads=n_threads)
+        elapsed = time.perf_counter() - start
+        pd.testing.assert_frame_equal(result, expected)
+        print(f"  n_threads={n_threads}: {elapsed:6.3f} s")
+
+    records = df.iloc[:20_000].to_dict(orient="records")
+    expected_records = [frozen.transform_single(record) for record in records]
+    print(f"transform_single() of {len(records)} records, shared by all threads")
+    for n_threads in (1, 2, 4, 8):
+        chunks = [records[i::n_threads] for i in range(n_threads)]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(n_threads) as executor:
+            results = list(executor.map(lambda chunk: [frozen.transform_single(r) for r in chunk], chunks))
+        elapsed = time.perf_counter() - start
+        for i, chunk_results in enumerate(results):
+            assert chunk_results == expected_records[i::n_threads]
+        print(f"  {n_threads} threads: {len(records) / elapsed:9.0f} records/s")
+
+
+if __name__ == "__main__":
+    main()
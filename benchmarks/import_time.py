@@ -0,0 +1,50 @@
+"""
+Measures how long it takes to import clevertable in a fresh interpreter,
+and which heavy dependencies are loaded on the way.
+
+Usage: python benchmarks/import_time.py [repetitions]
+"""
+import json
+import statistics
+import subprocess
+import sys
+
+SCENARIOS = {
+    "import clevertable": "import clevertable",
+    "RecordProfile": "from clevertable.RecordProfile import RecordProfile; RecordProfile()",
+    "converters": "from clevertable import Binary, OneHot, Float, Map",
+    "ConversionProfile": "from clevertable import ConversionProfile; ConversionProfile()",
+    "ConversionProfile.fit": "import pandas as pd; from clevertable import ConversionProfile;"
+                             " ConversionProfile().fit(pd.DataFrame({'a': [1, 2]}))",
+}
+
+HEAVY_MODULES = ["pandas", "numpy", "openpyxl"]
+
+_MEASURE = """
+import sys, time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+import json
+print(json.dumps([elapsed, [m for m in {heavy!r} if m in sys.modules]]))
+"""
+
+
+def measure(code: str) -> tuple[float, list[str]]:
+    script = _MEASURE.format(code=code, heavy=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True).stdout
+    elapsed, loaded = json.loads(output)
+    return elapsed, loaded
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    for name, code in SCENARIOS.items():
+        results = [measure(code) for _ in range(repetitions)]
+        median_ms = statistics.median(elapsed for elapsed, _ in results) * 1000
+        loaded = ", ".join(results[0][1]) or "-"
+        print(f"{name:<25} {median_ms:8.1f} ms   heavy modules loaded: {loaded}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Measures the latency of transforming single records with DataFrameProfile.transform_single()
+and RecordProfile.transform(), as in a service that transforms one request at a time.
+
+Usage: python benchmarks/transform_latency.py [repetitions]
+"""
+import random
+import statistics
+import sys
+import time
+
+import pandas as pd
+
+from clevertable import ConversionProfile, Map, OneHot
+
+
+def make_data(n_rows: int = 1000) -> pd.DataFrame:
+    rng = random.Random(0)
+    return pd.DataFrame({
+        "age": [rng.randint(18, 90) for _ in range(n_rows)],
+        "income": [rng.random() * 100_000 for _ in range(n_rows)],
+        "smoker": [rng.choice(["yes", "no"]) for _ in range(n_rows)],
+        "country": [rng.choice(["de", "fr", "it", "es", "pl", "nl", "be", "at", "ch", "dk", "se", "no"])
+                    for _ in range(n_rows)],
+        "city": [f"city {rng.randint(0, 80)}" for _ in range(n_rows)],
+        "level": [rng.choice(["low", "mid", "high"]) for _ in range(n_rows)],
+        "color": [rng.choice(["red", "green", "blue"]) for _ in range(n_rows)],
+    })
+
+
+def percentiles(func, records: list, repetitions: int) -> tuple[float, float]:
+    timings = []
+    for _ in range(repetitions):
+        for record in records:
+            start = time.perf_counter_ns()
+            func(record)
+            timings.append(time.perf_counter_ns() - start)
+    timings.sort()
+    p50 = statistics.median(timings)
+    p99 = timings[int(len(timings) * 0.99)]
+    return p50 / 1000, p99 / 1000  # in microseconds
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    df = make_data()
+    profile = ConversionProfile({
+        "level": Map({"low": 0, "mid": 1, "high": 2}),
+        "color": OneHot(),
+    })
+    profile.fit(df)
+    records = df.to_dict(orient="records")
+    record_profile = profile._record_profile
+    wrapped = [(d,) for d in records]
+    checked = record_profile._RecordProfile__transform_checked  # the per-key path without the precomputed plan
+
+    for name, func, data in [
+        ("transform_single()", profile.transform_single, records),
+        ("RecordProfile.transform()", record_profile.transform, wrapped),
+        ("without scalar fast path", checked, records),
+    ]:
+        p50, p99 = percentiles(func, data, repetitions)
+        print(f"{name:<28} p50: {p50:7.2f} us   p99: {p99:7.2f} us")
+
+
+if __name__ == "__main__":
+    main()
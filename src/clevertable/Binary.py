@@ -1,12 +1,20 @@
 from __future__ import annotations
 
-from typing import Iterable
+from typing import Iterable, Callable, TYPE_CHECKING
 
 from .Converter import Converter
+from ._utils import _isin, _describe_rows, _lookup_array, _output_matrix
+
+if TYPE_CHECKING:
+    import numpy as np
 
 _COMMON_POSITIVE_STRINGS = {"yes", "true", "positive", "1", "female"}
 _COMMON_NEGATIVE_STRINGS = {"no", "false", "negative", "0", "male", "none"}
 
+# shared output rows of transform_batch()
+_POSITIVE = (1,)
+_NEGATIVE = (0,)
+
 
 class Binary(Converter):
 
@@ -47,12 +55,25 @@ class Binary(Converter):
             # -> no need to infer them from the data
             return
 
+        self.fit_merged(self.partial_fit(rows))
+
+    def partial_fit(self, rows: list[tuple]) -> set:
+        if self.positive or self.negative:
+            return set()  # nothing to infer
         values = [row[0] for row in rows]  # unpack 1-element rows
+        return set(values)
+
+    def partial_fit_distinct(self, rows: list[tuple], counts: list[int]) -> set:
+        return self.partial_fit(rows)  # only the distinct values matter
 
-        # infer positive and negative values from the data
+    def fit_merged(self, summary: set):
+        if self.positive or self.negative:
+            return
+
+        # infer positive and negative values from the distinct values of the data
 
         # union with common positive and negative values
-        values = set(values)
+        values = summary
         common_positive = values.intersection(_COMMON_POSITIVE_STRINGS)
         common_negative = values.intersection(_COMMON_NEGATIVE_STRINGS)
 
@@ -67,16 +88,66 @@ class Binary(Converter):
         self.negative = {sorted(values)[0]}
 
     def transform(self, row: tuple) -> tuple:
-        val = row[0]  # unpack 1-element tuple
+        return (self.__transform_value(row[0]),)  # unpack and wrap again
 
+    def scalar_transform(self) -> Callable[[any], int]:
+        return self.__transform_value
+
+    def __transform_value(self, val: any) -> int:
         if self.positive and self.negative:
             # ensure the value is either in positive or in negative
             if val not in self.positive and val not in self.negative:
                 raise ValueError(f"Value '{val}' is neither in the positive nor in the negative values.")
         if self.positive:
-            return (int(val in self.positive),)
+            return int(val in self.positive)
         else:
-            return (1 - int(val in self.negative),)
+            return 1 - int(val in self.negative)
+
+    def transform_batch(self, rows: list[tuple]) -> list[tuple]:
+        values = [row[0] for row in rows]  # unpack 1-element tuples
+
+        # look up all values at once
+        if self.positive:
+            is_positive = _isin(values, self.positive)
+        if self.negative:
+            is_negative = _isin(values, self.negative)
+
+        if self.positive and self.negative:
+            # ensure all values are either in positive or in negative
+            unknown = [i for i, (pos, neg) in enumerate(zip(is_positive, is_negative)) if not (pos or neg)]
+            if unknown:
+                raise ValueError(f"Values are neither in the positive nor in the negative values:"
+                                 f" {_describe_rows(values, unknown)}")
+        if self.positive:
+            return [_POSITIVE if pos else _NEGATIVE for pos in is_positive]
+        return [_NEGATIVE if neg else _POSITIVE for neg in is_negative]
+
+    def try_transform_batch(self, rows: list[tuple]) -> list[tuple | None] | None:
+        if not all(rows):
+            return None  # empty rows -> transform() raises the appropriate error
+        try:
+            if not (self.positive and self.negative):
+                return self.transform_batch(rows)  # every value is either positive or negative
+            values = [row[0] for row in rows]  # unpack 1-element tuples
+            is_positive = _isin(values, self.positive)
+            is_negative = _isin(values, self.negative)
+        except TypeError:  # unhashable values
+            return None
+        return [_POSITIVE if pos else _NEGATIVE if neg else None
+                for pos, neg in zip(is_positive, is_negative)]
+
+    def inverse_transform(self, outputs: np.ndarray) -> np.ndarray:
+        """
+        Decodes values of at least 0.5 to the positive value, and smaller values to the negative value.
+        If there are several positive or negative values, the smallest one is used.
+        If there is none, the rows are decoded to ``None``, as is NaN.
+        """
+        import numpy as np  # imported here, as NumPy is slow to import
+
+        flags = _output_matrix(outputs, 1, self)[:, 0].astype(np.float64)
+        index = (flags >= 0.5).astype(np.intp)
+        index[np.isnan(flags)] = -1  # -> None
+        return _lookup_array((_smallest(self.negative), _smallest(self.positive)))[index]
 
     def __repr__(self):
         args = []
@@ -85,3 +156,12 @@ class Binary(Converter):
         if self.__args_negative is not None:
             args.append(f"negative={repr(self.__args_negative)}")
         return f"Binary({', '.join(args)})"
+
+
+def _smallest(values: set) -> any:
+    if not values:
+        return None
+    try:
+        return min(values)
+    except TypeError:  # not comparable
+        return min(values, key=repr)
@@ -3,11 +3,25 @@ from __future__ import annotations
 from .Function import Function
 
 
+class _Constant:
+    # a picklable replacement for ``lambda _: val``
+
+    def __init__(self, val: any):
+        self.val = val
+        self.__name__ = f"Const({val})"
+
+    def __call__(self, _: any) -> any:
+        return self.val
+
+
 class Const(Function):
 
     def __init__(self, val: any):
         self.__val = val
-        super().__init__(lambda _: val)
+        super().__init__(_Constant(val))
+
+    def try_transform_batch(self, rows: list[tuple]) -> list[tuple | None]:
+        return self.transform_batch(rows)  # never fails
 
     def __repr__(self):
         return f"Const({self.__val})"
@@ -1,14 +1,23 @@
 from __future__ import annotations
 
 import math
-from typing import Optional, Callable
-
-import pandas as pd
+import pickle
+from typing import Optional, Callable, Iterator, Literal, TYPE_CHECKING
 
 from .DataFrameProfile import DataFrameProfile
+from .FitCache import FitCache
+from .Progress import Progress
+from .TransformFailure import TransformFailure
+from ._progress import _ProgressTracker, _tracking
+from ._readers import _read_xlsx, _xlsx_sheet_names, _iter_xlsx_chunks, _count_xlsx_rows
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def _get_dataframe(obj: pd.DataFrame | str) -> pd.DataFrame:
+    import pandas as pd  # imported here, as pandas is slow to import
+
     if isinstance(obj, pd.DataFrame):
         return obj
     elif type(obj) is str:
@@ -18,7 +27,7 @@ def _get_dataframe(obj: pd.DataFrame | str) -> pd.DataFrame:
         elif obj.endswith(".tsv"):
             return pd.read_csv(obj, sep="\t")
         elif obj.endswith(".xlsx"):
-            return pd.read_excel(obj)
+            return _read_xlsx(obj)
         else:
             raise ValueError(f"Cannot read file {obj} because the file extension is not supported."
                              f" Supported extensions: .csv, .tsv, .xlsx")
@@ -26,6 +35,13 @@ def _get_dataframe(obj: pd.DataFrame | str) -> pd.DataFrame:
         raise ValueError(f"Cannot load DataFrame from object of type {type(obj)}")
 
 
+def _read_dataframe(obj: pd.DataFrame | str, progress: _ProgressTracker) -> pd.DataFrame:
+    # like _get_dataframe(), but reports the reading of files
+    if isinstance(obj, str):
+        progress.phase("read")
+    return _get_dataframe(obj)
+
+
 def default_preprocessing(val: any) -> any:
     if type(val) is float:
         if math.isnan(val):
@@ -41,36 +57,176 @@ class ConversionProfile(DataFrameProfile):
     def __init__(self, profile: dict[str, any] = None,
                  ignore_undefined: bool = False,
                  ignore_uninferrable: bool = False,
-                 pre_processing: Optional[Callable[[any], any]] = default_preprocessing):
-        super().__init__(profile, ignore_undefined, ignore_uninferrable, pre_processing)
+                 pre_processing: Optional[Callable[[any], any]] = default_preprocessing,
+                 hash_buckets: int = None,
+                 max_categories: int = None,
+                 min_frequency: int = None):
+        super().__init__(profile, ignore_undefined, ignore_uninferrable, pre_processing, hash_buckets,
+                         max_categories, min_frequency)
 
-    def fit(self, obj: pd.DataFrame | str) -> 'ConversionProfile':
+    def fit(self, obj: pd.DataFrame | str, cache: FitCache | str = None,
+            progress: Callable[[Progress], None] = None) -> 'ConversionProfile':
         """
         Fit the conversion profile to the given DataFrame.
         If a filename is given, the DataFrame is loaded from the file first.
         :param obj: DataFrame or filename
+        :param cache: A :class:`FitCache` or the directory of one.
+               If the same profile was already fitted to the same data, the fitted state is loaded from the cache
+               instead of fitting again (and a file is not even read). Otherwise, the fitted state is stored in it.
+        :param progress: A function that is called with a :class:`Progress` whenever a phase starts
+               (reading the file, pre-processing, and the fit of each key), and with the metrics of the whole job
+               at the end.
         :return: self
         """
-        super().fit(_get_dataframe(obj))
+        with _tracking(progress) as tracker:
+            if cache is None:
+                super().fit(_read_dataframe(obj, tracker), tracker)
+                return self
+
+            if isinstance(cache, str):
+                cache = FitCache(cache)
+            if isinstance(obj, str):
+                tracker.phase("read")  # the file is hashed
+            key = cache.fingerprint(obj, self)  # before fitting, as fitting changes the converters
+            record_profile = cache.load(key)
+            if record_profile is not None:
+                self._record_profile = record_profile
+                return self
+            super().fit(_read_dataframe(obj, tracker), tracker)
+            cache.store(key, self._record_profile)
         return self
 
-    def transform(self, obj: pd.DataFrame | str) -> pd.DataFrame:
+    def partial_fit(self, obj: pd.DataFrame | str) -> dict[str, any]:
+        """
+        Summarize a part of the data, for fitting the conversion profile on data that is split into several parts.
+        If a filename is given, the DataFrame is loaded from the file first.
+        See :meth:`DataFrameProfile.partial_fit` and :meth:`DataFrameProfile.merge`.
+        :param obj: DataFrame or filename
+        :return: A picklable summary of the part.
+        """
+        return super().partial_fit(_get_dataframe(obj))
+
+    def transform(self, obj: pd.DataFrame | str,
+                  errors: Literal["raise", "coerce", "collect"] = "raise",
+                  n_threads: int = 1,
+                  columns: list = None,
+                  progress: Callable[[Progress], None] = None
+                  ) -> pd.DataFrame | tuple[pd.DataFrame, list[TransformFailure]]:
         """
         Transform the given DataFrame according to the conversion profile.
         If a filename is given, the DataFrame is loaded from the file first.
         :param obj: DataFrame or filename
-        :return: transformed DataFrame
+        :param errors: ``"raise"``, ``"coerce"`` or ``"collect"``. See :meth:`DataFrameProfile.transform`.
+        :param n_threads: The number of threads for the converters. See :meth:`DataFrameProfile.transform`.
+        :param columns: The output columns to compute. See :meth:`DataFrameProfile.transform`.
+        :param progress: A function that is called with a :class:`Progress` whenever a phase starts,
+               and with the metrics of the whole job at the end.
+        :return: transformed DataFrame (and the list of failures for ``errors="collect"``)
         """
-        return super().transform(_get_dataframe(obj))
+        with _tracking(progress) as tracker:
+            return super().transform(_read_dataframe(obj, tracker), errors, n_threads, columns, tracker)
 
-    def fit_transform(self, obj: pd.DataFrame | str) -> pd.DataFrame:
+    def transform_chunks(self, obj: pd.DataFrame | str, chunk_size: int = 10_000,
+                         errors: Literal["raise", "coerce", "collect"] = "raise",
+                         sheets: str | int | list[str | int] = None,
+                         columns: list[str] = None,
+                         n_jobs: int = 1,
+                         progress: Callable[[Progress], None] = None
+                         ) -> Iterator[pd.DataFrame | tuple[pd.DataFrame, list[TransformFailure]]]:
+        """
+        Transform the given DataFrame chunk by chunk according to the conversion profile.
+        If a filename is given, the DataFrame is loaded from the file first,
+        except for ``.xlsx`` files, which are read chunk by chunk as well, so that memory usage stays bounded.
+        Each yielded chunk keeps the index of the rows it was computed from.
+        :param obj: DataFrame or filename
+        :param chunk_size: Maximum number of rows per chunk.
+        :param errors: ``"raise"``, ``"coerce"`` or ``"collect"``. See :meth:`DataFrameProfile.transform`.
+        :param sheets: Only for ``.xlsx`` files: A worksheet name or index, a list of them, or ``"*"`` for all
+               worksheets. By default, only the first worksheet is read. The chunks are yielded worksheet by worksheet,
+               and the name of the worksheet of each chunk is stored in ``chunk.attrs["sheet"]``.
+        :param columns: The input columns to read. By default, all columns are read.
+        :param n_jobs: Only for ``.xlsx`` files: The number of worksheets that are read and transformed
+               in parallel by separate processes. This requires a profile that can be saved with ``save()``.
+        :param progress: A function that is called with a :class:`Progress` whenever a phase of a chunk starts
+               and whenever a chunk is transformed, and with the metrics of the whole job at the end.
+               For ``.xlsx`` files, the total number of rows is taken from the dimensions stored in the file.
+        :return: iterator over transformed DataFrames (and the failures of each chunk for ``errors="collect"``)
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, but got {chunk_size}")
+        with _tracking(progress) as tracker:
+            if isinstance(obj, str) and obj.endswith(".xlsx"):
+                sheet_names = _xlsx_sheet_names(obj, sheets)
+                total_rows = None
+                if progress is not None:
+                    counts = [_count_xlsx_rows(obj, sheet) for sheet in sheet_names]
+                    total_rows = None if None in counts else sum(counts)
+                tracker.start_pass(total_rows)
+                if n_jobs > 1 and len(sheet_names) > 1:
+                    tracker.phase("transform")  # the worksheets are read and transformed by the workers
+                    for result in _transform_sheets_parallel(self, obj, sheet_names, chunk_size, errors, columns,
+                                                             n_jobs):
+                        tracker.advance(len(result[0] if errors == "collect" else result))
+                        yield result
+                else:
+                    for sheet in sheet_names:
+                        yield from _transform_sheet(self, obj, sheet, chunk_size, errors, columns, tracker)
+                return
+            if sheets is not None:
+                raise ValueError("Worksheets can only be selected for .xlsx files.")
+
+            df = _read_dataframe(obj, tracker)
+            if columns is not None:
+                df = df[columns]
+            tracker.start_pass(len(df))
+            for start in range(0, len(df), chunk_size):
+                chunk = df.iloc[start:start + chunk_size]
+                result = self._transform(chunk, errors, 1, None, tracker)
+                transformed = result[0] if errors == "collect" else result
+                transformed.index = chunk.index
+                tracker.advance(len(chunk))
+                yield result
+
+    def fit_transform(self, obj: pd.DataFrame | str,
+                      errors: Literal["raise", "coerce", "collect"] = "raise",
+                      progress: Callable[[Progress], None] = None
+                      ) -> pd.DataFrame | tuple[pd.DataFrame, list[TransformFailure]]:
         """
         Fit the conversion profile to the given DataFrame and transform it.
         If a filename is given, the DataFrame is loaded from the file first.
         :param obj: DataFrame or filename
-        :return: transformed DataFrame
+        :param errors: ``"raise"``, ``"coerce"`` or ``"collect"``. See :meth:`DataFrameProfile.transform`.
+        :param progress: A function that is called with a :class:`Progress` whenever a phase starts,
+               and with the metrics of the whole job at the end.
+        :return: transformed DataFrame (and the list of failures for ``errors="collect"``)
         """
-        return super().fit_transform(_get_dataframe(obj))
+        with _tracking(progress) as tracker:
+            return super().fit_transform(_read_dataframe(obj, tracker), errors, tracker)
+
+    def save(self, path: str):
+        """
+        Save the (usually fitted) conversion profile to a file, so that it can be loaded with ``load()``.
+        Custom functions used as converters or for pre-processing must be defined at module level,
+        because lambda expressions and local functions cannot be saved.
+        :param path: filename
+        """
+        data = _pickle_profile(self)
+        with open(path, "wb") as f:
+            f.write(data)
+
+    @staticmethod
+    def load(path: str) -> 'ConversionProfile':
+        """
+        Load a conversion profile that was saved with ``save()``.
+        Only load files from trusted sources, as loading can execute arbitrary code.
+        :param path: filename
+        :return: the loaded profile
+        """
+        with open(path, "rb") as f:
+            profile = pickle.load(f)
+        if not isinstance(profile, ConversionProfile):
+            raise ValueError(f"File {path} does not contain a ConversionProfile, but {type(profile)}")
+        return profile
 
     def update(self, profile: dict[str, any]) -> 'ConversionProfile':
         """
@@ -80,3 +236,78 @@ class ConversionProfile(DataFrameProfile):
         """
         super().update(profile)
         return self
+
+
+def _pickle_profile(profile: ConversionProfile) -> bytes:
+    try:
+        return pickle.dumps(profile)
+    except (pickle.PicklingError, AttributeError, TypeError) as e:
+        raise ValueError(f"Cannot save profile, because it contains objects that cannot be pickled"
+                         f" (e.g. lambda expressions or local functions): {e}") from e
+
+
+def _transform_sheet(profile: ConversionProfile, path: str, sheet: str, chunk_size: int, errors: str,
+                     columns: list[str] | None, progress: _ProgressTracker
+                     ) -> Iterator[pd.DataFrame | tuple[pd.DataFrame, list[TransformFailure]]]:
+    chunks = _iter_xlsx_chunks(path, chunk_size, sheet, columns)
+    while True:
+        progress.phase("read")
+        chunk = next(chunks, None)
+        if chunk is None:
+            break
+        result = profile._transform(chunk, errors, 1, None, progress)
+        transformed = result[0] if errors == "collect" else result
+        transformed.index = chunk.index
+        transformed.attrs["sheet"] = sheet
+        progress.advance(len(chunk))
+        yield result
+
+
+_MAX_QUEUED_CHUNKS = 4  # per worksheet that is transformed in parallel
+
+
+def _transform_sheets_parallel(profile: ConversionProfile, path: str, sheets: list[str], chunk_size: int,
+                               errors: str, columns: list[str] | None, n_jobs: int
+                               ) -> Iterator[pd.DataFrame | tuple[pd.DataFrame, list[TransformFailure]]]:
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    data = _pickle_profile(profile)
+    with multiprocessing.Manager() as manager, ProcessPoolExecutor(n_jobs) as executor:
+        stop = manager.Event()
+        # bounded queues: a worker waits if its chunks are not consumed yet, so memory usage stays bounded
+        queues = [manager.Queue(maxsize=_MAX_QUEUED_CHUNKS) for _ in sheets]
+        futures = [executor.submit(_sheet_worker, data, path, sheet, chunk_size, errors, columns, queue, stop)
+                   for sheet, queue in zip(sheets, queues)]
+        try:
+            # yield the chunks worksheet by worksheet, in the given order
+            for queue, future in zip(queues, futures):
+                while (result := queue.get()) is not None:
+                    yield result
+                future.result()  # raises the exception of the worker, if any
+        finally:
+            stop.set()  # e.g. if the caller stops iterating early
+            for future in futures:
+                future.cancel()
+
+
+def _sheet_worker(data: bytes, path: str, sheet: str, chunk_size: int, errors: str, columns: list[str] | None,
+                  queue, stop):
+    import queue as queue_module
+
+    def put(item: any) -> bool:
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except queue_module.Full:
+                continue
+        return False
+
+    profile = pickle.loads(data)
+    try:
+        for result in _transform_sheet(profile, path, sheet, chunk_size, errors, columns, _ProgressTracker(None)):
+            if not put(result):
+                return
+    finally:
+        put(None)  # end of worksheet (also on errors, which are then raised by the future)
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from typing import Callable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 class Converter(ABC):
@@ -19,6 +23,61 @@ class Converter(ABC):
         """
         pass
 
+    def partial_fit(self, rows: list[tuple]) -> any:
+        """
+        Optional support for fitting on data that is split into several parts (e.g. on different machines).
+        Returns a summary of the given rows that contains everything fit() needs to know about them,
+        without changing this converter. The summaries of all parts are combined and passed to fit_merged().
+        Summaries must be picklable and consist of the following, so that they can be combined in any order:
+
+        - ``int`` and ``Fraction``, which are added
+        - ``set`` (e.g. of the distinct values), which are united
+        - ``Counter`` (e.g. of the values), which are added
+        - ``tuple`` and ``dict`` of the above, which are combined element-wise
+
+        By default, this method returns ``()`` for converters that don't override fit(), as they don't learn
+        anything from the data, and ``None`` otherwise, i.e. the converter doesn't support it.
+
+        :param rows: A part of the rows that would be passed to fit().
+        """
+        if type(self).fit is Converter.fit:
+            return ()
+        return None
+
+    def partial_fit_distinct(self, rows: list[tuple], counts: list[int]) -> any:
+        """
+        Like partial_fit(), but the rows are given as distinct rows and the number of times each of them occurs,
+        e.g. for categorical columns. The summary must be identical to the one of the repeated rows.
+        Converters whose fit() only depends on the distinct rows should override this method and ignore the counts.
+
+        By default, the rows are repeated accordingly and passed to partial_fit(),
+        unless the converter doesn't learn anything from the data or doesn't support partial_fit().
+        """
+        if type(self).fit is Converter.fit or type(self).partial_fit is Converter.partial_fit:
+            return self.partial_fit(rows)  # () or None, regardless of the rows
+        return self.partial_fit([row for row, count in zip(rows, counts) for _ in range(count)])
+
+    def fit_merged(self, summary: any):
+        """
+        Fits the converter to all parts of the data, given the combined summary of the parts (see partial_fit()).
+        The result must be identical to calling fit() with the rows of all parts at once.
+        This method is called instead of fit().
+
+        By default, this method does nothing.
+        """
+        pass
+
+    def fit_transform(self, rows: list[tuple]) -> list[tuple]:
+        """Fits the converter to the given rows and returns the transformed rows.
+        The result must be identical to calling fit() and then transform() for each row.
+        Converters that compute the transformed rows anyway during fit() (e.g. to pass them on to
+        nested converters) should override this method, so that no row is transformed twice.
+
+        By default, this method simply calls fit() and then transform() for each row.
+        """
+        self.fit(rows)
+        return self.transform_batch(rows)
+
     def labels(self, labels: tuple) -> tuple:
         """Returns the labels that should be associated with the output data of this converter.
         For top-level converters, this will result in the names of the output columns.
@@ -59,6 +118,82 @@ class Converter(ABC):
         """
         raise NotImplementedError()
 
+    def transform_batch(self, rows: list[tuple]) -> list[tuple]:
+        """
+        Transforms a list of rows at once.
+        The result must be identical to calling transform() for each row.
+        Converters that can process a whole column more efficiently than one value after another
+        (e.g. with a single lookup over all values) should override this method.
+
+        By default, this method simply calls transform() for each row.
+
+        :param rows: List of rows, as they would be passed to transform().
+        :return: List of transformed rows, in the same order.
+        """
+        return [self.transform(row) for row in rows]
+
+    def try_transform_batch(self, rows: list[tuple]) -> list[tuple | None] | None:
+        """
+        Optional non-raising variant of transform_batch(), which is used by ``Try()``
+        to pass the rows that a converter cannot handle on to the next converter in bulk.
+        Returns the list of transformed rows, with ``None`` for each row for which transform() would raise
+        an exception, i.e. a mask of the rows that could not be transformed.
+        Implementations should detect these rows without raising and catching an exception per row.
+
+        By default, this method returns ``None``, i.e. the converter doesn't support it,
+        and ``Try()`` calls transform() for each row and catches the exceptions instead.
+
+        :param rows: List of rows, as they would be passed to transform().
+        """
+        return None
+
+    def scalar_transform(self) -> Callable[[any], any] | None:
+        """
+        Optional fast path for converters that turn a single input value into a single output value.
+        Returns a function that takes the unwrapped input value and returns the unwrapped output value,
+        i.e. ``f(val) == self.transform((val,))[0]``, without creating any tuples.
+        This function must raise an exception whenever transform() would raise one.
+
+        This method is called after fit(), and the returned function is only used as long as
+        the converter is not fitted again.
+
+        By default, this method returns ``None``, i.e. the converter only supports transform().
+        """
+        return None
+
+    def select_outputs(self, indices: tuple[int, ...]) -> Converter | None:
+        """
+        Optional fast path for computing only some of the output values.
+        Returns a fitted converter that computes only the output values at the given positions,
+        i.e. ``sub.transform(row) == tuple(self.transform(row)[i] for i in indices)``.
+        Converters with many outputs of which each can be computed separately (e.g. ``OneHot()``)
+        should override this method.
+
+        This method is called after fit().
+
+        By default, this method returns ``None``, i.e. all output values are computed and the others are dropped.
+
+        :param indices: The positions of the needed output values, in ascending order.
+        """
+        return None
+
+    def inverse_transform(self, outputs: np.ndarray) -> np.ndarray | None:
+        """
+        Optional inverse of transform_batch() for converters with a single input value,
+        e.g. for decoding the predictions of a model back into the original values.
+        Returns a 1-dimensional array with the decoded input value of each output row.
+        Output rows that are not exactly the output of a value are decoded to the value whose output is closest
+        (e.g. the largest entry of ``OneHot()`` outputs).
+        Implementations should decode all rows at once (e.g. by indexing a lookup array), without a loop over the rows.
+
+        This method is called after fit().
+
+        By default, this method returns ``None``, i.e. the converter can't be inverted.
+
+        :param outputs: A 2-dimensional array with one row per output row of this converter.
+        """
+        return None
+
     def __repr__(self):
         """
         Returns a string representation of this converter.
@@ -1,18 +1,34 @@
 from __future__ import annotations
 
+import copy
+import functools
 from textwrap import indent
-from typing import Callable, Optional
+from typing import Callable, Optional, Literal, TYPE_CHECKING
 
-import pandas as pd
+from .Progress import Progress
+from .RecordProfile import RecordProfile, _EncodedColumn, _ColumnTransformError, _getitem_nested
+from .TransformFailure import TransformFailure
+from ._batching import _MicroBatcher
+from ._progress import _ProgressTracker, _tracking
+from ._utils import _merge_summaries
 
-from .RecordProfile import RecordProfile
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    import numpy as np
+    import pandas as pd
+
+    from .FrozenProfile import FrozenProfile
 
 
 class DataFrameProfile:
     def __init__(self, profile: dict[str, any] = None,
                  ignore_undefined: bool = False,
                  ignore_uninferrable: bool = False,
-                 pre_processing: Optional[Callable[[any], any]] = str.lower):
+                 pre_processing: Optional[Callable[[any], any]] = str.lower,
+                 hash_buckets: int = None,
+                 max_categories: int = None,
+                 min_frequency: int = None):
         """
         Wraps a RecordProfile and provides a DataFrame interface.
         Behind the scenes, this class simply takes the individual
@@ -26,46 +42,325 @@ class DataFrameProfile:
                processed by an Ignore() converter, leading to no output column.
         :param pre_processing: A function that is applied to each value before it is fed to the converters.
                Every time the function fails (i.e. raises an exception), the original value is used.
+        :param hash_buckets: If given, columns without a converter that have too many distinct values for
+               ``Enumerate()`` are converted with ``HashedOneHot(hash_buckets)`` instead of raising an error.
+        :param max_categories: If given, the categorical converters that are inferred for columns without a converter
+               (``OneHot()``, ``Enumerate()`` and ``List()``) keep at most this many values, the most frequent ones,
+               and merge all other values into a single ``other`` category.
+        :param min_frequency: If given, the inferred categorical converters merge the values that occur less often
+               than this into the ``other`` category.
         """
         self.pre_processing = pre_processing
         self._record_profile = RecordProfile(profile,
                                              ignore_undefined=ignore_undefined,
-                                             ignore_uninferrable=ignore_uninferrable)
+                                             ignore_uninferrable=ignore_uninferrable,
+                                             hash_buckets=hash_buckets,
+                                             max_categories=max_categories,
+                                             min_frequency=min_frequency)
+        self._batcher = _MicroBatcher(self.transform_records)
 
-    def fit(self, df: pd.DataFrame) -> 'DataFrameProfile':
+    def fit(self, df: pd.DataFrame,
+            progress: Callable[[Progress], None] = None) -> 'DataFrameProfile':
         """
         Fit the profile to the given DataFrame.
+        Categorical columns are fitted from their categories (pre-processing only the categories),
+        unless a converter needs to see every value.
         :param df: The DataFrame to fit to.
+        :param progress: A function that is called with a :class:`Progress` whenever a phase starts
+               (e.g. the fit of each key), and with the metrics of the whole job at the end.
         :return: self
         """
+        with _tracking(progress) as tracker:
+            tracker.start_pass(len(df))
+            tracker.phase("pre-process")
+            columns = {key: self.__input_column(df[key]) for key in df.columns}
+            self._record_profile._fit_columns(columns, len(df), tracker)
+            tracker.advance(len(df))
+
+        return self
+
+    def partial_fit(self, df: pd.DataFrame) -> dict[str, any]:
+        """
+        Summarize a part of the data, for fitting the profile on data that is split into several parts,
+        e.g. on different machines. The profile is not changed.
+        The summaries of all parts are combined with ``merge()``.
+        :param df: A part of the DataFrame to fit to.
+        :return: A picklable summary of the part, e.g. the distinct values of each column.
+        """
         dicts = df.to_dict(orient="records")
         dicts = [self.__pre_process_dict(d) for d in dicts]  # pre-process each dict
-        rows = [(d,) for d in dicts]  # wrap each dict in a 1-element tuple
-
-        self._record_profile.fit(rows)
+        return self._record_profile.partial_fit([(d,) for d in dicts])
 
+    def merge(self, *summaries: dict[str, any]) -> 'DataFrameProfile':
+        """
+        Fit the profile to all parts of the data, given their summaries from ``partial_fit()``.
+        The result is identical to fitting the profile to the concatenation of the parts, in the given order.
+        :param summaries: The summaries of all parts.
+        :return: self
+        """
+        if not summaries:
+            raise ValueError("At least one summary must be given.")
+        self._record_profile.fit_merged(functools.reduce(_merge_summaries, summaries))
         return self
 
-    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
-        dicts = df.to_dict(orient="records")
+    def transform(self, df: pd.DataFrame,
+                  errors: Literal["raise", "coerce", "collect"] = "raise",
+                  n_threads: int = 1,
+                  columns: list = None,
+                  progress: Callable[[Progress], None] = None
+                  ) -> pd.DataFrame | tuple[pd.DataFrame, list[TransformFailure]]:
+        """
+        Transform the given DataFrame according to the profile.
+        :param df: The DataFrame to transform.
+        :param errors: What to do if a value cannot be transformed:
+
+               - ``"raise"``: Stop and raise an exception.
+               - ``"coerce"``: Set all output values of the failing converter in this row to NaN and continue.
+               - ``"collect"``: Like ``"coerce"``, but additionally return a list of
+                 :class:`TransformFailure` describing each failure.
+
+               With ``"coerce"`` and ``"collect"``, the output has the index of the input DataFrame,
+               so that ``TransformFailure.row`` refers to the same row in both.
+        :param n_threads: The number of threads that call the converters of different columns concurrently.
+               This only pays off if the converters spend their time in code that releases the GIL
+               (e.g. the NumPy lookups of ``Binary``, ``Map`` and ``HashedOneHot``).
+               Only used with ``errors="raise"``.
+        :param columns: If given, only these output columns are computed, in this order.
+               Input column names stand for all of their output columns (see ``column_names``).
+               Only the converters that produce the requested columns are used,
+               and only the input columns they need are read and pre-processed.
+               Columns of converters in extend mode (e.g. ``OneHot(extend=True)``) can't be selected.
+        :param progress: A function that is called with a :class:`Progress` whenever a phase starts,
+               and with the metrics of the whole job at the end.
+        :return: The transformed DataFrame, or for ``errors="collect"``,
+                 a tuple of the transformed DataFrame and the list of failures.
+        """
+        with _tracking(progress) as tracker:
+            tracker.start_pass(len(df))
+            result = self._transform(df, errors, n_threads, columns, tracker)
+            tracker.advance(len(df))
+        return result
+
+    def _transform(self, df: pd.DataFrame, errors: Literal["raise", "coerce", "collect"], n_threads: int,
+                   columns: list | None, progress: _ProgressTracker
+                   ) -> pd.DataFrame | tuple[pd.DataFrame, list[TransformFailure]]:
+        """
+        Like ``transform()``, but reports the phases to the tracker of an enclosing job,
+        e.g. for each chunk of ``transform_chunks()``. Rows are not counted.
+        """
+        if errors not in ("raise", "coerce", "collect"):
+            raise ValueError(f"errors must be 'raise', 'coerce' or 'collect', but got {repr(errors)}")
+        if n_threads < 1:
+            raise ValueError(f"n_threads must be positive, but got {n_threads}")
+        if columns is not None:
+            return self.__transform_projected(df, errors, n_threads, columns, progress)
+        if errors != "raise":
+            progress.phase("transform")  # pre-processed record by record
+            dicts = df.to_dict(orient="records")
+            return self.__transform_collecting_errors(df.index, dicts, errors == "collect")
+
+        try:
+            if n_threads == 1:
+                return self.__transform_columns(df, progress)
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(n_threads) as executor:
+                return self.__transform_columns(df, progress, executor)
+        except _ColumnTransformError as e:
+            if e.position is None:
+                raise
+            raise e.row_error() from e
+
+    def __transform_projected(self, df: pd.DataFrame, errors: Literal["raise", "coerce", "collect"],
+                              n_threads: int, columns: list, progress: _ProgressTracker
+                              ) -> pd.DataFrame | tuple[pd.DataFrame, list[TransformFailure]]:
+        # transform with a copy of this profile that only contains the converters of the requested columns
+        projected = copy.copy(self)
+        projected._record_profile, labels = self._record_profile._project(columns)
+        input_keys = set(projected._record_profile.input_keys())
+        df = df[[col for col in df.columns if col in input_keys]]  # don't even convert the other columns to dicts
+        result = projected._transform(df, errors, n_threads, None, progress)
+        if errors == "collect":
+            transformed, failures = result
+            return transformed[labels], failures
+        return result[labels]
+
+    def __transform_columns(self, df: pd.DataFrame, progress: _ProgressTracker,
+                            executor: Executor = None) -> pd.DataFrame:
+        # every converter processes the whole column at once (or only the categories of categorical columns)
+        progress.phase("pre-process")
+        columns = {}
+        for key in self._record_profile.input_keys():
+            if key not in df.columns:
+                raise ValueError(f"at key {repr(key)}:\nColumn is missing in the DataFrame.")
+            columns[key] = self.__input_column(df[key])
+        output_columns = self._record_profile._transform_columns(columns, len(df), executor, progress)
+        import pandas as pd  # imported here, as pandas is slow to import
+
+        return pd.DataFrame(output_columns, index=pd.RangeIndex(len(df)))
+
+    def __transform_collecting_errors(self, index: pd.Index, dicts: list[dict], collect: bool
+                                      ) -> pd.DataFrame | tuple[pd.DataFrame, list[TransformFailure]]:
+        n_added_labels = len(self.added_labels)
         transformed_dicts = []
-        for i, d in enumerate(dicts):
-            try:
-                d = self.transform_single(d)
-            except Exception as e:
-                # add helpful context to error message
-                raise Exception(f"Error during transform() of row {i}:\n"
-                                f"{indent(str(e), ' ' * 4)}") from e
-            transformed_dicts.append(d)
-        return pd.DataFrame.from_records(transformed_dicts)
+        failures = []
+        for row_index, d in zip(index, dicts):
+            transformed, row_failures = self._record_profile._transform_collecting_errors(self.__pre_process_dict(d))
+            transformed_dicts.append(transformed)
+            for key, converter_path, e in row_failures:
+                failures.append(TransformFailure(row=row_index,
+                                                 key=key,
+                                                 converter=converter_path,
+                                                 value=_getitem_nested(key, d.get),
+                                                 exception=e.__class__.__name__,
+                                                 message=str(e)))
+        import pandas as pd  # imported here, as pandas is slow to import
+
+        df = self.__fill_added_labels(pd.DataFrame.from_records(transformed_dicts), n_added_labels)
+        df.index = index  # the rows of the failures can be looked up in the output
+        if collect:
+            return df, failures
+        return df
+
+    def __fill_added_labels(self, df: pd.DataFrame, n_added_labels: int) -> pd.DataFrame:
+        # output columns that were added during a row-by-row transform (see extend mode of e.g. OneHot)
+        # are missing in the rows before -> these rows get 0, and the columns are moved to their place
+        added_labels = list(self.added_labels[n_added_labels:])
+        if not added_labels:
+            return df
+        df[added_labels] = df[added_labels].fillna(0)
+        return df[list(self.output_labels)]
 
     def transform_single(self, row: dict[str, any]) -> dict[str, any]:
         row = self.__pre_process_dict(row)
         return self._record_profile.transform((row,))[0]  # wrap, transform, and unpack again
 
-    def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
-        self.fit(df)
-        return self.transform(df)
+    def inverse_transform(self, outputs: pd.DataFrame | np.ndarray) -> pd.DataFrame:
+        """
+        Decode transformed data (e.g. the predictions of a model) back into the input columns,
+        using ``Converter.inverse_transform()`` of each converter, which decodes all rows at once.
+        Note that the decoded values are the pre-processed values (e.g. lower case).
+        :param outputs: A DataFrame with output columns, or an array with all output columns in the order of
+               ``output_labels``. An input column is decoded if all of its output columns (see ``column_names``)
+               are present in the DataFrame.
+        :return: A DataFrame with the decoded input columns.
+               Input columns whose converter can't be inverted (e.g. ``HashedOneHot()``) are left out.
+        """
+        import pandas as pd  # imported here, as pandas is slow to import
+
+        if isinstance(outputs, pd.DataFrame):
+            index = outputs.index
+            present = set(outputs.columns)
+        else:
+            import numpy as np  # imported here, as NumPy is slow to import
+
+            outputs = np.asarray(outputs)
+            if outputs.ndim != 2 or outputs.shape[1] != len(self.output_labels):
+                raise ValueError(f"Expected an array with {len(self.output_labels)} columns (see output_labels),"
+                                 f" but got an array of shape {outputs.shape}")
+            index = None
+
+        decoded = {}
+        for key, labels in self.column_names.items():
+            if isinstance(key, tuple) or not labels:
+                continue  # several or no input values
+            if index is None:
+                block = outputs[:, self._record_profile._output_slices[key]]
+            elif present.issuperset(labels):
+                block = outputs[list(labels)].to_numpy()
+            else:
+                continue
+            converter = self._record_profile[key]
+            try:
+                values = converter.inverse_transform(block)
+            except Exception as e:
+                # add helpful context to error message
+                raise ValueError(f"at column {repr(key)}:\n"
+                                 f"{e.__class__.__name__} during {converter.__class__.__name__}.inverse_transform():\n"
+                                 f"{indent(str(e), ' ' * 4)}") from e
+            if values is not None:
+                decoded[key] = values
+        return pd.DataFrame(decoded, index=index)
+
+    def freeze(self) -> FrozenProfile:
+        """
+        :return: An immutable copy of this fitted profile, which is safe to use from several threads at the same time.
+        """
+        from .FrozenProfile import FrozenProfile  # imported here, as it is only needed for freezing
+
+        return FrozenProfile(self)
+
+    def compile(self, path: str = None) -> Callable[[dict[str, any]], dict[str, any]]:
+        """
+        Compiles the fitted profile into a function that behaves like ``transform_single()``,
+        see ``RecordProfile.compile()``.
+
+        :param path: If given, the generated code is also written to this file as a standalone module,
+               which doesn't depend on clevertable. Only the default pre-processing functions
+               (and no pre-processing) can be written into the module.
+        :return: A function that transforms a single row, given as a dict.
+        """
+        from ._compiler import _compile_profile  # imported here, as it is only needed for compiling
+
+        return _compile_profile(self._record_profile, self.transform_single, self.pre_processing, path)
+
+    async def transform_async(self, row: dict[str, any]) -> dict[str, any]:
+        """
+        Like ``transform_single()``, but doesn't block the event loop.
+        Concurrent calls are collected into micro-batches which are transformed in an executor.
+        See ``set_async_batching()`` for how the batches are formed.
+        """
+        return await self._batcher.submit(row)
+
+    def set_async_batching(self, max_batch_size: int = 64,
+                           max_wait: float = 0.001,
+                           executor: Executor = None) -> 'DataFrameProfile':
+        """
+        Configure the micro-batching of ``transform_async()``.
+        :param max_batch_size: Maximum number of records that are transformed together.
+        :param max_wait: Maximum time in seconds that a record waits for other records to join its batch.
+        :param executor: The executor that transforms the batches.
+               ``None`` uses the default executor of the event loop.
+        :return: self
+        """
+        self._batcher = _MicroBatcher(self.transform_records, max_batch_size, max_wait, executor)
+        return self
+
+    def transform_records(self, rows: list[dict[str, any]]) -> list[dict[str, any]]:
+        """
+        Like ``transform_single()`` for a list of records (dicts), but every converter processes
+        the values of all records at once, which is much faster for many records.
+        Used by ``transform_async()`` for the micro-batches, and by the command line interface for JSON Lines.
+        """
+        rows = [(self.__pre_process_dict(row),) for row in rows]
+        return [row[0] for row in self._record_profile.transform_batch(rows)]
+
+    def fit_transform(self, df: pd.DataFrame,
+                      errors: Literal["raise", "coerce", "collect"] = "raise",
+                      progress: Callable[[Progress], None] = None
+                      ) -> pd.DataFrame | tuple[pd.DataFrame, list[TransformFailure]]:
+        with _tracking(progress) as tracker:
+            if errors != "raise":
+                self.fit(df, tracker)
+                return self.transform(df, errors, progress=tracker)
+
+            tracker.start_pass(len(df))
+            tracker.phase("pre-process")
+            dicts = df.to_dict(orient="records")
+            dicts = [self.__pre_process_dict(d) for d in dicts]  # pre-process each dict
+            rows = [(d,) for d in dicts]  # wrap each dict in a 1-element tuple
+
+            # the converters transform the data while fitting, so it doesn't need to be transformed again
+            try:
+                transformed_rows = self._record_profile.fit_transform(rows, tracker)
+            except _ColumnTransformError as e:
+                raise e.row_error() from e
+            tracker.phase("transform")
+            import pandas as pd  # imported here, as pandas is slow to import
+
+            result = pd.DataFrame.from_records([row[0] for row in transformed_rows])
+            tracker.advance(len(df))
+        return result
 
     def update(self, profile: dict[str, any]) -> 'DataFrameProfile':
         """
@@ -85,8 +380,63 @@ class DataFrameProfile:
         """
         return self._record_profile.keys
 
+    @property
+    def output_labels(self) -> tuple:
+        """
+        The names of all output columns in the order in which they are produced by ``transform()``.
+        """
+        return self._record_profile.output_labels
+
+    @property
+    def added_labels(self) -> tuple:
+        """
+        The names of the output columns that were added after ``fit()``
+        by converters in extend mode (e.g. ``OneHot(extend=True)``), in the order in which they were added.
+        """
+        return self._record_profile.added_labels
+
     def __pre_process_dict(self, d: dict[str, any]) -> dict[str, any]:
-        return {k: self.__pre_process(v) for k, v in d.items()}
+        pre_processing = self.pre_processing
+        if pre_processing is None:
+            return dict(d)
+        # same as __pre_process() for each value, but inlined, as this runs for every single record
+        result = {}
+        for k, v in d.items():
+            try:
+                result[k] = pre_processing(v)
+            except:
+                result[k] = v
+        return result
+
+    def __input_column(self, column: pd.Series) -> list | _EncodedColumn:
+        """
+        :return: The pre-processed values of the column,
+                 or for categorical columns, the pre-processed categories that occur and the code of each row.
+        """
+        import pandas as pd  # imported here, as pandas is slow to import
+
+        arrow_dtype = getattr(pd, "ArrowDtype", None)  # pandas >= 1.5
+        if arrow_dtype is not None and isinstance(column.dtype, arrow_dtype) \
+                and str(column.dtype.pyarrow_dtype).startswith("dictionary<"):
+            column = column.astype("category")  # dictionary-encoded Arrow column
+        if not isinstance(column.dtype, pd.CategoricalDtype):
+            return self.__pre_process_list(column.tolist())
+
+        import numpy as np  # imported here, as NumPy is slow to import
+
+        codes = column.cat.codes.to_numpy()  # -1 for missing values
+        # the categories that occur, in the order of their first occurrence (like in a pass over the values)
+        present, first = np.unique(codes, return_index=True)
+        order = np.argsort(first)
+        values = column.iloc[first[order]].tolist()  # the same objects as in column.tolist()
+        lookup = np.empty(len(column.cat.categories) + 1, dtype=np.intp)  # the last entry is for -1
+        lookup[present[order]] = np.arange(len(present))
+        return _EncodedColumn(self.__pre_process_list(values), lookup[codes])
+
+    def __pre_process_list(self, values: list) -> list:
+        if self.pre_processing is None:
+            return values
+        return [self.__pre_process(v) for v in values]
 
     def __pre_process(self, value: any) -> any:
         if self.pre_processing is None:
@@ -96,6 +446,18 @@ class DataFrameProfile:
         except:
             return value
 
+    def __getstate__(self):
+        # the micro-batcher holds event loop state and possibly an executor, which can't be pickled
+        state = self.__dict__.copy()
+        batcher = state.pop("_batcher")
+        state["_batching_args"] = (batcher.max_batch_size, batcher.max_wait)
+        return state
+
+    def __setstate__(self, state: dict):
+        max_batch_size, max_wait = state.pop("_batching_args")
+        self.__dict__.update(state)
+        self._batcher = _MicroBatcher(self.transform_records, max_batch_size, max_wait)
+
     def __getitem__(self, item):
         return self._record_profile[item]
 
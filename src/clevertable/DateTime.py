@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import heapq
+import zlib
+from itertools import islice
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, TYPE_CHECKING
+
+from .Converter import Converter
+from ._utils import _describe_rows
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_COMPONENTS = ("timestamp", "year", "month", "day", "weekday", "hour", "minute", "second")
+_FORMAT_SAMPLE_SIZE = 100  # number of distinct strings that are used to detect the format
+_MAX_CONSECUTIVE_FAILURES = 10  # a format is given up after this many strings in a row don't fit
+_HEAD_SIZE = 10  # number of values that must be dates before a whole column is checked by _infer_date_time()
+
+# candidates for the format detection, in order of preference (e.g. day before month if both work)
+_FORMATS = (
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%Y-%m-%dT%H:%M",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S.%f",
+    "%Y-%m-%dT%H:%M:%S%z",
+    "%Y-%m-%dT%H:%M:%S.%f%z",
+    "%Y/%m/%d",
+    "%Y/%m/%d %H:%M:%S",
+    "%d.%m.%Y",
+    "%d.%m.%Y %H:%M",
+    "%d.%m.%Y %H:%M:%S",
+    "%d/%m/%Y",
+    "%d/%m/%Y %H:%M",
+    "%d/%m/%Y %H:%M:%S",
+    "%m/%d/%Y",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y %H:%M:%S",
+    "%d-%m-%Y",
+    "%d %b %Y",
+    "%d %B %Y",
+    "%b %d %Y",
+    "%b %d, %Y",
+    "%B %d %Y",
+    "%B %d, %Y",
+)
+
+
+def _format_sample(values: Iterable) -> set[str]:
+    """
+    :return: The distinct strings among the given values, or a sample of them if there are too many.
+             The sample doesn't depend on the order of the values, and the sample of several parts of the values
+             can be computed from the samples of the parts (see ``DateTime.partial_fit()``).
+    """
+    # the strings with the smallest hashes (ties: the largest strings), a pseudo-random choice
+    # that is identical in every process. The heap never holds more than the sample,
+    # its top is the string that is dropped first
+    heap: list[tuple[int, str]] = []
+    sample = set()
+    for val in values:
+        if not isinstance(val, str):
+            continue
+        val = val.strip()
+        if not val or val in sample:
+            continue
+        entry = (-zlib.crc32(val.encode("utf-8")), val)
+        if len(heap) < _FORMAT_SAMPLE_SIZE:
+            heapq.heappush(heap, entry)
+            sample.add(val)
+        elif entry > heap[0]:
+            sample.discard(heapq.heapreplace(heap, entry)[1])
+            sample.add(val)
+    return sample
+
+
+def _sample_key(val: str) -> tuple[int, str]:
+    return zlib.crc32(val.encode("utf-8")), val
+
+
+def _parses(val: str, fmt: str) -> bool:
+    try:
+        datetime.strptime(val, fmt)
+    except ValueError:
+        return False
+    return True
+
+
+def _detect_format(sample: set[str]) -> str | None:
+    """
+    :param sample: See ``_format_sample()``.
+    :return: The candidate format that parses the most of the given strings, or ``None`` if none parses any.
+    """
+    sample = sorted(sample, key=_sample_key)
+    best, best_count = None, 0
+    for fmt in _FORMATS:
+        count = failures = 0
+        for i, val in enumerate(sample):
+            try:
+                datetime.strptime(val, fmt)
+            except ValueError:
+                failures += 1
+                # a format that doesn't fit at all fails on the first few strings,
+                # but single unparseable strings must not prevent the detection
+                if failures >= _MAX_CONSECUTIVE_FAILURES or count + len(sample) - i - 1 <= best_count:
+                    break
+                continue
+            count += 1
+            failures = 0
+        if count > best_count:
+            best, best_count = fmt, count
+            if count == len(sample):
+                break
+    return best
+
+
+class DateTime(Converter):
+
+    def __init__(self, format: str = None,
+                 components: str | Iterable[str] = "timestamp",
+                 default: float = None):
+        """
+        Converts dates and times into numbers.
+        Strings are parsed with a single format (see ``datetime.strptime()``), which is detected during ``fit()``
+        if it is not given. ``datetime`` and ``date`` objects are used as they are.
+        Dates without time zone are interpreted as UTC.
+
+        :param format: The format of the strings, e.g. ``"%Y-%m-%d"``. If not given, it is detected during ``fit()``
+               from a sample of the values, by trying a list of common formats.
+        :param components: Which numbers to output, one column each: ``"timestamp"`` (seconds since 1970-01-01 UTC),
+               ``"year"``, ``"month"``, ``"day"``, ``"weekday"`` (0 is Monday), ``"hour"``, ``"minute"``, ``"second"``.
+        :param default: The value of all components for values that cannot be parsed.
+               If not given, such values raise an error.
+        """
+        components = (components,) if isinstance(components, str) else tuple(components)
+        unknown = [c for c in components if c not in _COMPONENTS]
+        if unknown or not components:
+            raise ValueError(f"Unknown components {unknown}. Available components: {_COMPONENTS}")
+        self.format = format
+        self.components = components
+        self.default = default
+
+    def fit(self, rows: list[tuple]):
+        if self.format is None:
+            self.fit_merged(self.partial_fit(rows))
+
+    def partial_fit(self, rows: list[tuple]) -> set[str]:
+        if self.format is not None:
+            return set()  # nothing to detect
+        return _format_sample(row[0] for row in rows)  # unpack 1-element rows
+
+    def partial_fit_distinct(self, rows: list[tuple], counts: list[int]) -> set:
+        return self.partial_fit(rows)  # only the distinct values matter
+
+    def fit_merged(self, summary: set[str]):
+        if self.format is None and summary:
+            self.format = _detect_format(_format_sample(summary))
+            if self.format is None:
+                raise ValueError(f"Cannot detect the date format of the values: {sorted(summary)[:5]} ...")
+
+    def labels(self, labels: tuple) -> tuple:
+        if self.components == ("timestamp",):
+            return labels
+        label = labels[0]  # unpack 1-element tuple
+        return tuple(f"{label}.{component}" for component in self.components)
+
+    def transform(self, row: tuple) -> tuple:
+        val = row[0]  # unpack 1-element row
+        micros = self.__parse(val)
+        if micros is None:
+            if self.default is None:
+                raise ValueError(f"Cannot parse '{val}' as date with format {repr(self.format)},"
+                                 f" and no default value was specified.")
+            return (self.default,) * len(self.components)
+        dt = _EPOCH + micros * _MICROSECOND
+        return tuple(micros / 1e6 if component == "timestamp" else _component(dt, component)
+                     for component in self.components)
+
+    def transform_batch(self, rows: list[tuple]) -> list[tuple]:
+        outputs = self.try_transform_batch(rows)
+        if outputs is None:
+            return super().transform_batch(rows)  # empty rows -> transform() raises the appropriate error
+        if self.default is None and None in outputs:
+            missing = [i for i, output in enumerate(outputs) if output is None]
+            raise ValueError(f"Cannot parse values as date with format {repr(self.format)},"
+                             f" and no default value was specified: {_describe_rows([row[0] for row in rows], missing)}")
+        return outputs
+
+    def try_transform_batch(self, rows: list[tuple]) -> list[tuple | None] | None:
+        if not all(rows):
+            return None
+        import numpy as np  # imported here, as NumPy is slow to import
+
+        micros, valid = self.__parse_batch([row[0] for row in rows])
+        columns = _components_batch(np.where(valid, micros, 0), self.components)
+        default = None if self.default is None else (self.default,) * len(self.components)
+        return [output if ok else default for output, ok in zip(zip(*columns), valid.tolist())]
+
+    def __parse(self, val: any) -> int | None:
+        """:return: Microseconds since 1970-01-01 UTC, or ``None`` if the value cannot be parsed."""
+        try:
+            if isinstance(val, str):
+                if self.format is None:
+                    return None
+                dt = datetime.strptime(val.strip(), self.format)
+            elif isinstance(val, datetime):
+                dt = val
+            elif isinstance(val, date):
+                dt = datetime(val.year, val.month, val.day)
+            else:
+                return None
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            micros = (dt - _EPOCH) // _MICROSECOND
+            return micros if isinstance(micros, int) else None  # e.g. NaN for pandas' NaT
+        except (ValueError, TypeError, OverflowError):
+            return None
+
+    def __parse_batch(self, values: list) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Like __parse() for all values at once: All strings are parsed by a single vectorized call.
+        :return: The microseconds since 1970-01-01 UTC of each value, and a mask of the values that could be parsed.
+        """
+        import numpy as np  # imported here, as NumPy is slow to import
+        import pandas as pd  # imported here, as pandas is slow to import
+
+        micros = np.zeros(len(values), dtype=np.int64)
+        valid = np.zeros(len(values), dtype=bool)
+        strings = [i for i, val in enumerate(values) if isinstance(val, str)]
+        if strings and self.format is not None:
+            parsed = pd.to_datetime(pd.Series([values[i] for i in strings], dtype=object).str.strip(),
+                                    format=self.format, errors="coerce", utc=True)
+            ok = parsed.notna().to_numpy()
+            positions = np.asarray(strings, dtype=np.int64)
+            # naive UTC timestamps, whose unit depends on the pandas version
+            timestamps = parsed[ok].dt.tz_localize(None).to_numpy()
+            micros[positions[ok]] = timestamps.astype("datetime64[us]").astype(np.int64)
+            valid[positions[ok]] = True
+
+        # datetime and date objects (and anything else, which fails)
+        for i, val in enumerate(values):
+            if not isinstance(val, str):
+                result = self.__parse(val)
+                if result is not None:
+                    micros[i] = result
+                    valid[i] = True
+        return micros, valid
+
+    def __repr__(self):
+        args = []
+        if self.format is not None:
+            args.append(f"format={repr(self.format)}")
+        if self.components != ("timestamp",):
+            args.append(f"components={repr(self.components)}")
+        if self.default is not None:
+            args.append(f"default={repr(self.default)}")
+        return f"DateTime({', '.join(args)})"
+
+
+def _component(dt: datetime, component: str) -> int:
+    if component == "weekday":
+        return dt.weekday()
+    return getattr(dt, component)
+
+
+def _components_batch(micros: np.ndarray, components: tuple[str, ...]) -> list[list]:
+    """:return: One list of values per component, computed for all timestamps at once."""
+    import pandas as pd  # imported here, as pandas is slow to import
+
+    index = pd.to_datetime(micros, unit="us", utc=True)
+    columns = []
+    for component in components:
+        if component == "timestamp":
+            columns.append((micros / 1e6).tolist())
+        else:
+            columns.append(getattr(index, component).to_numpy().tolist())
+    return columns
+
+
+def _infer_date_time(values: list) -> DateTime | None:
+    """
+    :return: A fitted ``DateTime()`` if all values are dates (strings of a single format, or date objects)
+             or missing (``None``, NaN or empty strings), otherwise ``None``.
+             If values are missing, they are converted to NaN.
+    """
+    present = (val for val in values
+               if not (val is None or val != val or (isinstance(val, str) and not val.strip())))
+    # most columns are rejected by their first values, before the whole column is copied and parsed
+    head = list(islice(present, _HEAD_SIZE))
+    if not head or not all(isinstance(val, (str, date)) for val in head):
+        return None
+    head_strings = {val.strip() for val in head if isinstance(val, str)}
+    if not any(all(_parses(val, fmt) for val in head_strings) for fmt in _FORMATS):
+        return None
+    present = head + list(present)
+    if not all(isinstance(val, (str, date)) for val in present):
+        return None
+    converter = DateTime()
+    if any(isinstance(val, str) for val in present):
+        converter.format = _detect_format(_format_sample(present))
+        if converter.format is None:
+            return None
+    # all values must be parseable, not only those of the sample
+    outputs = converter.try_transform_batch([(val,) for val in present])
+    if outputs is None or None in outputs:
+        return None
+    if len(present) < len(values):
+        converter.default = float("nan")
+    return converter
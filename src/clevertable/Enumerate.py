@@ -1,21 +1,72 @@
 from __future__ import annotations
 
+from collections import Counter
+from typing import Callable, TYPE_CHECKING
+
 from .Converter import Converter
+from ._utils import _lookup_array, _output_matrix, _check_category_caps, _cap_categories, _weighted_counts
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 class Enumerate(Converter):
 
-    def __init__(self, *values: any):
+    def __init__(self, *values: any, extend: bool = False,
+                 max_categories: int = None, min_frequency: int = None, other_values: tuple = ()):
+        """
+        Converts each value to its position in the list of known values.
+        :param values: The known values. If not given, they are inferred from the data during ``fit()``.
+        :param extend: If ``True``, unknown values are appended to the known values during ``transform()``
+               (and thereby get the next free number) instead of raising an error.
+               The numbers of the values that are already known never change.
+               The appended values are listed in ``added_values``.
+        :param max_categories: If given, at most this many values get their own number during ``fit()``,
+               the most frequent ones. All other values (including values that are unknown after ``fit()``)
+               share the number after them, ``len(values)``, instead of raising an error.
+        :param min_frequency: If given, only values that occur at least this many times during ``fit()``
+               get their own number. All other values share the number ``len(values)``, like for ``max_categories``.
+        :param other_values: The values that were merged into the shared number during ``fit()``.
+               Only for information, as all values that are not in ``values`` get the shared number.
+        """
+        _check_category_caps(max_categories, min_frequency, extend)
         self.values = values or ()
+        self.extend = extend
+        self.max_categories = max_categories
+        self.min_frequency = min_frequency
+        self.other_values = tuple(other_values)
+        self.added_values: tuple = ()  # values appended during transform() in extend mode, in order
+
+    @property
+    def capped(self) -> bool:
+        """Whether other values share a number, i.e. ``max_categories`` or ``min_frequency`` is given."""
+        return self.max_categories is not None or self.min_frequency is not None
 
     def fit(self, rows: list[tuple]):
         # if values were not specified, infer them from the data
         if not self.values:
-            values = [row[0] for row in rows]  # unpack 1-element rows
-            values = set(values)
+            self.fit_merged(self.partial_fit(rows))
+
+    def partial_fit(self, rows: list[tuple]) -> set | Counter:
+        if self.values:
+            return set()  # values are known already
+        values = [row[0] for row in rows]  # unpack 1-element rows
+        if self.capped:
+            return Counter(values)  # the caps depend on the frequencies
+        return set(values)
 
+    def partial_fit_distinct(self, rows: list[tuple], counts: list[int]) -> set | Counter:
+        if self.values or not self.capped:
+            return self.partial_fit(rows)  # only the distinct values matter
+        return _weighted_counts((row[0] for row in rows), counts)
+
+    def fit_merged(self, summary: set | Counter):
+        if not self.values:
+            if self.capped:
+                self.values, self.other_values = _cap_categories(summary, self.max_categories, self.min_frequency)
+                return
             # try sorting
-            values = list(values)
+            values = list(summary)
             try:
                 values.sort()
             except TypeError:
@@ -28,7 +79,73 @@ class Enumerate(Converter):
         val = row[0]  # unpack 1-element row
         if val in self.values:
             return (self.values.index(val),)
+        if self.capped:
+            return (len(self.values),)
+        if self.extend:
+            self.values += (val,)
+            self.added_values += (val,)
+            return (len(self.values) - 1,)
         raise ValueError(f"Unknown value: {val}. Known values: {self.values}")
 
+    def try_transform_batch(self, rows: list[tuple]) -> list[tuple | None] | None:
+        if self.extend:
+            return self.transform_batch(rows)  # unknown values are appended instead of failing
+        if not all(rows):
+            return None  # empty rows -> transform() raises the appropriate error
+        index = {}
+        try:
+            for i, val in enumerate(self.values):
+                index.setdefault(val, (i,))  # like tuple.index(), the first occurrence counts
+            other = (len(self.values),) if self.capped else None
+            return [index.get(row[0], other) for row in rows]  # unknown values result in None
+        except TypeError:  # unhashable values
+            return None
+
+    def scalar_transform(self) -> Callable[[any], int] | None:
+        # a hash table instead of searching the tuple of values
+        index = {}
+        try:
+            for i, val in enumerate(self.values):
+                index.setdefault(val, i)  # like tuple.index(), the first occurrence counts
+        except TypeError:  # unhashable values
+            return None
+
+        def transform_value(val: any) -> int:
+            try:
+                return index[val]
+            except KeyError:
+                code = self.transform((val,))[0]  # raises the appropriate error, or appends the value
+                if self.extend:
+                    index[val] = code  # the value was appended, other unknown values all share the 'other' code
+                return code
+            except TypeError:  # unhashable value
+                return self.transform((val,))[0]
+
+        return transform_value
+
+    def inverse_transform(self, outputs: np.ndarray) -> np.ndarray:
+        """
+        Decodes each number to the value with the nearest number. NaN is decoded to ``None``,
+        as is the number of the other values.
+        """
+        import numpy as np  # imported here, as NumPy is slow to import
+
+        codes = _output_matrix(outputs, 1, self)[:, 0].astype(np.float64)
+        index = np.full(len(codes), -1, dtype=np.intp)  # -1 -> None
+        if self.values:
+            valid = ~np.isnan(codes)
+            largest = len(self.values) - 1 + self.capped  # len(values) -> None
+            index[valid] = np.clip(np.rint(codes[valid]), 0, largest).astype(np.intp)
+        return _lookup_array(self.values)[index]
+
     def __repr__(self):
-        return f"Enumerate({', '.join(repr(val) for val in self.values)})"
+        args = [repr(val) for val in self.values]
+        if self.extend:
+            args.append("extend=True")
+        if self.max_categories is not None:
+            args.append(f"max_categories={self.max_categories}")
+        if self.min_frequency is not None:
+            args.append(f"min_frequency={self.min_frequency}")
+        if self.other_values:
+            args.append(f"other_values={repr(self.other_values)}")
+        return f"Enumerate({', '.join(args)})"
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+import types
+import warnings
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .DataFrameProfile import DataFrameProfile
+    from .RecordProfile import RecordProfile
+
+_SUFFIX = ".fit.pkl"
+
+
+class FitCache:
+
+    def __init__(self, directory: str,
+                 max_size: int = 512 * 2 ** 20,
+                 max_age: float = 30 * 24 * 3600,
+                 hash_content: bool = False):
+        """
+        An on-disk cache of fitted profiles, see ``ConversionProfile.fit(..., cache=...)``.
+        Each entry is keyed on a fingerprint of the input data and of the configuration of the profile
+        (the complete state of the declared converters, the ``ignore_*`` flags, ``hash_buckets``,
+        the default caps of inferred converters and the pre-processing function).
+        Functions, e.g. in ``Function`` converters or for pre-processing, are identified by their code,
+        so that editing them invalidates the entries, but changes of global variables that they use do not.
+
+        Only use directories that no one else can write to, as loading an entry can execute arbitrary code.
+
+        :param directory: The directory that holds the cache entries. It is created if necessary.
+        :param max_size: Maximum total size of all entries in bytes. The least recently used entries are removed first.
+        :param max_age: Entries that were not used for this many seconds are removed.
+        :param hash_content: If ``True``, input files are identified by a hash of their content.
+               If ``False``, they are identified by their path, size and modification time, which is much faster.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.max_age = max_age
+        self.hash_content = hash_content
+
+    def fingerprint(self, obj: pd.DataFrame | str, profile: DataFrameProfile) -> str:
+        """
+        :param obj: The DataFrame or filename that the profile is fitted to.
+        :param profile: The profile before fitting.
+        :return: The key of the cache entry for fitting the given profile to the given data.
+        """
+        h = hashlib.sha256()
+        h.update(_describe_config(profile).encode("utf-8"))
+        h.update(b"\0")
+        if isinstance(obj, str):
+            h.update(self.__describe_file(obj))
+        else:
+            h.update(_hash_dataframe(obj))
+        return h.hexdigest()
+
+    def load(self, key: str) -> RecordProfile | None:
+        """
+        :return: The fitted record profile stored under the given key, or ``None`` if there is no such entry.
+        """
+        path = self.__path(key)
+        try:
+            with open(path, "rb") as f:
+                record_profile = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            warnings.warn(f"Ignoring unreadable fit cache entry {path}: {e}")
+            return None
+        os.utime(path)  # mark as recently used
+        return record_profile
+
+    def store(self, key: str, record_profile: RecordProfile):
+        """
+        Stores the fitted record profile under the given key and evicts old entries.
+        If the profile cannot be pickled (e.g. because it contains lambda expressions), a warning is issued.
+        """
+        try:
+            data = pickle.dumps(record_profile)
+        except (pickle.PicklingError, AttributeError, TypeError) as e:
+            warnings.warn(f"Cannot cache fitted profile, because it contains objects that cannot be pickled"
+                          f" (e.g. lambda expressions or local functions): {e}")
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        # write to a temporary file first, so that concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self.__path(key))
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """
+        Removes entries that are older than ``max_age``,
+        then the least recently used entries until the total size is at most ``max_size``.
+        """
+        now = time.time()
+        entries = []  # (last use, size, path)
+        for path in self.__entry_paths():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:  # removed concurrently
+                continue
+            if now - stat.st_mtime > self.max_age:
+                _remove(path)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            _remove(path)
+            total_size -= size
+
+    def clear(self):
+        """Removes all entries."""
+        for path in self.__entry_paths():
+            _remove(path)
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _SUFFIX)
+
+    def __entry_paths(self) -> list[str]:
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return [os.path.join(self.directory, name) for name in names if name.endswith(_SUFFIX)]
+
+    def __describe_file(self, path: str) -> bytes:
+        if self.hash_content:
+            h = hashlib.sha256()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(2 ** 20), b""):
+                    h.update(block)
+            return os.path.splitext(path)[1].encode("utf-8") + h.digest()  # the extension determines the parser
+        stat = os.stat(path)
+        return f"{os.path.abspath(path)}\0{stat.st_size}\0{stat.st_mtime_ns}".encode("utf-8")
+
+    def __repr__(self):
+        return f"FitCache({repr(self.directory)})"
+
+
+def _describe_config(profile: DataFrameProfile) -> str:
+    from . import __version__
+
+    record_profile = profile._record_profile
+    return repr((
+        __version__,
+        profile.__class__.__qualname__,
+        [(repr(key), _describe_state(conv)) for key, conv in record_profile._profile.items()],
+        record_profile.ignore_undefined,
+        record_profile.ignore_uninferrable,
+        record_profile.hash_buckets,
+        record_profile.max_categories,
+        record_profile.min_frequency,
+        _describe_state(profile.pre_processing),
+    ))
+
+
+def _describe_state(obj: any, path: frozenset[int] = frozenset()) -> any:
+    """
+    Describes an object deterministically, including what ``repr()`` omits,
+    e.g. all attributes of a converter (as they would be pickled) and the code of functions.
+    Sets are sorted, so that the description doesn't depend on the hash seed of the process.
+
+    :param path: The ids of the enclosing objects, to stop at reference cycles.
+    :return: A nested structure of tuples, lists and atomic values.
+    """
+    if obj is None or isinstance(obj, (bool, int, float, complex, str, bytes)):
+        return obj
+    if isinstance(obj, type):
+        return "class", obj.__module__, obj.__qualname__
+    if id(obj) in path:
+        return "cycle"
+    path = path | {id(obj)}
+
+    def describe(o: any) -> any:
+        return _describe_state(o, path)
+
+    if isinstance(obj, (list, tuple)):
+        return type(obj).__name__, [describe(o) for o in obj]
+    if isinstance(obj, (set, frozenset)):
+        return type(obj).__name__, sorted(repr(describe(o)) for o in obj)
+    if isinstance(obj, dict):
+        return "dict", [(describe(key), describe(val)) for key, val in obj.items()]
+    if isinstance(obj, types.FunctionType):
+        closure = []
+        for cell in obj.__closure__ or ():
+            try:
+                closure.append(describe(cell.cell_contents))
+            except ValueError:  # empty cell
+                closure.append("empty")
+        return ("function", obj.__module__, obj.__qualname__, describe(obj.__code__),
+                describe(obj.__defaults__), describe(obj.__kwdefaults__), closure)
+    if isinstance(obj, types.CodeType):
+        return "code", obj.co_code, describe(obj.co_consts), obj.co_names
+    if isinstance(obj, types.MethodType):
+        return "method", describe(obj.__func__), describe(obj.__self__)
+    try:
+        reduced = obj.__reduce_ex__(pickle.DEFAULT_PROTOCOL)
+    except Exception:  # e.g. objects that cannot be pickled
+        return "object", type(obj).__module__, type(obj).__qualname__, repr(obj)
+    if isinstance(reduced, str):  # a global, e.g. a builtin function
+        return "global", getattr(obj, "__module__", None), reduced
+    return "object", describe(reduced)
+
+
+def _hash_dataframe(df: pd.DataFrame) -> bytes:
+    import pandas as pd  # imported here, as pandas is slow to import
+
+    h = hashlib.sha256()
+    h.update(repr((list(df.columns), [str(dtype) for dtype in df.dtypes])).encode("utf-8"))
+    try:
+        h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    except TypeError:  # unhashable values, e.g. lists
+        h.update(pickle.dumps(df.to_dict(orient="list")))
+    return h.digest()
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:  # removed concurrently
+        pass
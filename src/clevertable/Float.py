@@ -2,18 +2,69 @@ from __future__ import annotations
 
 import math
 from collections import Counter
-from typing import Literal, Iterable
+from fractions import Fraction
+from typing import Literal, Callable, TYPE_CHECKING
 
-from numpy import mean, median
 from math import isfinite
 
 from .Converter import Converter
-
-
-def _mode(a: Iterable[float]) -> float:
-    counter = Counter(a)
-    mode, freq = counter.most_common(1)[0]
-    return mode
+from ._utils import _output_matrix
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def _usable_number(val: any) -> float | None:
+    """:return: The value as finite float, or ``None`` if it can't be parsed or is infinite."""
+    try:
+        num = float(val)
+    except (ValueError, TypeError):
+        return None
+    except OverflowError:
+        # todo: issue warning
+        return None
+    return num if isfinite(num) else None
+
+
+def _mode(counts: Counter) -> float:
+    # the smallest of the most common numbers, so that the result doesn't depend on the order of the numbers
+    return min(counts, key=lambda num: (-counts[num], num))
+
+
+def _median(counts: Counter) -> float:
+    n = sum(counts.values())
+    lower = upper = None  # the numbers at the middle positions (n - 1) // 2 and n // 2 of the sorted numbers
+    seen = 0
+    for num in sorted(counts):
+        seen += counts[num]
+        if lower is None and seen > (n - 1) // 2:
+            lower = num
+        if seen > n // 2:
+            upper = num
+            break
+    return lower if n % 2 == 1 else (lower + upper) / 2
+
+
+def _exact_sum(numbers: list[float]) -> Fraction:
+    """
+    :return: The exact sum of the given finite numbers, without any rounding errors,
+             so that it doesn't depend on the order of the numbers.
+    """
+    import numpy as np  # imported here, as NumPy is slow to import
+
+    if not numbers:
+        return Fraction(0)
+    mantissas, exponents = np.frexp(np.asarray(numbers, dtype=np.float64))
+    integers = (mantissas * 2.0 ** 53).astype(np.int64)  # exact, as floats have 53-bit mantissas
+    # add up the integers of each exponent separately (as Python ints, which don't overflow)
+    order = np.argsort(exponents, kind="stable")
+    exponents, integers = exponents[order], integers[order]
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(exponents)) + 1))
+    smallest = int(exponents[0])
+    total = 0
+    for start, stop in zip(starts.tolist(), starts[1:].tolist() + [len(integers)]):
+        total += sum(integers[start:stop].tolist()) << (int(exponents[start]) - smallest)
+    return Fraction(total) * Fraction(2) ** (smallest - 53)
 
 
 class Float(Converter):
@@ -34,40 +85,83 @@ class Float(Converter):
         return self.__default_value
 
     def fit(self, rows: list[tuple]):
-
-        values = [row[0] for row in rows]  # unpack 1-element rows
-
         if self.__default_value in ("mean", "median", "mode"):
             # replace default value with the corresponding number
+            self.fit_merged(self.partial_fit(rows))
+
+    def partial_fit(self, rows: list[tuple]) -> tuple | Counter:
+        """
+        :return: For ``default="mean"``, the number of usable numbers and their exact sum.
+                 For ``"median"`` and ``"mode"``, how often each usable number occurs.
+        """
+        if self.__default_value not in ("mean", "median", "mode"):
+            return ()  # nothing to compute
+
+        values = [row[0] for row in rows]  # unpack 1-element rows
 
-            # collect all numbers that can be parsed
-            usable_numbers = []
-            for val in values:
-                try:
-                    val = float(val)
-                except (ValueError, TypeError):
-                    continue
-                except OverflowError:
-                    # todo: issue warning
-                    continue
-
-                if not isfinite(val):
-                    continue
-
-                usable_numbers.append(val)
-
-            if len(usable_numbers) == 0:
-                raise ValueError(f"Cannot compute {self.__default_value},"
-                                 f" because no usable numbers were found in the given data.")
-            if self.__default_value == "mean":
-                self.__default_value = float(mean(usable_numbers))
-            elif self.__default_value == "median":
-                self.__default_value = float(median(usable_numbers))
-            elif self.__default_value == "mode":
-                self.__default_value = _mode(usable_numbers)
+        # collect all numbers that can be parsed
+        usable_numbers = [num for num in map(_usable_number, values) if num is not None]
+
+        if self.__default_value == "mean":
+            return len(usable_numbers), _exact_sum(usable_numbers)
+        return Counter(usable_numbers)
+
+    def partial_fit_distinct(self, rows: list[tuple], counts: list[int]) -> tuple | Counter:
+        if self.__default_value not in ("mean", "median", "mode"):
+            return ()  # nothing to compute
+        usable_counts = Counter()
+        for row, count in zip(rows, counts):
+            num = _usable_number(row[0])  # unpack 1-element row
+            if num is not None:
+                usable_counts[num] += count
+
+        if self.__default_value == "mean":
+            return (sum(usable_counts.values()),
+                    sum((Fraction(num) * count for num, count in usable_counts.items()), Fraction(0)))
+        return usable_counts
+
+    def fit_merged(self, summary: tuple | Counter):
+        if self.__default_value not in ("mean", "median", "mode"):
+            return
+
+        n = summary[0] if self.__default_value == "mean" else sum(summary.values())
+        if n == 0:
+            raise ValueError(f"Cannot compute {self.__default_value},"
+                             f" because no usable numbers were found in the given data.")
+
+        if self.__default_value == "mean":
+            self.__default_value = float(summary[1] / n)  # correctly rounded
+        elif self.__default_value == "median":
+            self.__default_value = _median(summary)
+        elif self.__default_value == "mode":
+            self.__default_value = _mode(summary)
 
     def transform(self, row: tuple) -> tuple:
-        val = row[0]  # unpack 1-element tuple
+        return (self.__transform_value(row[0]),)  # unpack and wrap again
+
+    def try_transform_batch(self, rows: list[tuple]) -> list[tuple | None] | None:
+        default = self.__default_value
+        if default in ("mean", "median", "mode") or not all(rows):
+            return None  # not fitted, or empty rows -> transform() raises the appropriate errors
+        outputs = []
+        for row in rows:
+            val = row[0]  # unpack 1-element row
+            try:
+                num = float(val)
+            except (ValueError, TypeError, OverflowError):
+                num = math.nan
+            if math.isfinite(num):
+                outputs.append((num,))
+            elif default is None:
+                outputs.append(None)  # parsing failed and there is no default value
+            else:
+                outputs.append((default,))
+        return outputs
+
+    def scalar_transform(self) -> Callable[[any], float]:
+        return self.__transform_value
+
+    def __transform_value(self, val: any) -> float:
         try:
             num = float(val)
         except (ValueError, TypeError):
@@ -77,7 +171,7 @@ class Float(Converter):
             num = float("nan")
 
         if math.isfinite(num):
-            return (num,)
+            return num
 
         # conversion / parsing failed.
         # ensure that a usable default value exists
@@ -87,7 +181,10 @@ class Float(Converter):
         if self.__default_value in ("mean", "median", "mode"):
             raise ValueError(f"You must call fit() before transform().")
 
-        return (self.__default_value,)
+        return self.__default_value
+
+    def inverse_transform(self, outputs: np.ndarray) -> np.ndarray:
+        return _output_matrix(outputs, 1, self)[:, 0]
 
     def __repr__(self):
         if self.__default_value is None:
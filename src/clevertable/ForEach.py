@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from .Converter import Converter
-from ._utils import _parse_converter
+from ._utils import _parse_converter, _transform_nested
 
 
 class ForEach(Converter):
@@ -17,11 +17,30 @@ class ForEach(Converter):
         flattened_rows = [(element,) for row in rows for element in row]
         self.conv.fit(flattened_rows)
 
+    def fit_transform(self, rows: list[tuple]) -> list[tuple]:
+        flattened_rows = [(element,) for row in rows for element in row]
+        return _group_by_row(self.conv.fit_transform(flattened_rows), rows)
+
     def labels(self, labels: tuple) -> tuple:
         return tuple(self.conv.labels((label,)) for label in labels)
 
     def transform(self, row: tuple) -> tuple:
-        return tuple(self.conv.transform((item,)) for item in row)
+        return tuple(_transform_nested(self.conv, (item,)) for item in row)
+
+    def transform_batch(self, rows: list[tuple]) -> list[tuple]:
+        # transform the items of all rows at once
+        flattened_rows = [(element,) for row in rows for element in row]
+        return _group_by_row(self.conv.transform_batch(flattened_rows), rows)
 
     def __repr__(self):
         return f"ForEach({repr(self.conv)})"
+
+
+def _group_by_row(flattened_outputs: list[tuple], rows: list[tuple]) -> list[tuple]:
+    # group the outputs of the flattened items again by the row they came from
+    outputs = []
+    start = 0
+    for row in rows:
+        outputs.append(tuple(flattened_outputs[start:start + len(row)]))
+        start += len(row)
+    return outputs
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import copy
+from typing import Callable, Literal, TYPE_CHECKING
+
+from ._utils import _in_extend_mode
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+    from .DataFrameProfile import DataFrameProfile
+    from .Progress import Progress
+    from .TransformFailure import TransformFailure
+
+
+class FrozenProfile:
+
+    def __init__(self, profile: DataFrameProfile):
+        """
+        An immutable copy of a fitted profile, which can be shared by several threads:
+        ``transform()`` and ``transform_single()`` may be called concurrently.
+        Usually created with ``profile.freeze()``.
+
+        Changes to the original profile (e.g. fitting it again) don't affect the frozen copy.
+        Converters in extend mode (e.g. ``OneHot(extend=True)``) change during transform and can't be frozen.
+        Custom converters must not change their state in ``transform()`` and ``transform_batch()``.
+
+        :param profile: A fitted profile.
+        """
+        record_profile = profile._record_profile
+        unfitted = [key for key in record_profile._profile if key not in record_profile.keys]
+        if unfitted:
+            raise ValueError(f"The profile must be fitted before it can be frozen."
+                             f" Keys without fitted converters: {', '.join(repr(key) for key in unfitted)}")
+        extending = [key for key, conv in record_profile._profile.items() if _in_extend_mode(conv)]
+        if extending:
+            raise ValueError(f"Converters in extend mode change during transform and can't be frozen."
+                             f" Keys with converters in extend mode: {', '.join(repr(key) for key in extending)}")
+        # a private copy, so that no one else can change the converters
+        object.__setattr__(self, "_profile", copy.deepcopy(profile))
+
+    def transform(self, obj: pd.DataFrame | str,
+                  errors: Literal["raise", "coerce", "collect"] = "raise",
+                  n_threads: int = 1,
+                  columns: list = None,
+                  progress: Callable[[Progress], None] = None
+                  ) -> pd.DataFrame | tuple[pd.DataFrame, list[TransformFailure]]:
+        """
+        Transform the given DataFrame according to the frozen profile.
+        See :meth:`DataFrameProfile.transform` for the parameters.
+        Filenames are only supported if the frozen profile is a ``ConversionProfile``.
+        """
+        return self._profile.transform(obj, errors, n_threads, columns, progress)
+
+    def transform_single(self, row: dict[str, any]) -> dict[str, any]:
+        return self._profile.transform_single(row)
+
+    def transform_records(self, rows: list[dict[str, any]]) -> list[dict[str, any]]:
+        """See :meth:`DataFrameProfile.transform_records`."""
+        return self._profile.transform_records(rows)
+
+    def inverse_transform(self, outputs: pd.DataFrame | np.ndarray) -> pd.DataFrame:
+        """See :meth:`DataFrameProfile.inverse_transform`."""
+        return self._profile.inverse_transform(outputs)
+
+    @property
+    def column_names(self) -> dict[any, tuple]:
+        """See :attr:`DataFrameProfile.column_names`. The returned dict is a copy."""
+        return dict(self._profile.column_names)
+
+    @property
+    def output_labels(self) -> tuple:
+        """See :attr:`DataFrameProfile.output_labels`."""
+        return self._profile.output_labels
+
+    def __setattr__(self, name: str, value: any):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __contains__(self, item):
+        return item in self._profile
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({repr(self._profile)})"
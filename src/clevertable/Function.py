@@ -4,6 +4,13 @@ from typing import Callable, Iterable
 
 from .StrictFunction import StrictFunction
 
+_FLAGS_SAMPLE_SIZE = 1000  # number of rows used to infer the flags if not all outputs are needed
+
+
+def _all_single_element_tuples(rows: list[tuple]) -> bool:
+    # infer from data: unpack if the input is always a 1-element tuple
+    return all(isinstance(row, tuple) and len(row) == 1 for row in rows)
+
 
 class Function(StrictFunction):
 
@@ -65,29 +72,38 @@ class Function(StrictFunction):
         return (labels,)  # wrap single values
 
     def fit(self, rows: list[tuple]):
-        self.__set_flags(rows)
-        super().fit(rows)
-
-    def __set_flags(self, rows: list[tuple]):
+        if self.__labels is None:
+            # the output cardinality must be inferred from all outputs anyway
+            self.fit_transform(rows)
+            return
+
+        # with a custom labels function, only the flags need to be inferred,
+        # and a bounded sample of the rows is sufficient for that
+        self._unpack_single_input = _all_single_element_tuples(rows)
+        step = max(1, len(rows) // _FLAGS_SAMPLE_SIZE)
+        sample = rows[::step]
+        self.__set_output_flags([self.__transform(self.__input_processing(row)) for row in sample])
+
+    def fit_transform(self, rows: list[tuple]) -> list[tuple]:
+        # the wrapped function is called only once for each row,
+        # both for inferring the flags and for computing the output
+        self._unpack_single_input = _all_single_element_tuples(rows)
+        outputs = [self.__transform(self.__input_processing(row)) for row in rows]
+        self.__set_output_flags(outputs)
+        outputs = [self.__output_processing(output) for output in outputs]
+        self._fit_output_cardinality(outputs)
+        return outputs
+
+    def __set_output_flags(self, outputs: list):
         """
-        This method looks at the fit data and determines how the input and output must be processed
-        during ``transform()`` in order to make the wrapped function work.
+        This method looks at the output of the wrapped function for the fit data and determines
+        how the output must be processed during ``transform()`` in order to always obtain tuples.
         """
-        # infer from data: unpack if the input is always a 1-element tuple
-        self._unpack_single_input = all(isinstance(row, tuple) and len(row) == 1 for row in rows)
-
-        # apply input processing accordingly
-        rows = [self.__input_processing(row)
-                for row in rows]
-
-        # transform data with func
-        rows = [self.__transform(row) for row in rows]
-
         self._convert_iterable_output = False
         self._wrap_output = False
-        if not all(isinstance(o, tuple) for o in rows):
+        if not all(isinstance(o, tuple) for o in outputs):
             # turn the output into a tuple:
-            if all(isinstance(o, Iterable) and not isinstance(o, str) for o in rows):  # non-string iterables
+            if all(isinstance(o, Iterable) and not isinstance(o, str) for o in outputs):  # non-string iterables
                 self._convert_iterable_output = True
             else:
                 self._wrap_output = True
@@ -111,6 +127,19 @@ class Function(StrictFunction):
             f"Function {self.__transform.__name__} did not return a tuple: {repr(output)}"
         return output
 
+    def __getstate__(self):
+        # bound private methods cannot be pickled (because of name mangling),
+        # so they are bound again in __setstate__()
+        state = self.__dict__.copy()
+        state["_transform"] = None
+        state["_labels"] = None
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._transform = self.__fixed_transform
+        self._labels = self.__labels and self.__fixed_labels
+
     def __repr__(self):
         if self.__labels is None:
             # callables are parsed to Function()
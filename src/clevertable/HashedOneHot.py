@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from hashlib import blake2b
+
+from .Converter import Converter
+
+_MAX_SHARED_ROWS_BUCKETS = 1024  # above this, caching one output row per bucket would need too much memory
+
+
+def _stable_hash(value: any) -> int:
+    # unlike hash(), this is identical across processes and Python versions
+    return int.from_bytes(blake2b(str(value).encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class HashedOneHot(Converter):
+
+    def __init__(self, buckets: int = 64, signed: bool = False):
+        """
+        Like ``OneHot()``, but instead of one output column per value, each value is hashed into one
+        of a fixed number of output columns (feature hashing).
+        No values need to be stored during ``fit()``, so the output width is constant,
+        no matter how many distinct values there are, and unseen values need no special treatment.
+        Different values may share the same output column.
+
+        If a row contains multiple items (e.g. after ``Split()``), all items are hashed
+        into the same output, so that each output column counts the items that were hashed into it.
+        ``None`` is ignored, i.e. results in all-zeros output.
+
+        Values are hashed based on their string representation, so e.g. ``5`` and ``"5"`` share a column.
+
+        :param buckets: The number of output columns.
+        :param signed: If ``True``, a second hash determines whether a value adds 1 or -1 to its column,
+               so that collisions tend to cancel out instead of adding up.
+        """
+        if buckets < 1:
+            raise ValueError(f"The number of buckets must be positive, but got {buckets}")
+        self.buckets = buckets
+        self.signed = signed
+
+        # shared output rows for the common case of a single value per row
+        self.__unit_rows: dict[tuple[int, int], tuple[int]] = {}
+        self.__zeros = (0,) * buckets
+
+    def bucket(self, value: any) -> tuple[int, int]:
+        """
+        :return: The output column index of the given value and its sign (1 or -1).
+        """
+        h = _stable_hash(value)
+        sign = -1 if self.signed and h >> 63 else 1  # use the highest bit for the sign
+        return h % self.buckets, sign
+
+    def labels(self, labels: tuple) -> tuple[str]:
+        label = labels[0]  # unpack 1-element tuple
+        return tuple(f"{label}[{i}]" for i in range(self.buckets))
+
+    def transform(self, row: tuple) -> tuple[int]:
+        return self.__transform(row, self.bucket)
+
+    def transform_batch(self, rows: list[tuple]) -> list[tuple]:
+        # each distinct value is only hashed once per batch
+        cache = {}
+
+        def bucket(value: any) -> tuple[int, int]:
+            try:
+                return cache[value]
+            except KeyError:
+                cache[value] = result = self.bucket(value)
+                return result
+            except TypeError:  # unhashable
+                return self.bucket(value)
+
+        return [self.__transform(row, bucket) for row in rows]
+
+    def __transform(self, row: tuple, bucket: callable) -> tuple[int]:
+        if len(row) == 1:
+            val = row[0]
+            if val is None:
+                return self.__zeros
+            return self.__unit_row(*bucket(val))
+
+        counts = [0] * self.buckets
+        for val in row:
+            if val is None:
+                continue
+            i, sign = bucket(val)
+            counts[i] += sign
+        return tuple(counts)
+
+    def __unit_row(self, i: int, sign: int) -> tuple[int]:
+        row = self.__unit_rows.get((i, sign))
+        if row is None:
+            counts = [0] * self.buckets
+            counts[i] = sign
+            row = tuple(counts)
+            if self.buckets <= _MAX_SHARED_ROWS_BUCKETS:
+                self.__unit_rows[i, sign] = row
+        return row
+
+    def __repr__(self):
+        args = [repr(self.buckets)]
+        if self.signed:
+            args.append("signed=True")
+        return f"HashedOneHot({', '.join(args)})"
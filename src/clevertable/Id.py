@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Callable
+
 from .Converter import Converter
 
 
@@ -8,3 +10,13 @@ class Id(Converter):
 
     def transform(self, row: tuple) -> tuple:
         return row
+
+    def try_transform_batch(self, rows: list[tuple]) -> list[tuple | None]:
+        return rows  # never fails
+
+    def scalar_transform(self) -> Callable[[any], any]:
+        return _identity
+
+
+def _identity(val: any) -> any:
+    return val
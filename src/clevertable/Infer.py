@@ -1,15 +1,31 @@
 from __future__ import annotations
 
 import re
+from collections import Counter
 
 from .Converter import Converter
 from .Ignore import Ignore
+from ._utils import _count_unique_up_to, _has_fewer_unique_than, _weighted_counts
 
 
 class Infer(Converter):
 
-    def __init__(self, ignore_uninferrable: bool = False):
+    def __init__(self, ignore_uninferrable: bool = False, hash_buckets: int = None,
+                 max_categories: int = None, min_frequency: int = None):
+        """
+        :param ignore_uninferrable: If ``True``, ``Ignore()`` is chosen if no converter can be inferred,
+               instead of raising an error.
+        :param hash_buckets: If given, columns with too many distinct values for ``Enumerate()``
+               are converted with ``HashedOneHot(hash_buckets)``.
+        :param max_categories: Passed on to inferred ``OneHot()``, ``Enumerate()`` and ``List()`` converters,
+               which then merge all but the most frequent values into a single ``other`` category.
+        :param min_frequency: Passed on to inferred ``OneHot()``, ``Enumerate()`` and ``List()`` converters,
+               which then merge the values that occur less often into a single ``other`` category.
+        """
         self.ignore_uninferrable = ignore_uninferrable
+        self.hash_buckets = hash_buckets
+        self.max_categories = max_categories
+        self.min_frequency = min_frequency
         self.inferred = None
 
     def __repr__(self):
@@ -24,14 +40,40 @@ class Infer(Converter):
         If a converter could be inferred, it is fitted with the data and stored in self.inferred.
         :raises ValueError: if no converter can be inferred and ignore_uninferrable is False
         """
+        self.__infer(rows)
+        self.inferred.fit(rows)
+
+    def fit_transform(self, rows: list[tuple]) -> list[tuple]:
+        self.__infer(rows)
+        return self.inferred.fit_transform(rows)
+
+    def partial_fit(self, rows: list[tuple]) -> Counter:
+        """
+        :return: How often each distinct row occurs (the column profile), as the inference only depends on this,
+                 and the inferred converters only depend on the distinct rows and their frequencies.
+        """
+        return Counter(rows)
+
+    def partial_fit_distinct(self, rows: list[tuple], counts: list[int]) -> Counter:
+        return _weighted_counts(rows, counts)
+
+    def fit_merged(self, summary: Counter):
+        distinct_rows = list(summary)
+        self.__infer(distinct_rows, sum(summary.values()))
+        summary = self.inferred.partial_fit_distinct(distinct_rows, [summary[row] for row in distinct_rows])
+        if summary is None:
+            raise ValueError(f"{self.inferred.__class__.__name__} doesn't support fitting on parts of the data.")
+        self.inferred.fit_merged(summary)
+
+    def __infer(self, rows: list[tuple], n_rows: int = None):
         try:
-            self.inferred = _infer_converter_from_data(rows)
+            self.inferred = _infer_converter_from_data(rows, self.hash_buckets, n_rows,
+                                                       self.max_categories, self.min_frequency)
         except ValueError as e:
             if self.ignore_uninferrable:
                 self.inferred = Ignore()
                 return
             raise e
-        self.inferred.fit(rows)
 
     def labels(self, labels: tuple) -> tuple:
         return self.inferred.labels(labels)
@@ -39,17 +81,29 @@ class Infer(Converter):
     def transform(self, row: tuple) -> tuple:
         return self.inferred.transform(row)
 
+    def transform_batch(self, rows: list[tuple]) -> list[tuple]:
+        return self.inferred.transform_batch(rows)
 
-def _infer_converter_from_data(rows: list[tuple]) -> Converter:
+
+def _infer_converter_from_data(rows: list[tuple], hash_buckets: int = None, n_rows: int = None,
+                               max_categories: int = None, min_frequency: int = None) -> Converter:
     """Tries to infer the best converter from the given data.
-    If no converter can be inferred, a ValueError is raised."""
+    If no converter can be inferred, a ValueError is raised.
+    :param hash_buckets: If given, HashedOneHot(hash_buckets) is chosen for columns with too many distinct values.
+    :param n_rows: The total number of rows, if only the distinct rows are given.
+    :param max_categories: Passed on to categorical converters (OneHot, Enumerate and List).
+    :param min_frequency: Passed on to categorical converters (OneHot, Enumerate and List)."""
     # dynamic imports in order to break circular dependency
     from .Binary import Binary
+    from .DateTime import _infer_date_time
     from .Enumerate import Enumerate
     from .Float import Float
+    from .HashedOneHot import HashedOneHot
     from .List import List, ListAndOr
     from .OneHot import OneHot
 
+    caps = {"max_categories": max_categories, "min_frequency": min_frequency}
+
     # if only contains 1-element rows:
     if all(len(row) == 1 for row in rows):
 
@@ -65,6 +119,10 @@ def _infer_converter_from_data(rows: list[tuple]) -> Converter:
         if all(map(_is_parseable_float, values)):
             return Float()
 
+        date_time = _infer_date_time(values)
+        if date_time is not None:
+            return date_time
+
         # since numerical approach failed,
         # we now try categorical approaches
         string_values = [val for val in values if isinstance(val, str)]
@@ -75,15 +133,19 @@ def _infer_converter_from_data(rows: list[tuple]) -> Converter:
             # check if there are also "and" or "or" in the values
             regex_list_and_or = re.compile("|".join(ListAndOr._DEFAULT_DELIMITER_AND_OR))
             if any(map(regex_list_and_or.search, string_values)):
-                return ListAndOr()
-            return List()
+                return ListAndOr(**caps)
+            return List(**caps)
 
-        num_unique_entries = len(set(values))
+        # only count exactly up to 100, near-unique columns are not stored in a set
+        num_unique_entries = _count_unique_up_to(values, 100)
         if num_unique_entries <= 2:
             return Binary()
         elif num_unique_entries <= 10:
-            return OneHot()
-        elif num_unique_entries <= 100 or num_unique_entries < 0.1 * len(values):
-            return Enumerate()
+            return OneHot(**caps)
+        elif num_unique_entries <= 100 or _has_fewer_unique_than(values, 0.1 * (n_rows or len(values))):
+            return Enumerate(**caps)
+        elif hash_buckets is not None:
+            # too many distinct values to store them all
+            return HashedOneHot(hash_buckets)
 
     raise ValueError(f"Cannot infer converter from values: {rows[:5]} ...")
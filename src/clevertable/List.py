@@ -1,11 +1,24 @@
 from __future__ import annotations
 
+import copy
+from collections import Counter
 from typing import Iterable
 
 from .Converter import Converter
 from .Flatten import Flatten
 from .Pipeline import Pipeline
-from ._utils import _ensure_list
+from ._utils import _ensure_list, _weighted_counts
+
+
+def _remove_empty_string(s: tuple) -> set:
+    return set(s) - {""}  # remove empty string if present
+
+
+def _add_none(s: tuple) -> set:
+    # row could be [] at this point
+    # -> so add 'None' here to ensure there's always at least an all-zeros output
+    # (None works because None != None, so it is guaranteed to have all zeros)
+    return set(s) | {None}
 
 
 class List(Pipeline):
@@ -13,10 +26,28 @@ class List(Pipeline):
     _DEFAULT_STRIP = r"\s+"  # remove whitespaces
 
     def __init__(self, delimiter: str | Iterable[str] = _DEFAULT_DELIMITER,
-                 strip: str | Iterable[str] = _DEFAULT_STRIP):
+                 strip: str | Iterable[str] = _DEFAULT_STRIP,
+                 extend: bool = False,
+                 max_categories: int = None,
+                 min_frequency: int = None):
+        """
+        Splits the values into lists of items and creates one output column per item (like ``OneHot()``).
+        :param delimiter: Regular expression(s) at which the values are split.
+        :param strip: Regular expression(s) that are removed from the start and end of each item.
+        :param extend: If ``True``, unknown items get a new output column during ``transform()``,
+               which is appended after the existing columns. The appended items are listed in ``added_values``.
+        :param max_categories: If given, at most this many items get their own output column, the most frequent ones.
+               All other items share a single output column ``<label>=other`` (see ``OneHot()``).
+               The merged items are listed in ``other_values``.
+        :param min_frequency: If given, only items that occur at least this many times during ``fit()``
+               get their own output column. All other items share the ``other`` column.
+        """
         # save args for __repr__
         self.__arg_delimiter = delimiter
         self.__arg_strip = strip
+        self.__arg_extend = extend
+        self.__arg_max_categories = max_categories
+        self.__arg_min_frequency = min_frequency
 
         delimiter = _ensure_list(delimiter)
         strip = _ensure_list(strip)
@@ -26,16 +57,14 @@ class List(Pipeline):
         from .Strip import Strip
         from .Transpose import Transpose
 
-        self.__one_hot = OneHot()  # need to access later
+        self.__one_hot = OneHot(extend=extend, max_categories=max_categories,
+                                min_frequency=min_frequency)  # need to access later
         super().__init__(
             Split(*delimiter),
             ForEach(Strip(*strip)),
             Flatten(),
-            lambda s: set(s) - {""},  # remove empty string if present
-            # row could be [] at this point
-            # -> so add 'None' here to ensure there's always at least an all-zeros output
-            # (None works because None != None, so it is guaranteed to have all zeros)
-            lambda s: set(s) | {None},
+            _remove_empty_string,
+            _add_none,
             ForEach(self.__one_hot),
             Transpose(),
             ForEach(max),
@@ -46,6 +75,41 @@ class List(Pipeline):
     def values(self):
         return self.__one_hot.values
 
+    @property
+    def added_values(self) -> tuple:
+        return self.__one_hot.added_values
+
+    @property
+    def other_values(self) -> tuple:
+        return self.__one_hot.other_values
+
+    def partial_fit(self, rows: list[tuple]) -> set | Counter:
+        if self.__one_hot.capped:
+            return Counter(rows)  # the caps depend on the frequencies of the items
+        # the items only depend on the distinct values
+        return set(rows)
+
+    def partial_fit_distinct(self, rows: list[tuple], counts: list[int]) -> set | Counter:
+        if self.__one_hot.capped:
+            return _weighted_counts(rows, counts)
+        return self.partial_fit(rows)
+
+    def fit_merged(self, summary: set | Counter):
+        if isinstance(summary, Counter):
+            self.fit(list(summary.elements()))  # each value as often as it occurred
+        else:
+            self.fit(list(summary))
+
+    def select_outputs(self, indices: tuple[int, ...]) -> List | None:
+        if self.__one_hot.extend:
+            return None  # the items may still change
+        if self.__one_hot.capped and len(self.values) in indices:
+            return None  # the other column depends on all items
+        selected = copy.deepcopy(self)
+        selected.__one_hot.values = tuple(self.values[i] for i in indices)  # only compare with the selected items
+        selected.__one_hot.max_categories = selected.__one_hot.min_frequency = None  # no other column
+        return selected
+
     @property
     def converters(self) -> list[Converter]:
         # need to override this because otherwise pipeline will mess with the internal converters of List
@@ -58,6 +122,12 @@ class List(Pipeline):
             args.append(f"delimiter={repr(self.__arg_delimiter)}")
         if self.__arg_strip != List._DEFAULT_STRIP:
             args.append(f"strip={repr(self.__arg_strip)}")
+        if self.__arg_extend:
+            args.append("extend=True")
+        if self.__arg_max_categories is not None:
+            args.append(f"max_categories={self.__arg_max_categories}")
+        if self.__arg_min_frequency is not None:
+            args.append(f"min_frequency={self.__arg_min_frequency}")
         return f"List({', '.join(args)})"
 
 
@@ -72,10 +142,14 @@ class ListAndOr(List):
         r"\.",  # in case the list contains dots
     ]
 
-    def __init__(self, delimiter: str | Iterable[str] = None, strip: str | Iterable[str] = None):
+    def __init__(self, delimiter: str | Iterable[str] = None, strip: str | Iterable[str] = None,
+                 extend: bool = False, max_categories: int = None, min_frequency: int = None):
         # save args for __repr__
         self.__arg_delimiter = delimiter
         self.__arg_strip = strip
+        self.__arg_extend = extend
+        self.__arg_max_categories = max_categories
+        self.__arg_min_frequency = min_frequency
 
         super().__init__(
             delimiter=(ListAndOr._DEFAULT_DELIMITER_AND_OR +
@@ -83,7 +157,10 @@ class ListAndOr(List):
                        _ensure_list(delimiter)),
             strip=(ListAndOr._DEFAULT_STRIP_AND_OR +
                    _ensure_list(List._DEFAULT_STRIP) +
-                   _ensure_list(strip))
+                   _ensure_list(strip)),
+            extend=extend,
+            max_categories=max_categories,
+            min_frequency=min_frequency,
         )
 
     def __repr__(self):
@@ -92,4 +169,10 @@ class ListAndOr(List):
             args.append(f"delimiter={repr(self.__arg_delimiter)}")
         if self.__arg_strip is not None:
             args.append(f"strip={repr(self.__arg_strip)}")
+        if self.__arg_extend:
+            args.append("extend=True")
+        if self.__arg_max_categories is not None:
+            args.append(f"max_categories={self.__arg_max_categories}")
+        if self.__arg_min_frequency is not None:
+            args.append(f"min_frequency={self.__arg_min_frequency}")
         return f"ListAndOr({', '.join(args)})"
@@ -1,6 +1,15 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING, Callable
+
 from .Converter import Converter
+from ._utils import _describe_rows, _lookup_array, _output_matrix
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_MAX_INT_LOOKUP_SIZE = 4096  # lookup tables with small non-negative integer keys are also stored as arrays
+_INVERSE_CHUNK_SIZE = 2 ** 20  # maximum number of (row, entry) pairs that are compared at once in inverse_transform()
 
 
 class Map(Converter):
@@ -23,6 +32,10 @@ class Map(Converter):
             default = (default,)
         self.default_value: tuple | None = default
 
+        # only for keys that are small non-negative ints (but not bools, which behave differently in arrays)
+        self.__has_int_keys = all(type(key) is int and 0 <= key < _MAX_INT_LOOKUP_SIZE for key in lookup_table)
+        self.__int_lookup = None  # created on first use
+
     def transform(self, row: tuple) -> tuple:
         val = row[0]
         if val in self.lookup_table:
@@ -31,8 +44,106 @@ class Map(Converter):
             return self.default_value
         raise KeyError(f"Value '{val}' not found in lookup table and no default value is specified.")
 
+    def transform_batch(self, rows: list[tuple]) -> list[tuple]:
+        values = [row[0] for row in rows]  # unpack 1-element tuples
+
+        outputs = None
+        if self.__has_int_keys and values and type(values[0]) is int:
+            outputs = self.__transform_ints(values)
+        if outputs is None:
+            # a single pass of hash table lookups, unknown values result in None
+            outputs = list(map(self.lookup_table.get, values, [self.default_value] * len(values)))
+
+        if self.default_value is None and None in outputs:
+            missing = [i for i, output in enumerate(outputs) if output is None]
+            raise KeyError(f"Values not found in lookup table and no default value is specified:"
+                           f" {_describe_rows(values, missing)}")
+        return outputs
+
+    def __transform_ints(self, values: list) -> list[tuple] | None:
+        # look up all values at once by indexing the lookup array, if all values are small non-negative ints
+        import numpy as np  # imported here, as NumPy is slow to import
+
+        if self.__int_lookup is None:
+            self.__int_lookup = _int_lookup_array(self.lookup_table, self.default_value)
+        arr = np.asarray(values)
+        if arr.dtype.kind not in "iu" or arr.min() < 0 or arr.max() >= len(self.__int_lookup):
+            return None
+        return self.__int_lookup[arr].tolist()
+
+    def try_transform_batch(self, rows: list[tuple]) -> list[tuple | None] | None:
+        if not all(rows):
+            return None  # empty rows -> transform() raises the appropriate error
+        try:
+            # unknown values result in the default value, or in None if there is none
+            return [self.lookup_table.get(row[0], self.default_value) for row in rows]
+        except TypeError:  # unhashable values
+            return None
+
+    def scalar_transform(self) -> Callable[[any], any] | None:
+        if any(len(val) != 1 for val in self.lookup_table.values()):
+            return None
+        if self.default_value is not None and len(self.default_value) != 1:
+            return None  # the default value has a different number of outputs than the table values
+        table = {key: val[0] for key, val in self.lookup_table.items()}  # unpack 1-element tuples
+
+        def transform_value(val: any) -> any:
+            try:
+                return table[val]
+            except KeyError:
+                return self.transform((val,))[0]  # default value or error
+
+        return transform_value
+
+    def inverse_transform(self, outputs: np.ndarray) -> np.ndarray | None:
+        """
+        Decodes each row to the first key of the lookup table whose value is nearest (for numbers)
+        or equal (for other values). Rows that equal no value (or contain NaN) are decoded to ``None``.
+        """
+        import numpy as np  # imported here, as NumPy is slow to import
+
+        keys = list(self.lookup_table.keys())
+        values = list(self.lookup_table.values())
+        if any(len(val) != len(values[0]) for val in values):
+            return None
+        outputs = _output_matrix(outputs, len(values[0]), self)
+        try:
+            table = np.array(values, dtype=np.float64)
+            outputs = outputs.astype(np.float64, copy=False)
+            numeric = True
+        except (ValueError, TypeError):
+            table = np.empty((len(values), len(values[0])), dtype=object)
+            table[:] = values
+            numeric = False
+
+        index = np.full(len(outputs), -1, dtype=np.intp)  # -1 -> None
+        step = max(1, _INVERSE_CHUNK_SIZE // len(keys))
+        for start in range(0, len(outputs), step):
+            # compare a chunk of rows with all values of the lookup table at once
+            chunk = outputs[start:start + step]
+            if numeric:
+                distances = ((chunk[:, None, :] - table[None, :, :]) ** 2).sum(axis=2)
+                found = ~np.isnan(chunk).any(axis=1)
+                nearest = distances.argmin(axis=1)
+            else:
+                matches = (chunk[:, None, :] == table[None, :, :]).all(axis=2)
+                found = matches.any(axis=1)
+                nearest = matches.argmax(axis=1)  # the first match
+            index[start:start + step][found] = nearest[found]
+        return _lookup_array(keys)[index]
+
     def __repr__(self):
         if self.__default_arg is None:
             return repr(self.lookup_table)
         else:
             return f"Map({repr(self.lookup_table)}, default={repr(self.__default_arg)})"
+
+
+def _int_lookup_array(lookup_table: dict[int, tuple], default: tuple | None) -> np.ndarray:
+    import numpy as np  # imported here, as NumPy is slow to import
+
+    lookup = np.empty(max(lookup_table) + 1, dtype=object)
+    lookup.fill(default)  # unknown keys map to the default value (or None)
+    for key, val in lookup_table.items():
+        lookup[key] = val
+    return lookup
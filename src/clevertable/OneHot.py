@@ -1,22 +1,75 @@
 from __future__ import annotations
 
+from collections import Counter
+from typing import TYPE_CHECKING
+
 from .Converter import Converter
+from ._utils import _lookup_array, _output_matrix, _check_category_caps, _cap_categories, _weighted_counts
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 class OneHot(Converter):
 
-    def __init__(self, *values: any):
+    def __init__(self, *values: any, extend: bool = False,
+                 max_categories: int = None, min_frequency: int = None, other_values: tuple = ()):
+        """
+        Creates one output column per value, which is 1 if the input equals this value and 0 otherwise.
+        :param values: The known values. If not given, they are inferred from the data during ``fit()``.
+        :param extend: If ``True``, unknown values get a new output column during ``transform()``,
+               which is appended after the existing columns, instead of resulting in all-zeros output.
+               The appended values are listed in ``added_values``.
+        :param max_categories: If given, at most this many values get their own output column during ``fit()``,
+               the most frequent ones. All other values (including values that are unknown after ``fit()``)
+               share a single additional output column ``<label>=other``.
+        :param min_frequency: If given, only values that occur at least this many times during ``fit()``
+               get their own output column. All other values share the ``other`` column, like for ``max_categories``.
+        :param other_values: The values that were merged into the ``other`` column during ``fit()``.
+               Only for information, as all values that are not in ``values`` are counted as ``other``.
+        """
+        _check_category_caps(max_categories, min_frequency, extend)
         self.values = values
+        self.extend = extend
+        self.max_categories = max_categories
+        self.min_frequency = min_frequency
+        self.other_values = tuple(other_values)
+        self.added_values: tuple = ()  # values appended during transform() in extend mode, in order
+
+    @property
+    def capped(self) -> bool:
+        """Whether there is an ``other`` column, i.e. ``max_categories`` or ``min_frequency`` is given."""
+        return self.max_categories is not None or self.min_frequency is not None
 
     def fit(self, rows: list[tuple]):
         if not self.values:
             # infer values from data
-            values = [row[0] for row in rows]  # unpack 1-element rows
-            unique_values = set(values)
+            self.fit_merged(self.partial_fit(rows))
+
+    def partial_fit(self, rows: list[tuple]) -> set | Counter:
+        if self.values:
+            return set()  # values are known already
+        values = [row[0] for row in rows]  # unpack 1-element rows
+        if self.capped:
+            return Counter(values)  # the caps depend on the frequencies
+        return set(values)
+
+    def partial_fit_distinct(self, rows: list[tuple], counts: list[int]) -> set | Counter:
+        if self.values or not self.capped:
+            return self.partial_fit(rows)  # only the distinct values matter
+        return _weighted_counts((row[0] for row in rows), counts)
+
+    def fit_merged(self, summary: set | Counter):
+        if not self.values:
+            if self.capped:
+                counts = Counter(summary)
+                del counts[None]  # None is not a category, see below
+                self.values, self.other_values = _cap_categories(counts, self.max_categories, self.min_frequency)
+                return
 
             # now remove None, because we want to keep None a special value
             # that can be used for generating all-zeros output
-            unique_values -= {None}
+            unique_values = summary - {None}
 
             # try sorting
             unique_values = list(unique_values)
@@ -31,7 +84,8 @@ class OneHot(Converter):
     def labels(self, labels: tuple) -> tuple[str]:
         label = labels[0]  # unpack 1-element tuple
         assert isinstance(label, str), f"Expected label to be a string, but got {label} of type {type(label)}!"
-        return tuple(f"{label}={value}" for value in self.values)
+        other = (f"{label}=other",) if self.capped else ()
+        return tuple(f"{label}={value}" for value in self.values) + other
 
     def transform(self, row: tuple) -> tuple[int]:
         val = row[0]  # unpack 1-element tuple
@@ -39,7 +93,59 @@ class OneHot(Converter):
         # note that if val is None, then the output is all-zeros
         # (even if an entry in self.values would be None, because None != None)
 
-        return tuple(int(val == val_) for val_ in self.values)
+        if self.extend:
+            self.__extend(val)
+        output = tuple(int(val == val_) for val_ in self.values)
+        if self.capped:
+            output += (int(val is not None and 1 not in output),)  # the other column
+        return output
+
+    def transform_batch(self, rows: list[tuple]) -> list[tuple]:
+        if self.extend:
+            # add all new values first, so that all rows of the batch have the same length
+            for row in rows:
+                self.__extend(row[0])
+        return super().transform_batch(rows)
+
+    def try_transform_batch(self, rows: list[tuple]) -> list[tuple | None] | None:
+        if not all(rows):
+            return None  # empty rows -> transform() raises the appropriate error
+        return self.transform_batch(rows)  # never fails
+
+    def select_outputs(self, indices: tuple[int, ...]) -> OneHot | None:
+        if self.extend:
+            return None  # the values may still change
+        if self.capped and len(self.values) in indices:
+            return None  # the other column depends on all values
+        return OneHot(*(self.values[i] for i in indices))
+
+    def inverse_transform(self, outputs: np.ndarray) -> np.ndarray:
+        """
+        Decodes each row to the value of its largest entry, e.g. the most probable value of predicted probabilities.
+        All-zeros rows (and rows with NaN) are decoded to ``None``, as are rows whose largest entry is ``other``.
+        """
+        import numpy as np  # imported here, as NumPy is slow to import
+
+        width = len(self.values) + self.capped
+        outputs = _output_matrix(outputs, width, self).astype(np.float64, copy=False)
+        index = np.full(len(outputs), -1, dtype=np.intp)  # -1 -> None
+        decodable = (outputs != 0).any(axis=1) & ~np.isnan(outputs).any(axis=1)
+        index[decodable] = outputs[decodable].argmax(axis=1)
+        return _lookup_array(self.values)[index]
+
+    def __extend(self, val: any):
+        if val is not None and val not in self.values:
+            self.values += (val,)
+            self.added_values += (val,)
 
     def __repr__(self):
-        return f"OneHot({', '.join(repr(val) for val in self.values)})"
+        args = [repr(val) for val in self.values]
+        if self.extend:
+            args.append("extend=True")
+        if self.max_categories is not None:
+            args.append(f"max_categories={self.max_categories}")
+        if self.min_frequency is not None:
+            args.append(f"min_frequency={self.min_frequency}")
+        if self.other_values:
+            args.append(f"other_values={repr(self.other_values)}")
+        return f"OneHot({', '.join(args)})"
@@ -1,6 +1,6 @@
 from .Infer import Infer
 from .Converter import Converter
-from ._utils import _parse_converter
+from ._utils import _parse_converter, _transform_nested
 
 
 class Parallel(Converter):
@@ -29,6 +29,30 @@ class Parallel(Converter):
                     f"Infer() converter at index {i} did not infer a converter during fit()"
                 self.converters[i] = conv.inferred
 
+    def fit_transform(self, rows: list[tuple]) -> list[tuple]:
+        for row in rows:
+            assert len(row) == len(self.converters), \
+                f"Parallel converter expected {len(self.converters)} elements, but got {len(row)}: {row}"
+
+        # transpose rows
+        cols = list(zip(*rows))
+
+        output_cols = []
+        for conv, col in zip(self.converters, cols):
+            values = [(val,) for val in col]  # each row must be a tuple
+            output_cols.append(conv.fit_transform(values))
+
+        # replace all Infer converters with the nested inferred converter
+        for i, conv in enumerate(self.converters):
+            if isinstance(conv, Infer):
+                assert conv.inferred is not None, \
+                    f"Infer() converter at index {i} did not infer a converter during fit()"
+                self.converters[i] = conv.inferred
+
+        if not output_cols:
+            return [() for _ in rows]
+        return list(zip(*output_cols))
+
     def labels(self, labels: tuple) -> tuple:
         assert isinstance(labels, tuple)
         assert len(labels) == len(self.converters)
@@ -37,7 +61,17 @@ class Parallel(Converter):
     def transform(self, row: tuple) -> tuple:
         assert len(row) == len(self.converters), \
             f"Parallel converter expected {len(self.converters)} elements, but got {len(row)}: {row}"
-        return tuple(conv.transform((val,)) for val, conv in zip(row, self.converters))
+        return tuple(_transform_nested(conv, (val,)) for val, conv in zip(row, self.converters))
+
+    def transform_batch(self, rows: list[tuple]) -> list[tuple]:
+        for row in rows:
+            assert len(row) == len(self.converters), \
+                f"Parallel converter expected {len(self.converters)} elements, but got {len(row)}: {row}"
+        if not self.converters:
+            return [() for _ in rows]
+        cols = list(zip(*rows))
+        output_cols = [conv.transform_batch([(val,) for val in col]) for conv, col in zip(self.converters, cols)]
+        return list(zip(*output_cols))
 
     def __repr__(self):
         return f"Parallel({', '.join(repr(conv) for conv in self.converters)})"
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from typing import Callable
+
 from .Infer import Infer
 from .Converter import Converter
 from .Id import Id
-from ._utils import _parse_converter
+from ._utils import _parse_converter, _transform_nested
 
 
 class _Pipeline(Converter):
@@ -13,8 +15,12 @@ class _Pipeline(Converter):
         self.second = _parse_converter(second)
 
     def fit(self, rows: list[tuple]):
-        self.first.fit(rows)
-        self.second.fit([self.first.transform(row) for row in rows])
+        self.fit_transform(rows)
+
+    def fit_transform(self, rows: list[tuple]) -> list[tuple]:
+        # each stage transforms the rows only once and passes them on to the next stage
+        rows = self.first.fit_transform(rows)
+        rows = self.second.fit_transform(rows)
 
         # replace Infer() converters with the nested inferred converter
         if isinstance(self.first, Infer):
@@ -26,11 +32,43 @@ class _Pipeline(Converter):
                 f"Infer() converter for did not infer a converter during fit()"
             self.second = self.second.inferred
 
+        return rows
+
     def labels(self, labels: tuple) -> tuple:
         return self.second.labels(self.first.labels(labels))
 
     def transform(self, row: tuple) -> tuple:
-        return self.second.transform(self.first.transform(row))
+        return _transform_nested(self.second, _transform_nested(self.first, row))
+
+    def transform_batch(self, rows: list[tuple]) -> list[tuple]:
+        return self.second.transform_batch(self.first.transform_batch(rows))
+
+    def try_transform_batch(self, rows: list[tuple]) -> list[tuple | None] | None:
+        outputs = self.first.try_transform_batch(rows)
+        if outputs is None:
+            return None
+        # only the rows that passed the first stage are passed on to the second stage
+        passed = [i for i, output in enumerate(outputs) if output is not None]
+        second_outputs = self.second.try_transform_batch([outputs[i] for i in passed])
+        if second_outputs is None:
+            return None
+        for i, output in zip(passed, second_outputs):
+            outputs[i] = output
+        return outputs
+
+    def scalar_transform(self) -> Callable[[any], any] | None:
+        first = self.first.scalar_transform()
+        second = self.second.scalar_transform()
+        if first is None or second is None:
+            return None
+        return lambda val: second(first(val))
+
+    def select_outputs(self, indices: tuple[int, ...]) -> Converter | None:
+        # the outputs are those of the second stage
+        second = self.second.select_outputs(indices)
+        if second is None:
+            return None
+        return _Pipeline(self.first, second)
 
     def __repr__(self):
         return f"{self.__class__.__name__}({repr(self.first)}, {repr(self.second)})"
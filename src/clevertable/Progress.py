@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field, asdict
+
+
+@dataclass(frozen=True)
+class Progress:
+    """
+    Describes the progress of a long-running ``fit()`` or ``transform()``,
+    as passed to the ``progress`` callback of :class:`ConversionProfile` whenever the phase changes
+    or rows have been processed.
+
+    - ``phase``: What is done right now: ``"read"``, ``"pre-process"``, ``"infer"`` (a converter is inferred),
+      ``"fit"``, ``"transform"``, ``"write"`` (only in the command line interface),
+      or ``"done"`` for the last report, which summarizes the whole job.
+    - ``rows``: The number of rows of the current pass (fit or transform) that are processed completely.
+    - ``total_rows``: The number of rows of the current pass, or ``None`` if unknown (e.g. for streams).
+    - ``elapsed``: Seconds since the job started.
+    - ``rows_per_second``: The throughput of the current pass so far, or ``None`` if no rows are processed yet.
+      In the last report, the throughput of the whole job, i.e. ``rows / elapsed``.
+    - ``remaining``: The estimated seconds until the current pass is finished, or ``None`` if unknown.
+    - ``phase_seconds``: Seconds spent in each phase so far.
+    - ``key``: The key that is inferred or fitted, in the phases ``"infer"`` and ``"fit"``,
+      and the key whose column is transformed in the phase ``"transform"`` (unless rows are transformed one by one).
+    """
+    phase: str
+    rows: int
+    total_rows: int | None
+    elapsed: float
+    rows_per_second: float | None = None
+    remaining: float | None = None
+    phase_seconds: dict[str, float] = field(default_factory=dict)
+    key: any = None
+
+    def as_dict(self) -> dict[str, any]:
+        """:return: The progress as a JSON-serializable dict, e.g. for logging the metrics of a job."""
+        d = asdict(self)
+        d["key"] = None if self.key is None else str(self.key)
+        return d
@@ -1,12 +1,22 @@
 from __future__ import annotations
 
+from itertools import islice
+from operator import itemgetter
 from textwrap import indent
-from typing import Callable
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
 
 from .Converter import Converter
 from .Ignore import Ignore
 from .Infer import Infer
-from ._utils import _parse_converter, _flatten_tuples, _index_duplicates
+from ._utils import _parse_converter, _flatten_tuples, _index_duplicates, _converter_path, _lookup_array, \
+    _in_extend_mode
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    import numpy as np
+
+    from ._progress import _ProgressTracker
 
 
 def _check_and_unpack(row: tuple) -> dict:
@@ -47,10 +57,53 @@ def _contains_nested(key: any, contains_func: Callable[[any], any]) -> any:
     return contains_func(key)
 
 
+def _key_rows(key: any, dicts: list[dict]) -> list[tuple]:
+    """:return: The rows of the given key in all dicts that contain it."""
+    if isinstance(key, tuple):
+        return [
+            _getitem_nested(key, d.__getitem__)
+            for d in dicts
+            if _contains_nested(key, d.__contains__)
+        ]
+    return [
+        (d[key],)  # wrap single element (row needs to be a tuple)
+        for d in dicts
+        if key in d
+    ]
+
+
+def _leaf_keys(key: any) -> list:
+    """Returns the atomic keys contained in a possibly nested key, in order."""
+    if isinstance(key, tuple):
+        return [leaf for k in key for leaf in _leaf_keys(k)]
+    return [key]
+
+
+def _column_nested(key: any, columns: dict[any, list]) -> list:
+    """Like :func:`_getitem_nested`, but for whole columns: Returns one (possibly nested) value per row."""
+    if isinstance(key, tuple):
+        return list(zip(*(_column_nested(k, columns) for k in key)))
+    column = columns[key]
+    if isinstance(column, _EncodedColumn):
+        return column.expand()
+    return column
+
+
+def _columns_to_records(columns: dict[any, list], n_rows: int) -> list[dict]:
+    """Transposes a dict of equally long columns into a list of ``n_rows`` dicts."""
+    keys = list(columns.keys())
+    if not keys:
+        return [{} for _ in range(n_rows)]
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+
 class RecordProfile(Converter):
     def __init__(self, profile: dict[any, any] = None,
                  ignore_undefined: bool = False,
-                 ignore_uninferrable: bool = False):
+                 ignore_uninferrable: bool = False,
+                 hash_buckets: int = None,
+                 max_categories: int = None,
+                 min_frequency: int = None):
         """
         Works on records (dicts).
         Takes a record, applies a different converter for each key (according to the given profile)
@@ -67,57 +120,214 @@ class RecordProfile(Converter):
                automatically. If ``True``, these columns will be ignored instead, i.e. not produce any output columns.
         :param ignore_uninferrable: If ``True``, keys which are not present in the profile and for which the converter
                cannot be inferred during ``fit()`` are ignored during transform().
+        :param hash_buckets: If given, keys which are not present in the profile and have too many distinct values
+               for ``Enumerate()`` are converted with ``HashedOneHot(hash_buckets)``.
+        :param max_categories: The default cap of the categorical converters (``OneHot()``, ``Enumerate()`` and
+               ``List()``) that are inferred for keys which are not present in the profile, see ``Infer()``.
+        :param min_frequency: The default minimum frequency of the values of inferred categorical converters,
+               see ``Infer()``.
         """
         self._profile: dict[any, Converter] = {}
         if profile:
             self.update(profile)  # parses converters
 
         self.keys: dict[any, tuple] = {}  # cache for the output keys computed during fit()
+        self.output_labels: tuple = ()  # all output keys in output order, computed during fit()
+        self._output_slices: dict[any, slice] = {}  # position of the output keys of each key in output_labels
+        self._transform_plan: list[tuple] | None = None  # precomputed per-key accessors for transform()
+        self.added_labels: tuple = ()  # output keys added after fit() by converters in extend mode, in order
 
         self.ignore_undefined = ignore_undefined
         self.ignore_uninferrable = ignore_uninferrable
+        self.hash_buckets = hash_buckets
+        self.max_categories = max_categories
+        self.min_frequency = min_frequency
 
     def fit(self, rows: list[tuple]):
+        self.__fit(rows, transform=False)
+
+    def fit_transform(self, rows: list[tuple], progress: _ProgressTracker = None) -> list[tuple]:
+        """
+        Fits the profile and transforms the given records.
+        Converters compute their outputs for the fit data only once and keep them (see ``Converter.fit_transform()``),
+        so the records don't need to be transformed again after ``fit()``.
+        :param progress: If given, the key that is fitted is reported to it.
+        :raises _ColumnTransformError: if the output of a converter for a record mismatches its labels.
+        """
+        outputs = self.__fit(rows, transform=True, progress=progress)
+        if outputs is None:
+            # not all keys are present in all records -> transform() will raise the appropriate error
+            return [self.transform(row) for row in rows]
+
+        output_records = [{} for _ in rows]
+        for key, converter in self._profile.items():
+            output_keys = self.keys[key]
+            for i, (output_record, output_values) in enumerate(zip(output_records, outputs[key])):
+                if len(output_values) != len(output_keys):
+                    raise _ColumnTransformError(f"at {repr(key)}: Output length of {converter.__class__.__name__}"
+                                                f" converter mismatches number of labels in row {i}:"
+                                                f" {len(output_values)}!={len(output_keys)}."
+                                                f"\n\tOutput (length {len(output_values)}):\t{output_values}"
+                                                f"\n\tOutput Labels (length {len(output_keys)}):\t{output_keys}", i)
+                for out_val, out_key in zip(output_values, output_keys):
+                    output_record[out_key] = out_val
+        return [(output_record,) for output_record in output_records]
+
+    def __fit(self, rows: list[tuple], transform: bool,
+              progress: _ProgressTracker = None) -> dict[any, list[tuple]] | None:
+        """
+        :param transform: If ``True``, the converters also transform the rows while fitting.
+        :param progress: If given, the key that is fitted is reported to it.
+        :return: The transformed rows of each key, if ``transform`` is ``True`` and all keys are present in all rows.
+        """
         # unpack each row and check the type
         dicts = [_check_and_unpack(row) for row in rows]
+        outputs = {} if transform else None
+        self._transform_plan = None  # the converters change
+        self.added_labels = ()
 
-        all_keys = {key for d in dicts for key in d.keys()}  # collect all possible keys present in the dicts
+        # collect all possible keys present in the dicts, in the order of their first appearance
+        all_keys = dict.fromkeys(key for d in dicts for key in d.keys())
 
         # replace missing converters with Infer() or Ignore()
         for key in all_keys:
             if key not in self._profile:
-                if self.ignore_undefined:
-                    self._profile[key] = Ignore()
-                else:
-                    self._profile[key] = Infer(ignore_uninferrable=self.ignore_uninferrable)
+                self._profile[key] = self.__undefined_converter()
 
         # now actual fit
         for key, conv in self._profile.items():
-            if isinstance(key, tuple):
-                rows = [
-                    _getitem_nested(key, d.__getitem__)
-                    for d in dicts
-                    if _contains_nested(key, d.__contains__)
-                ]
-            else:
-                rows = [
-                    (d[key],)  # wrap single element (row needs to be a tuple)
-                    for d in dicts
-                    if key in d
-                ]
+            rows = _key_rows(key, dicts)
             if not rows:
                 raise ValueError(f"Not a single value for key {repr(key)} present during fit()!"
                                  f" You must at least provide one value to fit() for this key.")
                 pass
+            if progress is not None:
+                progress.phase("infer" if isinstance(conv, Infer) else "fit", key)
 
             try:
-                conv.fit(rows)
+                if outputs is not None and len(rows) == len(dicts):
+                    outputs[key] = conv.fit_transform(rows)
+                else:
+                    outputs = None  # key missing in some dicts, can't produce complete output records
+                    conv.fit(rows)
             except Exception as e:
                 # add helpful context to error message
                 raise ValueError(f"at key {repr(key)}:\n"
                                  f"{e.__class__.__name__} during {conv.__class__.__name__}.fit():\n"
                                  f"{indent(str(e), ' ' * 4)}") from e
 
+        self.__finish_fit()
+        return outputs
+
+    def partial_fit(self, rows: list[tuple]) -> dict[any, any]:
+        """
+        Computes the summary of a part of the records, for fitting the profile on data that is split into
+        several parts, e.g. on different machines (see ``Converter.partial_fit()``). The profile is not changed.
+        :return: The summary of each key that is present in the records, in the order in which the keys appear.
+        :raises ValueError: if a converter doesn't support fitting on parts of the data.
+        """
+        dicts = [_check_and_unpack(row) for row in rows]
+        keys = dict.fromkeys(self._profile)
+        keys.update(dict.fromkeys(key for d in dicts for key in d.keys()))
+
+        summaries = {}
+        for key in keys:
+            conv = self._profile[key] if key in self._profile else self.__undefined_converter()
+            rows = _key_rows(key, dicts)
+            if not rows:
+                continue  # the key may be present in other parts
+            try:
+                summary = conv.partial_fit(rows)
+            except Exception as e:
+                # add helpful context to error message
+                raise ValueError(f"at key {repr(key)}:\n"
+                                 f"{e.__class__.__name__} during {conv.__class__.__name__}.partial_fit():\n"
+                                 f"{indent(str(e), ' ' * 4)}") from e
+            if summary is None:
+                raise ValueError(f"at key {repr(key)}:\n"
+                                 f"{conv.__class__.__name__} doesn't support fitting on parts of the data.")
+            summaries[key] = summary
+        return summaries
+
+    def fit_merged(self, summary: dict[any, any]):
+        """
+        Fits the profile to all parts of the data, given the combined summary of the parts (see ``partial_fit()``).
+        The result is identical to calling ``fit()`` with the records of all parts, in the order of the parts.
+        """
+        self._transform_plan = None  # the converters change
+        self.added_labels = ()
+
+        # replace missing converters with Infer() or Ignore()
+        for key in summary:
+            if key not in self._profile:
+                self._profile[key] = self.__undefined_converter()
+
+        for key, conv in self._profile.items():
+            if key not in summary:
+                raise ValueError(f"Not a single value for key {repr(key)} present during fit()!"
+                                 f" You must at least provide one value to fit() for this key.")
+            try:
+                conv.fit_merged(summary[key])
+            except Exception as e:
+                # add helpful context to error message
+                raise ValueError(f"at key {repr(key)}:\n"
+                                 f"{e.__class__.__name__} during {conv.__class__.__name__}.fit_merged():\n"
+                                 f"{indent(str(e), ' ' * 4)}") from e
+
+        self.__finish_fit()
+
+    def _fit_columns(self, columns: dict[any, list | _EncodedColumn], n_rows: int,
+                     progress: _ProgressTracker = None):
+        """
+        Like ``fit()``, but for records given as whole columns, in which every key is present in every record.
+        The converters of encoded columns are only presented the distinct values and how often they occur
+        (see ``Converter.partial_fit_distinct()``), if they support it.
+
+        :param columns: Maps each atomic key to the list of its values, or to an encoded column.
+        :param n_rows: The number of rows, i.e. the length of each column.
+        :param progress: If given, the key that is fitted is reported to it.
+        """
+        self._transform_plan = None  # the converters change
+        self.added_labels = ()
+
+        # replace missing converters with Infer() or Ignore()
+        for key in columns:
+            if key not in self._profile:
+                self._profile[key] = self.__undefined_converter()
+
+        for key, conv in self._profile.items():
+            if n_rows == 0 or any(leaf not in columns for leaf in _leaf_keys(key)):
+                raise ValueError(f"Not a single value for key {repr(key)} present during fit()!"
+                                 f" You must at least provide one value to fit() for this key.")
+            if progress is not None:
+                progress.phase("infer" if isinstance(conv, Infer) else "fit", key)
+            column = None if isinstance(key, tuple) else columns[key]
+            try:
+                summary = None
+                if isinstance(column, _EncodedColumn):
+                    summary = conv.partial_fit_distinct([(val,) for val in column.values], column.counts())
+                if summary is not None:
+                    conv.fit_merged(summary)
+                elif isinstance(key, tuple):
+                    conv.fit(_column_nested(key, columns))
+                else:
+                    conv.fit([(val,) for val in _column_nested(key, columns)])  # wrap single elements
+            except Exception as e:
+                # add helpful context to error message
+                raise ValueError(f"at key {repr(key)}:\n"
+                                 f"{e.__class__.__name__} during {conv.__class__.__name__}.fit():\n"
+                                 f"{indent(str(e), ' ' * 4)}") from e
+
+        self.__finish_fit()
+
+    def __undefined_converter(self) -> Converter:
+        # the converter of keys that are not present in the profile
+        if self.ignore_undefined:
+            return Ignore()
+        return Infer(ignore_uninferrable=self.ignore_uninferrable, hash_buckets=self.hash_buckets,
+                     max_categories=self.max_categories, min_frequency=self.min_frequency)
+
+    def __finish_fit(self):
         # replace all Infer() converters with the nested inferred converter
         for key, conv in self._profile.items():
             if isinstance(conv, Infer):
@@ -141,15 +351,61 @@ class RecordProfile(Converter):
                                  f"{indent(str(e), ' ' * 4)}") from e
 
         # handle duplicate output keys
-        input_keys = list(self.keys.keys())
         output_keys_flat = _flatten_tuples(tuple(self.keys[k]  # not using self.keys.values() because of order
                                                  for k in self.keys))
         output_keys_flat = _index_duplicates(output_keys_flat, lambda s, i: f"{s}_{i}")
+        self.output_labels = output_keys_flat
         # "unflatten" the output keys and write them back
-        for input_key in input_keys:
-            n = len(self.keys[input_key])  # number of output keys for this input key
-            self.keys[input_key] = output_keys_flat[:n]  # take n first
-            output_keys_flat = output_keys_flat[n:]  # remove n first
+        self._output_slices = {}
+        start = 0
+        for input_key in self.keys:
+            stop = start + len(self.keys[input_key])  # number of output keys for this input key
+            self._output_slices[input_key] = slice(start, stop)
+            self.keys[input_key] = output_keys_flat[start:stop]
+            start = stop
+
+    def __extend_labels(self, key: any) -> bool:
+        """
+        Appends the labels of new output values of the converter of the given key,
+        if the converter has added output values since fit() (e.g. ``OneHot(extend=True)``).
+        The existing output keys are not changed.
+        :return: Whether output keys were added.
+        """
+        converter = self._profile[key]
+        output_keys = self.keys[key]
+        try:
+            labels = converter.labels(key if isinstance(key, tuple) else (key,))
+        except Exception as e:
+            # add helpful context to error message
+            raise ValueError(f"at key {repr(key)}:\n"
+                             f"{e.__class__.__name__} during {converter.__class__.__name__}.labels():\n"
+                             f"{indent(str(e), ' ' * 4)}") from e
+        if len(labels) <= len(output_keys):
+            return False
+
+        # make the new output keys unique, like in fit()
+        taken = set(self.output_labels)
+        new_keys = []
+        for label in labels[len(output_keys):]:
+            new_key, i = label, 1
+            while new_key in taken:
+                i += 1
+                new_key = f"{label}_{i}"
+            taken.add(new_key)
+            new_keys.append(new_key)
+        new_keys = tuple(new_keys)
+
+        self.keys[key] = output_keys + new_keys
+        self.added_labels += new_keys
+        # the new keys are placed after the existing output keys of the same key
+        self.output_labels = _flatten_tuples(tuple(self.keys[k] for k in self.keys))
+        start = 0
+        for input_key in self.keys:
+            stop = start + len(self.keys[input_key])
+            self._output_slices[input_key] = slice(start, stop)
+            start = stop
+        self._transform_plan = None
+        return True
 
     def labels(self, labels: tuple) -> (dict[any, tuple],):
         """
@@ -167,27 +423,318 @@ class RecordProfile(Converter):
         """
         input_record = _check_and_unpack(row)
         output_record = {}
-        for key, converter in self._profile.items():
-            input_values = _getitem_nested(key, input_record.__getitem__)
-            if not isinstance(key, tuple):
-                input_values = (input_values,)
+        plan = self._transform_plan
+        if plan is None:
+            plan = self._transform_plan = self.__build_transform_plan()
+        for key, scalar_transform, output_keys, getter, converter in plan:
             try:
-                output_values = converter.transform(input_values)
+                if scalar_transform is not None:
+                    # single value in, single value out: no tuples, no label checks
+                    output_record[output_keys] = scalar_transform(input_record[key])
+                    continue
+                output_values = converter.transform(getter(input_record))
             except Exception as e:
-                # add helpful context to error message
+                # transform only this key again with all checks, to raise the error with helpful context
+                self.__transform_key(key, converter, input_record)
+                # the checked transform succeeds, e.g. because of a bug in a scalar fast path
                 raise ValueError(f"at key {repr(key)}:\n"
                                  f"{e.__class__.__name__} during {converter.__class__.__name__}.transform():\n"
                                  f"{indent(str(e), ' ' * 4)}") from e
+            if len(output_values) != len(output_keys):
+                output_keys = self.__checked_output_keys(key, converter, input_record, output_values)
+            output_record.update(zip(output_keys, output_values))
+        return (output_record,)
+
+    def __build_transform_plan(self) -> list[tuple]:
+        """
+        Precomputes how each key is transformed, so that transform() only has to follow the plan.
+        Converters with a scalar fast path (see ``Converter.scalar_transform()``) are called with the raw value
+        and their output key, all other converters with a function that extracts their input row and their output keys.
+        """
+        plan = []
+        for key, converter in self._profile.items():
+            output_keys = self.keys[key]
+            if not isinstance(key, tuple) and len(output_keys) == 1:
+                scalar_transform = converter.scalar_transform()
+                if scalar_transform is not None:
+                    plan.append((key, scalar_transform, output_keys[0], None, converter))
+                    continue
+            if isinstance(key, tuple):
+                getter = lambda d, key=key: _getitem_nested(key, d.__getitem__)
+            else:
+                getter = lambda d, key=key: (d[key],)  # wrap single element (row needs to be a tuple)
+            plan.append((key, None, output_keys, getter, converter))
+        return plan
+
+    def __transform_key(self, key: any, converter: Converter, input_record: dict) -> tuple[tuple, tuple]:
+        """:return: The output keys and output values of a single key, with all checks and error context."""
+        input_values = _getitem_nested(key, input_record.__getitem__)
+        if not isinstance(key, tuple):
+            input_values = (input_values,)
+        try:
+            output_values = converter.transform(input_values)
+        except Exception as e:
+            # add helpful context to error message
+            raise ValueError(f"at key {repr(key)}:\n"
+                             f"{e.__class__.__name__} during {converter.__class__.__name__}.transform():\n"
+                             f"{indent(str(e), ' ' * 4)}") from e
+        output_keys = self.keys[key]
+        if len(output_values) != len(output_keys):
+            output_keys = self.__checked_output_keys(key, converter, input_record, output_values)
+        return output_keys, output_values
+
+    def __checked_output_keys(self, key: any, converter: Converter, input_record: dict, output_values: tuple) -> tuple:
+        # the output keys of a converter whose output length differs from its labels, i.e. in extend mode
+        output_keys = self.keys[key]
+        if self.__extend_labels(key):
+            output_keys = self.keys[key]
+        assert len(output_values) == len(output_keys), \
+            f"at {repr(key)}: Output length of {converter.__class__.__name__} converter" \
+            f" mismatches number of labels: {len(output_values)}!={len(output_keys)}." \
+            f"\n\tInput:\t{[input_record[key]]}" \
+            f"\n\tOutput (length {len(output_values)}):\t{output_values}" \
+            f"\n\tOutput Labels (length {len(output_keys)}):\t{output_keys}"
+        return output_keys
+
+    def transform_batch(self, rows: list[tuple]) -> list[tuple]:
+        """
+        Transforms a list of records at once. Every converter processes the whole column of its key at once.
+
+        :param rows: Each row must be a 1-element tuple with a dict
+        """
+        dicts = [_check_and_unpack(row) for row in rows]
+        return [(record,) for record in _columns_to_records(self.__transform_dicts(dicts), len(dicts))]
+
+    def transform_many(self, records: Iterable[dict],
+                       batch_size: int = 1024,
+                       as_columns: bool = False) -> Iterator[dict]:
+        """
+        Lazily transforms an iterable of records (dicts), e.g. from a message queue or a stream of JSON documents.
+        The records are consumed in batches, and each batch is transformed like in ``transform_batch()``,
+        i.e. every converter processes the whole column of its key at once.
+        Only one batch is held in memory at a time, so the iterable may be unbounded.
+        Like the converters, this requires neither pandas nor NumPy.
+
+        :param records: The records to transform. Unlike for ``transform()``, they are not wrapped in tuples.
+        :param batch_size: The number of records that are transformed together.
+        :param as_columns: If ``True``, one dict per batch is yielded, which maps each output key
+               to the list of its values in this batch. Otherwise, the transformed records are yielded one by one.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, but is {batch_size}")
+        iterator = iter(records)
+        while True:
+            dicts = list(islice(iterator, batch_size))
+            if not dicts:
+                return
+            for d in dicts:
+                if not isinstance(d, dict):
+                    raise TypeError(f"Expected records to be dicts, but got {d} of type {type(d)}")
+            output_columns = self.__transform_dicts(dicts)
+            if as_columns:
+                yield output_columns
+            else:
+                yield from _columns_to_records(output_columns, len(dicts))
+
+    def __transform_dicts(self, dicts: list[dict]) -> dict[any, list]:
+        # collect the columns of all records, and transform them at once
+        columns = {}
+        for key in self.input_keys():
+            try:
+                columns[key] = [d[key] for d in dicts]
+            except KeyError as e:
+                raise ValueError(f"at key {repr(key)}:\n"
+                                 f"Key is missing in at least one record: {e}") from e
+        return self._transform_columns(columns, len(dicts))
+
+    def input_keys(self) -> list:
+        """
+        The atomic keys that are read from the records, in order of first use.
+        Nested keys (tuples of keys) are resolved into the keys they contain.
+        """
+        return list(dict.fromkeys(leaf for key in self._profile for leaf in _leaf_keys(key)))
+
+    def _transform_columns(self, columns: dict[any, list], n_rows: int,
+                           executor: Executor = None, progress: _ProgressTracker = None) -> dict[any, list]:
+        """
+        Transforms whole columns at once, using ``Converter.transform_batch()`` of the converters.
+
+        :param columns: Maps each atomic key from ``input_keys()`` to the list of its values, or to an encoded column.
+               For encoded columns, the converters only transform the distinct values.
+        :param n_rows: The number of rows, i.e. the length of each column.
+        :param executor: If given, the converters of different keys are called concurrently in this executor.
+               The outputs are still checked (and labels added in extend mode) one key after another.
+        :param progress: If given, the phase ``"transform"`` is reported for each key.
+        :return: Maps each output key to the list of its values.
+        """
+        items = list(self._profile.items())
+        if executor is None:
+            results = map(lambda item: self.__transform_column(*item, columns), items)
+        else:
+            results = executor.map(lambda item: self.__transform_column(*item, columns), items)
+
+        output_columns = {}
+        for key, converter in items:
+            if progress is not None:
+                progress.phase("transform", key)
+            outputs = next(results)  # raises the error of the first failing key
+            codes = None
+            if isinstance(outputs, _EncodedColumn):
+                outputs, codes = outputs.values, outputs.codes  # the outputs of the distinct values
             output_keys = self.keys[key]
-            assert len(output_values) == len(output_keys), \
-                f"at {repr(key)}: Output length of {converter.__class__.__name__} converter" \
-                f" mismatches number of labels: {len(output_values)}!={len(output_keys)}." \
-                f"\n\tInput:\t{[input_record[key]]}" \
-                f"\n\tOutput (length {len(output_values)}):\t{output_values}" \
-                f"\n\tOutput Labels (length {len(output_keys)}):\t{output_keys}"
+            if set(map(len, outputs)) - {len(output_keys)} and self.__extend_labels(key):
+                output_keys = self.keys[key]
+            if set(map(len, outputs)) - {len(output_keys)}:
+                i, output_values = next((i, o) for i, o in enumerate(outputs) if len(o) != len(output_keys))
+                if codes is not None:
+                    i = _first_row_of_code(codes, i)
+                raise _ColumnTransformError(f"at {repr(key)}: Output length of {converter.__class__.__name__}"
+                                            f" converter mismatches number of labels in row {i}:"
+                                            f" {len(output_values)}!={len(output_keys)}."
+                                            f"\n\tOutput (length {len(output_values)}):\t{output_values}"
+                                            f"\n\tOutput Labels (length {len(output_keys)}):\t{output_keys}", i)
+
+            # transpose rows into columns
+            for j, out_key in enumerate(output_keys):
+                output_column = list(map(itemgetter(j), outputs))
+                if codes is not None:
+                    output_column = _lookup_array(output_column)[codes].tolist()  # the output of each row
+                output_columns[out_key] = output_column
+        return output_columns
+
+    @staticmethod
+    def __transform_column(key: any, converter: Converter,
+                           columns: dict[any, list | _EncodedColumn]) -> list[tuple] | _EncodedColumn:
+        column = None if isinstance(key, tuple) else columns[key]
+        if isinstance(key, tuple):
+            rows = _column_nested(key, columns)
+        elif isinstance(column, _EncodedColumn):
+            rows = [(val,) for val in column.values]  # each distinct value is transformed only once
+        else:
+            rows = [(val,) for val in column]  # wrap single elements (rows need to be tuples)
+        try:
+            outputs = converter.transform_batch(rows)
+        except Exception as e:
+            # find the failing row: only this converter transforms its rows again, one by one up to that row
+            for i, row in enumerate(rows):
+                try:
+                    converter.transform(row)
+                except Exception as row_error:
+                    if isinstance(column, _EncodedColumn):
+                        i = _first_row_of_code(column.codes, i)
+                    # add helpful context to error message, as for a single record
+                    raise _ColumnTransformError(
+                        f"at key {repr(key)}:\n"
+                        f"{row_error.__class__.__name__} during {converter.__class__.__name__}.transform():\n"
+                        f"{indent(str(row_error), ' ' * 4)}", i) from row_error
+            # the rows only fail together
+            raise _ColumnTransformError(
+                f"at key {repr(key)}:\n"
+                f"{e.__class__.__name__} during {converter.__class__.__name__}.transform_batch():\n"
+                f"{indent(str(e), ' ' * 4)}", None) from e
+        if isinstance(column, _EncodedColumn):
+            return _EncodedColumn(outputs, column.codes)
+        return outputs
+
+    def _transform_collecting_errors(self, input_record: dict) -> tuple[dict, list[tuple[any, str, Exception]]]:
+        """
+        Like ``transform()``, but doesn't stop at the first key that fails.
+        Instead, all output values of a failing key are set to NaN.
+
+        :param input_record: The dict to transform (not wrapped in a tuple).
+        :return: The output record, and a ``(key, converter_path, exception)`` tuple for each failing key.
+        """
+        output_record = {}
+        failures = []
+        for key, converter in self._profile.items():
+            output_keys = self.keys[key]
+            try:
+                input_values = _getitem_nested(key, input_record.__getitem__)
+                if not isinstance(key, tuple):
+                    input_values = (input_values,)
+                output_values = converter.transform(input_values)
+                if len(output_values) != len(output_keys) and self.__extend_labels(key):
+                    output_keys = self.keys[key]
+                if len(output_values) != len(output_keys):
+                    raise ValueError(f"Output length of {converter.__class__.__name__} converter"
+                                     f" mismatches number of labels: {len(output_values)}!={len(output_keys)}.")
+            except Exception as e:
+                failures.append((key, _converter_path(e, converter), e))
+                output_values = (float("nan"),) * len(output_keys)
             for out_val, out_key in zip(output_values, output_keys):
                 output_record[out_key] = out_val
-        return (output_record,)
+        return output_record, failures
+
+    def compile(self, path: str = None) -> Callable[[dict], dict]:
+        """
+        Generates specialized Python code for the fitted profile and compiles it.
+        The lookups of ``Map``, ``Binary`` and ``Enumerate``, the comparisons of ``OneHot`` and the parsing of ``Float``
+        are written out for each key, so that a record is transformed without any calls into the converters.
+        Other converters (e.g. custom ones) are called as usual.
+
+        The returned function behaves like ``transform()``, but takes and returns a dict instead of a 1-element tuple.
+        If the compiled code fails, the record is transformed with ``transform()`` again, which raises
+        the error with the usual context. Call ``compile()`` again after fitting or changing the profile.
+
+        :param path: If given, the generated code is also written to this file as a standalone module,
+               which doesn't depend on clevertable. Its ``transform(record)`` function doesn't check errors.
+               Raises a ValueError if the profile contains converters that cannot be compiled.
+        :return: A function that transforms a single record.
+        """
+        from ._compiler import _compile_profile  # imported here, as it is only needed for compiling
+
+        return _compile_profile(self, lambda record: self.transform((record,))[0], path=path)
+
+    def _project(self, columns: Iterable) -> tuple[RecordProfile, list]:
+        """
+        Creates a profile that only computes some of the output keys of this fitted profile.
+        Only the converters of the keys that produce them are used, and converters that can compute
+        single output values (see ``Converter.select_outputs()``) only compute the requested ones.
+
+        :param columns: Output keys, or keys of this profile, which stand for all of their output keys.
+        :return: The projected profile, and the requested output keys in the requested order.
+        """
+        owners = {out_key: (key, i) for key, output_keys in self.keys.items() for i, out_key in enumerate(output_keys)}
+        positions = {}  # key -> positions of its requested output keys
+        requested = []
+        missing = []
+        for col in columns:
+            if col in self._profile and col in self.keys:
+                selected = [(col, i) for i in range(len(self.keys[col]))]
+            elif col in owners:
+                selected = [owners[col]]
+            else:
+                missing.append(col)
+                continue
+            for key, i in selected:
+                positions.setdefault(key, set()).add(i)
+                requested.append(self.keys[key][i])
+        if missing:
+            raise ValueError(f"Neither output keys nor keys of the profile: {', '.join(repr(col) for col in missing)}")
+        # the converters are shared with this profile, whose output keys wouldn't be updated in extend mode
+        extending = [key for key in positions if _in_extend_mode(self._profile[key])]
+        if extending:
+            raise ValueError(f"Converters in extend mode change during transform, so their output columns"
+                             f" can't be selected. Keys with converters in extend mode:"
+                             f" {', '.join(repr(key) for key in extending)}")
+
+        projected = RecordProfile(ignore_undefined=True)
+        for key in self._profile:  # keep the order of the keys
+            if key not in positions:
+                continue
+            converter = self._profile[key]
+            indices = tuple(sorted(positions[key]))
+            if len(indices) < len(self.keys[key]):
+                converter = converter.select_outputs(indices) or _Selection(converter, indices)
+            projected._profile[key] = converter
+            projected.keys[key] = tuple(self.keys[key][i] for i in indices)
+        projected.output_labels = _flatten_tuples(tuple(projected.keys[k] for k in projected.keys))
+        start = 0
+        for key in projected.keys:
+            stop = start + len(projected.keys[key])
+            projected._output_slices[key] = slice(start, stop)
+            start = stop
+        return projected, list(dict.fromkeys(requested))
 
     def update(self, profile: dict[str, any]):
         for key, value in profile.items():
@@ -198,9 +745,17 @@ class RecordProfile(Converter):
 
     def __setitem__(self, key, value):
         self._profile[key] = _parse_converter(value)
+        self._transform_plan = None
 
     def __delitem__(self, key):
         del self._profile[key]
+        self._transform_plan = None
+
+    def __getstate__(self):
+        # the plan consists of closures, which can't be pickled -> it is built again on the next transform()
+        state = self.__dict__.copy()
+        state["_transform_plan"] = None
+        return state
 
     def __contains__(self, item):
         return item in self._profile
@@ -214,3 +769,69 @@ class RecordProfile(Converter):
             s += ",\n"
         s += "}"
         return s
+
+
+class _EncodedColumn:
+
+    def __init__(self, values: list, codes: np.ndarray):
+        """
+        A column with few distinct values (e.g. a categorical column of a DataFrame),
+        so that the converters only need to process each distinct value once.
+        :param values: The distinct values, in the order of their first occurrence.
+        :param codes: For each row, the position of its value in ``values``.
+        """
+        self.values = values
+        self.codes = codes
+
+    def expand(self) -> list:
+        """:return: The value of each row."""
+        return _lookup_array(self.values)[self.codes].tolist()
+
+    def counts(self) -> list[int]:
+        """:return: How often each of the values occurs."""
+        import numpy as np  # imported here, as NumPy is slow to import
+
+        return np.bincount(self.codes, minlength=len(self.values)).tolist()
+
+
+class _ColumnTransformError(ValueError):
+
+    def __init__(self, message: str, position: int | None):
+        """
+        An error while transforming whole columns (see ``RecordProfile._transform_columns()``).
+        :param position: The position of the failing row, or ``None`` if only the whole column fails.
+        """
+        super().__init__(message)
+        self.position = position
+
+    def row_error(self) -> Exception:
+        """:return: The error with the same context as for transforming the failing row alone."""
+        return Exception(f"Error during transform() of row {self.position}:\n{indent(str(self), ' ' * 4)}")
+
+
+def _first_row_of_code(codes: np.ndarray, code: int) -> int:
+    # the position of the first row of an encoded column whose value is the distinct value with the given code
+    return int((codes == code).argmax())
+
+
+class _Selection(Converter):
+    """Computes all output values of a converter and keeps the ones at the given positions."""
+
+    def __init__(self, converter: Converter, indices: tuple[int, ...]):
+        self.converter = converter
+        self.indices = indices
+
+    def labels(self, labels: tuple) -> tuple:
+        return self.__select(self.converter.labels(labels))
+
+    def transform(self, row: tuple) -> tuple:
+        return self.__select(self.converter.transform(row))
+
+    def transform_batch(self, rows: list[tuple]) -> list[tuple]:
+        return list(map(self.__select, self.converter.transform_batch(rows)))
+
+    def __select(self, row: tuple) -> tuple:
+        return tuple(row[i] for i in self.indices)
+
+    def __repr__(self):
+        return f"{repr(self.converter)}[{', '.join(map(str, self.indices))}]"
@@ -40,13 +40,21 @@ class StrictFunction(Converter):
     def fit(self, rows: list[tuple]):
         # infer output cardinality (only needed if no labels function is given)
         if self._labels is None:
-            rows = [self._transform(row) for row in rows]
-            self._output_cardinality = len(rows[0])
+            self.fit_transform(rows)
+
+    def fit_transform(self, rows: list[tuple]) -> list[tuple]:
+        rows = [self._transform(row) for row in rows]
+        self._fit_output_cardinality(rows)
+        return rows
+
+    def _fit_output_cardinality(self, outputs: list[tuple]):
+        # infer output cardinality (only needed if no labels function is given)
+        if self._labels is None:
+            self._output_cardinality = len(outputs[0])
 
             # check if output cardinality varies:
-            if not all(len(row) == self._output_cardinality for row in rows):
+            if not all(len(row) == self._output_cardinality for row in outputs):
                 self._output_cardinality = -1  # a value of -1 represents varying output cardinality
-                return
 
     def transform(self, row: tuple) -> tuple:
         return self._transform(row)
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class TransformFailure:
+    """
+    Describes a value that could not be transformed, as collected by ``transform(df, errors="collect")``.
+    A list of failures can be turned into a table with ``pandas.DataFrame(failures)``.
+
+    - ``row``: Index of the row in the input DataFrame.
+    - ``key``: The key in the profile whose converter failed.
+    - ``converter``: The chain of converters through which the error was raised, e.g. ``"Try > Float"``.
+    - ``value``: The input value (before pre-processing).
+    - ``exception``: Name of the exception type.
+    - ``message``: The exception message.
+    """
+    row: any
+    key: any
+    converter: str
+    value: any
+    exception: str
+    message: str
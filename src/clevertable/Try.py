@@ -4,7 +4,7 @@ import warnings
 
 from .Infer import Infer
 from .Converter import Converter
-from ._utils import _parse_converter
+from ._utils import _parse_converter, _transform_nested
 
 
 class Try(Converter):
@@ -22,35 +22,58 @@ class Try(Converter):
         self.converters = [_parse_converter(conv) for conv in converters]
 
     def fit(self, rows: list[tuple]):
-        convs = list(self.converters)
-        while convs:
-            conv = convs.pop(0)
-            conv.fit(rows)
-
-            if not convs:
-                return  # no need to transform with last converter
-
-            next_rows: list[tuple] = []  # values that raise an exception
-            for row in rows:
-                try:
-                    conv.transform(row)
-                except Exception as e:
-                    if not isinstance(e, self.exceptions):
-                        raise e
-                    next_rows.append(row)
-            rows = next_rows
-            if not rows:
-                warnings.warn(f"All rows raised exceptions for {conv.__class__.__name__} converter,"
-                              f" therefore the remaining converters ({len(convs)}) can not be fitted")
+        self.__fit(rows, transform_all=False)
+
+    def fit_transform(self, rows: list[tuple]) -> list[tuple]:
+        return self.__fit(rows, transform_all=True)
+
+    def __fit(self, rows: list[tuple], transform_all: bool) -> list[tuple] | None:
+        """
+        Fits each converter to the rows for which all previous converters raised an exception.
+        The outputs that are computed to find these rows are kept,
+        so that ``fit_transform()`` doesn't need to transform them again.
+        :param transform_all: If ``False``, the last converter is only fitted, not applied to its rows.
+        """
+        outputs = [None] * len(rows)
+        remaining = list(range(len(rows)))  # indices of the rows for which all converters so far failed
+        for n, conv in enumerate(self.converters):
+            conv_rows = [rows[i] for i in remaining]
+            conv.fit(conv_rows)
+
+            is_last = n == len(self.converters) - 1
+            if is_last and not transform_all:
+                break  # no need to transform with last converter
+
+            next_remaining = []  # rows that the converter cannot handle
+            for i, output in zip(remaining, self.__try_transform_batch(conv, conv_rows)):
+                if output is None:
+                    next_remaining.append(i)
+                else:
+                    outputs[i] = output
+            remaining = next_remaining
+            if not remaining:
+                if not is_last:
+                    warnings.warn(f"All rows raised exceptions for {conv.__class__.__name__} converter,"
+                                  f" therefore the remaining converters"
+                                  f" ({len(self.converters) - n - 1}) can not be fitted")
                 break
 
+        # rows for which all converters failed are returned unchanged
+        for i in remaining:
+            outputs[i] = rows[i]
+
         # replace Infer() converters with the nested inferred converter
         for i, conv in enumerate(self.converters):
             if isinstance(conv, Infer):
-                assert conv.inferred is not None, \
-                    f"Infer() converter for did not infer a converter during fit()"
+                if conv.inferred is None:
+                    raise ValueError(f"Infer() converter at position {i} did not infer a converter during fit(),"
+                                     f" because the previous converters handled all rows")
                 self.converters[i] = conv.inferred
 
+        if transform_all:
+            return outputs
+        return None
+
     def labels(self, labels: tuple) -> tuple:
         if self.converters:
             return self.converters[0].labels(labels)
@@ -59,12 +82,48 @@ class Try(Converter):
     def transform(self, row: tuple) -> tuple:
         for conv in self.converters:
             try:
-                return conv.transform(row)
+                return _transform_nested(conv, row)
             except Exception as e:
                 if not isinstance(e, self.exceptions):
                     raise e
         return row
 
+    def transform_batch(self, rows: list[tuple]) -> list[tuple]:
+        # every converter gets all rows that the previous converters could not handle at once
+        outputs = list(rows)  # rows for which all converters fail are returned unchanged
+        remaining = list(range(len(rows)))
+        for conv in self.converters:
+            if not remaining:
+                break
+            conv_outputs = self.__try_transform_batch(conv, [rows[i] for i in remaining])
+            next_remaining = []
+            for i, output in zip(remaining, conv_outputs):
+                if output is None:
+                    next_remaining.append(i)
+                else:
+                    outputs[i] = output
+            remaining = next_remaining
+        return outputs
+
+    def __try_transform_batch(self, conv: Converter, rows: list[tuple]) -> list[tuple | None]:
+        """
+        :return: The transformed rows, with ``None`` for each row that raises one of the ignored exceptions.
+        """
+        if issubclass(Exception, self.exceptions):  # all exceptions are ignored
+            outputs = conv.try_transform_batch(rows)
+            if outputs is not None:
+                return outputs
+        # the converter doesn't support the non-raising protocol, or only some exceptions are ignored
+        outputs = []
+        for row in rows:
+            try:
+                outputs.append(conv.transform(row))
+            except Exception as e:
+                if not isinstance(e, self.exceptions):
+                    raise e
+                outputs.append(None)
+        return outputs
+
     def __getitem__(self, item):
         return self.converters[item]
 
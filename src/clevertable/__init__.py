@@ -1,25 +1,104 @@
 __version__ = "3.0.3"
 
-from .Binary import Binary
-from .Const import Const
-from .ConversionProfile import ConversionProfile
-from .Converter import Converter
-from .Enumerate import Enumerate
-from .Flatten import Flatten
-from .Float import Float
-from .ForEach import ForEach
-from .StrictFunction import StrictFunction
-from .Function import Function
-from .Id import Id
-from .Ignore import Ignore
-from .Infer import Infer
-from .Label import Label
-from .List import List, ListAndOr
-from .Map import Map
-from .OneHot import OneHot
-from .Parallel import Parallel
-from .Pipeline import Pipeline
-from .Split import Split
-from .Strip import Strip
-from .Transpose import Transpose
-from .Try import Try
+import sys
+from importlib import import_module
+from types import ModuleType
+from typing import TYPE_CHECKING
+
+# public name -> module that defines it
+# the modules are only imported when the name is first accessed, so that e.g. a RecordProfile
+# can be used without paying for the import of pandas and NumPy
+_LAZY_ATTRIBUTES = {
+    "Binary": ".Binary",
+    "Const": ".Const",
+    "ConversionProfile": ".ConversionProfile",
+    "Converter": ".Converter",
+    "DateTime": ".DateTime",
+    "Enumerate": ".Enumerate",
+    "FitCache": ".FitCache",
+    "Flatten": ".Flatten",
+    "Float": ".Float",
+    "ForEach": ".ForEach",
+    "FrozenProfile": ".FrozenProfile",
+    "StrictFunction": ".StrictFunction",
+    "Function": ".Function",
+    "HashedOneHot": ".HashedOneHot",
+    "Id": ".Id",
+    "Ignore": ".Ignore",
+    "Infer": ".Infer",
+    "Label": ".Label",
+    "List": ".List",
+    "ListAndOr": ".List",
+    "Map": ".Map",
+    "OneHot": ".OneHot",
+    "Parallel": ".Parallel",
+    "Pipeline": ".Pipeline",
+    "Progress": ".Progress",
+    "Split": ".Split",
+    "Strip": ".Strip",
+    "TransformFailure": ".TransformFailure",
+    "Transpose": ".Transpose",
+    "Try": ".Try",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str) -> any:
+    try:
+        module_name = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value  # cache, so that __getattr__ is only called once per name
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+class _LazyModule(ModuleType):
+
+    def __setattr__(self, name: str, value: any):
+        # importing a submodule (e.g. clevertable.Binary) binds it to this package under its own name,
+        # which would shadow the class of the same name -> bind the class instead
+        if isinstance(value, ModuleType) and _LAZY_ATTRIBUTES.get(name) == f".{name}" \
+                and value.__name__ == f"{__name__}.{name}":
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _LazyModule
+
+
+if TYPE_CHECKING:
+    from .Binary import Binary
+    from .Const import Const
+    from .ConversionProfile import ConversionProfile
+    from .Converter import Converter
+    from .DateTime import DateTime
+    from .Enumerate import Enumerate
+    from .FitCache import FitCache
+    from .Flatten import Flatten
+    from .Float import Float
+    from .ForEach import ForEach
+    from .FrozenProfile import FrozenProfile
+    from .StrictFunction import StrictFunction
+    from .Function import Function
+    from .HashedOneHot import HashedOneHot
+    from .Id import Id
+    from .Ignore import Ignore
+    from .Infer import Infer
+    from .Label import Label
+    from .List import List, ListAndOr
+    from .Map import Map
+    from .OneHot import OneHot
+    from .Parallel import Parallel
+    from .Pipeline import Pipeline
+    from .Progress import Progress
+    from .Split import Split
+    from .Strip import Strip
+    from .TransformFailure import TransformFailure
+    from .Transpose import Transpose
+    from .Try import Try
@@ -1,36 +1,278 @@
-from .ConversionProfile import ConversionProfile
+from __future__ import annotations
 
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+import time
+from itertools import islice
+from typing import Callable, TextIO, Iterator, Iterable
 
-def run(source_file: str, output_file: str, ignore_columns: list[str]):
+from .ConversionProfile import ConversionProfile, _get_dataframe, _read_dataframe
+from .Progress import Progress
+from ._progress import _ProgressTracker, _tracking
+from ._readers import _count_xlsx_rows, _xlsx_sheet_names
+from ._writers import _open_writer
+
+_DEFAULT_CHUNK_SIZE = 10_000
+_PROGRESS_INTERVAL = 1.0  # minimum number of seconds between two progress lines
+
+
+def run(source_file: str, output_file: str, ignore_columns: list[str], chunk_size: int = _DEFAULT_CHUNK_SIZE,
+        progress: Callable[[Progress], None] = None):
+    ignore_profile = {col_name: None for col_name in ignore_columns}
+    profile = ConversionProfile(ignore_profile)
+    with _tracking(progress) as tracker:
+        df = _read_dataframe(source_file, tracker)
+        profile.fit(df, progress=tracker)
+        _write_chunks(profile, profile.transform_chunks(df, chunk_size, progress=tracker), len(df), output_file,
+                      tracker)
+
+
+def run_fit(source_file: str, profile_file: str, ignore_columns: list[str],
+            progress: Callable[[Progress], None] = None):
     ignore_profile = {col_name: None for col_name in ignore_columns}
     profile = ConversionProfile(ignore_profile)
-    df = profile.fit_transform(source_file)
-
-    # choose the output format based on the file extension
-    if output_file.endswith(".xlsx"):
-        df.to_excel(output_file)
-    elif output_file.endswith(".csv"):
-        df.to_csv(output_file)
-    elif output_file.endswith(".tsv"):
-        df.to_csv(output_file, sep="\t")
+    with _tracking(progress) as tracker:
+        profile.fit(source_file, progress=tracker)
+        tracker.phase("write")
+        profile.save(profile_file)
+
+
+def run_transform(profile_file: str, source_file: str, output_file: str, chunk_size: int = _DEFAULT_CHUNK_SIZE,
+                  progress: Callable[[Progress], None] = None):
+    with _tracking(progress) as tracker:
+        tracker.phase("read")
+        profile = ConversionProfile.load(profile_file)
+        if source_file.endswith(".xlsx"):
+            # stream the worksheet instead of loading it completely
+            n_rows = _count_xlsx_rows(source_file, _xlsx_sheet_names(source_file)[0])
+            chunks = profile.transform_chunks(source_file, chunk_size, progress=tracker)
+            _write_chunks(profile, chunks, n_rows, output_file, tracker)
+        else:
+            df = _get_dataframe(source_file)
+            chunks = profile.transform_chunks(df, chunk_size, progress=tracker)
+            _write_chunks(profile, chunks, len(df), output_file, tracker)
+
+
+def run_transform_jsonl(profile_file: str, source_file: str, output_file: str,
+                        chunk_size: int = _DEFAULT_CHUNK_SIZE,
+                        output_format: str = None,
+                        progress: Callable[[Progress], None] = None):
+    """
+    Transforms JSON Lines (one JSON object per line) with a saved profile.
+    The records are read, transformed and written in chunks, so that arbitrarily long streams can be processed.
+    :param source_file: Path to the input file, or ``"-"`` for stdin.
+    :param output_file: Path to the output file, or ``"-"`` for stdout.
+    :param output_format: ``"json"`` (JSON Lines) or ``"csv"``.
+           If ``None``, CSV is chosen for output files ending with ``.csv``, otherwise JSON Lines.
+    :param progress: A function that is called with a :class:`Progress` after each chunk,
+           and with the metrics of the whole job at the end. The total number of rows is unknown.
+    """
+    if output_format is None:
+        output_format = "csv" if output_file.endswith(".csv") else "json"
+    if output_format not in ("json", "csv"):
+        raise ValueError(f"Unexpected output format: {output_format}")
+
+    profile = ConversionProfile.load(profile_file)
+    in_file = sys.stdin if source_file == "-" else open(source_file, "r")
+    out_file = sys.stdout if output_file == "-" else open(output_file, "w", newline="")
+    try:
+        with _tracking(progress) as tracker:
+            _stream_jsonl(profile, in_file, out_file, chunk_size, output_format, tracker)
+    finally:
+        if in_file is not sys.stdin:
+            in_file.close()
+        if out_file is not sys.stdout:
+            out_file.close()
+
+
+def _write_chunks(profile: ConversionProfile, chunks: Iterator, n_rows: int | None, output_file: str,
+                  progress: _ProgressTracker):
+    labels = list(profile.output_labels)
+
+    # write the output chunk by chunk, so that the complete transformed table never has to be in memory.
+    # the output format is chosen based on the file extension
+    with _open_writer(output_file, labels, n_rows=n_rows) as writer:
+        for chunk in chunks:
+            progress.phase("write")
+            writer.write(chunk)
+
+
+def _stream_jsonl(profile: ConversionProfile, in_file: TextIO, out_file: TextIO, chunk_size: int, output_format: str,
+                  progress: _ProgressTracker):
+    labels = list(profile.output_labels)
+    csv_writer = None
+    if output_format == "csv":
+        csv_writer = csv.writer(out_file)
+        csv_writer.writerow(labels)
+
+    progress.start_pass(None)  # the length of a stream is unknown
+    line_number = 0
+    while True:
+        progress.phase("read")
+        lines = list(islice(in_file, chunk_size))
+        if not lines:
+            break
+        records = []
+        for line in lines:
+            line_number += 1
+            if not line.strip():
+                continue  # tolerate empty lines, e.g. at the end of the stream
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON in line {line_number}: {e}") from e
+
+        progress.phase("transform")
+        transformed = profile.transform_records(records)
+        progress.phase("write")
+        for record in transformed:
+            if csv_writer is not None:
+                csv_writer.writerow([record.get(label) for label in labels])
+            else:
+                out_file.write(json.dumps({str(k): _json_value(v) for k, v in record.items()}, default=str))
+                out_file.write("\n")
+        out_file.flush()  # make the output of this chunk available to the next process in the pipeline
+        progress.advance(len(records))
+
+
+def _json_value(val: any) -> any:
+    # null instead of NaN (e.g. a default value) or infinity, which are not valid JSON
+    if isinstance(val, float) and not math.isfinite(val):
+        return None
+    return val
+
+
+class _ProgressPrinter:
+    """
+    Prints the progress of a job to stderr, at most one line per ``_PROGRESS_INTERVAL`` seconds,
+    and the metrics of the whole job as a single line of JSON at the end.
+    """
+
+    def __init__(self, file: TextIO = None):
+        self.file = file
+        self.last_time = None
+
+    def __call__(self, progress: Progress):
+        file = self.file if self.file is not None else sys.stderr
+        if progress.phase == "done":
+            print(json.dumps(progress.as_dict()), file=file, flush=True)
+            return
+        now = time.monotonic()
+        if self.last_time is not None and now - self.last_time < _PROGRESS_INTERVAL:
+            return
+        self.last_time = now
+        print(_format_progress(progress), file=file, flush=True)
+
+
+def _format_progress(progress: Progress) -> str:
+    parts = [f"{progress.elapsed:.1f}s", progress.phase]
+    if progress.key is not None:
+        parts.append(repr(progress.key))
+    if progress.total_rows:
+        parts.append(f"{progress.rows}/{progress.total_rows} rows ({100 * progress.rows / progress.total_rows:.1f}%)")
     else:
-        raise ValueError(f"Unexpected file extension: {output_file}")
+        parts.append(f"{progress.rows} rows")
+    if progress.rows_per_second is not None:
+        parts.append(f"{progress.rows_per_second:.0f} rows/s")
+    if progress.remaining is not None:
+        parts.append(f"{progress.remaining:.0f}s remaining")
+    return " | ".join(parts)
+
 
+def main(argv: list[str] = None):
+    """
+    Entry point of the command line interface.
+    :param argv: The arguments without the program name. By default, the arguments of the process.
+    """
+    parser, commands = _create_parser()
+    args = parser.parse_args(_with_default_command(sys.argv[1:] if argv is None else argv, commands.choices))
+    progress = _ProgressPrinter() if args.progress else None
+
+    if args.command == "convert":
+        run(source_file=args.src,
+            output_file=args.out,
+            ignore_columns=args.ignore,
+            chunk_size=args.chunk_size,
+            progress=progress)
+    elif args.command == "fit":
+        run_fit(source_file=args.src,
+                profile_file=args.profile,
+                ignore_columns=args.ignore,
+                progress=progress)
+    elif args.jsonl:
+        run_transform_jsonl(profile_file=args.profile,
+                            source_file=args.src,
+                            output_file=args.out,
+                            chunk_size=args.chunk_size,
+                            output_format=args.output_format,
+                            progress=progress)
+    else:
+        run_transform(profile_file=args.profile,
+                      source_file=args.src,
+                      output_file=args.out,
+                      chunk_size=args.chunk_size,
+                      progress=progress)
 
-def main():
-    import argparse
 
+def _create_parser() -> tuple[argparse.ArgumentParser, argparse._SubParsersAction]:
     parser = argparse.ArgumentParser(
-        description=f"Consistent and intelligent conversion of tabular data into numerical values.")
-    parser.add_argument("src", type=str, help="Path to input file.")
-    parser.add_argument("out", type=str, help="Path to output file.")
-    parser.add_argument("-i", "--ignore", type=str, nargs="+", default=[], help="Column names to ignore.")
+        prog="clevertable",
+        description="Consistent and intelligent conversion of tabular data into numerical values.",
+        epilog="Without a command, 'convert' is assumed, i.e. 'clevertable src out' fits and transforms a file."
+               " A first argument that is named like a command is read as a command only if no file of that name"
+               " exists.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    convert_parser = commands.add_parser("convert", help="Fit a profile to a file and transform it.")
+    convert_parser.add_argument("src", type=str, help="Path to input file.")
+    convert_parser.add_argument("out", type=str, help="Path to output file (.csv, .tsv, .xlsx, .npy or .parquet).")
+    convert_parser.add_argument("-i", "--ignore", type=str, nargs="+", default=[], help="Column names to ignore.")
+    _add_chunk_size_argument(convert_parser)
+    _add_progress_argument(convert_parser)
+
+    fit_parser = commands.add_parser("fit", help="Fit a profile to a file and save it.")
+    fit_parser.add_argument("src", type=str, help="Path to input file.")
+    fit_parser.add_argument("profile", type=str, help="Path to the file the fitted profile is saved to.")
+    fit_parser.add_argument("-i", "--ignore", type=str, nargs="+", default=[], help="Column names to ignore.")
+    _add_progress_argument(fit_parser)
+
+    transform_parser = commands.add_parser("transform", help="Transform a file with a saved profile.")
+    transform_parser.add_argument("profile", type=str, help="Path to a profile saved with 'fit'.")
+    transform_parser.add_argument("src", type=str, help="Path to input file ('-' for stdin with --jsonl).")
+    transform_parser.add_argument("out", type=str, help="Path to output file ('-' for stdout with --jsonl).")
+    transform_parser.add_argument("--jsonl", action="store_true",
+                                  help="Stream JSON Lines (one JSON object per line) instead of reading a table.")
+    transform_parser.add_argument("-f", "--output-format", type=str, choices=["json", "csv"], default=None,
+                                  help="Output format for --jsonl (default: csv for .csv files, otherwise json).")
+    _add_chunk_size_argument(transform_parser)
+    _add_progress_argument(transform_parser)
+    return parser, commands
+
+
+def _with_default_command(argv: list[str], commands: Iterable[str]) -> list[str]:
+    # 'clevertable src out' is short for 'clevertable convert src out', as before there were commands
+    first = next((arg for arg in argv if not arg.startswith("-")), None)
+    if first is None:
+        return argv  # e.g. --help
+    if first in commands and not os.path.exists(first):
+        return argv
+    # a file that is named like a command, e.g. 'clevertable fit out.csv', is converted as before there were commands
+    return ["convert"] + argv
+
+
+def _add_chunk_size_argument(parser: argparse.ArgumentParser):
+    parser.add_argument("-c", "--chunk-size", type=int, default=_DEFAULT_CHUNK_SIZE,
+                        help="Number of rows that are transformed and written at once.")
 
-    args = parser.parse_args()
 
-    run(source_file=args.src,
-        output_file=args.out,
-        ignore_columns=args.ignore)
+def _add_progress_argument(parser: argparse.ArgumentParser):
+    parser.add_argument("--progress", action="store_true",
+                        help="Print the progress to stderr, and the metrics of the whole job"
+                             " (rows, rows/s, seconds per phase) as a line of JSON at the end.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from typing import Callable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import asyncio
+    from concurrent.futures import Executor
+
+
+class _MicroBatcher:
+
+    def __init__(self, transform_batch: Callable[[list], list],
+                 max_batch_size: int = 64,
+                 max_wait: float = 0.001,
+                 executor: Executor = None):
+        """
+        Collects concurrent ``submit()`` calls into micro-batches and runs every batch
+        through ``transform_batch`` in an executor, so that the event loop is never blocked.
+
+        A batch is started as soon as it contains ``max_batch_size`` items,
+        or ``max_wait`` seconds after its first item arrived, whichever happens first.
+
+        :param transform_batch: Transforms a list of items into a list of results of the same length.
+        :param max_batch_size: Maximum number of items per batch.
+        :param max_wait: Maximum time in seconds that an item waits for other items to join its batch.
+        :param executor: The executor to run the batches in. ``None`` uses the default executor of the event loop.
+        """
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be positive, but got {max_batch_size}")
+        self.transform_batch = transform_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.executor = executor
+
+        # pending items and their futures, separately for each event loop
+        self._pending: dict[asyncio.AbstractEventLoop, list[tuple[any, asyncio.Future]]] = {}
+        self._timers: dict[asyncio.AbstractEventLoop, asyncio.TimerHandle] = {}
+
+    async def submit(self, item: any) -> any:
+        import asyncio  # imported here, as most users never call transform_async()
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(loop, [])
+        pending.append((item, future))
+
+        if len(pending) >= self.max_batch_size:
+            self._flush(loop)
+        elif loop not in self._timers:
+            self._timers[loop] = loop.call_later(self.max_wait, self._flush, loop)
+
+        return await future
+
+    def _flush(self, loop: asyncio.AbstractEventLoop):
+        timer = self._timers.pop(loop, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(loop, [])
+        if not batch:
+            return
+
+        items = [item for item, _ in batch]
+        futures = [future for _, future in batch]
+        task = loop.run_in_executor(self.executor, self._run_batch, items)
+        task.add_done_callback(lambda t: _resolve(futures, t))
+
+    def _run_batch(self, items: list) -> list[tuple[bool, any]]:
+        try:
+            results = self.transform_batch(items)
+        except Exception:
+            # a single bad item must not fail the other callers of this batch
+            # -> transform one by one to assign the errors to their items
+            return [self._run_single(item) for item in items]
+        return [(True, result) for result in results]
+
+    def _run_single(self, item: any) -> tuple[bool, any]:
+        try:
+            return True, self.transform_batch([item])[0]
+        except Exception as e:
+            return False, e
+
+
+def _resolve(futures: list[asyncio.Future], task: asyncio.Future):
+    if task.cancelled():
+        for future in futures:
+            future.cancel()
+        return
+    if task.exception() is not None:
+        for future in futures:
+            if not future.done():
+                future.set_exception(task.exception())
+        return
+    for future, (success, result) in zip(futures, task.result()):
+        if future.done():  # e.g. cancelled by the caller
+            continue
+        if success:
+            future.set_result(result)
+        else:
+            future.set_exception(result)
@@ -0,0 +1,400 @@
+from __future__ import annotations
+
+import ast
+import math
+from operator import itemgetter
+from typing import TYPE_CHECKING, Callable
+
+from .Converter import Converter
+
+if TYPE_CHECKING:
+    from .RecordProfile import RecordProfile
+
+# source of the helper functions that generated code may call
+_HELPERS = {
+    "_float": '''
+def _float(val, default):
+    try:
+        num = float(val)
+    except (ValueError, TypeError, OverflowError):
+        num = _nan
+    if _isfinite(num):
+        return num
+    if default is None:
+        raise ValueError(f"Cannot transform value '{val}' to float,"
+                         f" because parsing failed and no default value was specified.")
+    return default
+''',
+    "_binary": '''
+def _binary(val, positive, negative):
+    if val not in positive and val not in negative:
+        raise ValueError(f"Value '{val}' is neither in the positive nor in the negative values.")
+    return int(val in positive)
+''',
+}
+
+_DEFAULT_PREPROCESSING_SOURCE = '''
+def _pre_process(val):
+    if type(val) is float:
+        if _isnan(val):
+            return ""
+        else:
+            return val
+    if type(val) == str:
+        return val.strip().lower()
+    return val
+'''
+
+
+class _SourceBuilder:
+
+    def __init__(self, standalone: bool):
+        """
+        Collects the lines of the generated ``transform()`` function, and the constants and helpers it uses.
+        :param standalone: If ``True``, constants are written into the source as literals,
+               so that the source can be saved as a module that doesn't depend on clevertable.
+               Otherwise, they are passed to ``exec()`` in the namespace.
+        """
+        self.standalone = standalone
+        self.namespace = {"_nan": math.nan, "_isfinite": math.isfinite, "_isnan": math.isnan,
+                          "itemgetter": itemgetter}
+        self.constant_lines: list[str] = []
+        self.helpers: list[str] = []
+        self.lines: list[str] = []
+        self.__counter = 0
+
+    def name(self, prefix: str) -> str:
+        self.__counter += 1
+        return f"{prefix}{self.__counter}"
+
+    def constant(self, value: any, prefix: str = "_c") -> str:
+        """:return: The name of a module level constant with the given value."""
+        name = self.name(prefix)
+        if self.standalone:
+            self.constant_lines.append(f"{name} = {_literal(value)}")
+        else:
+            self.namespace[name] = value
+        return name
+
+    def variable(self, expression: str) -> str:
+        """:return: The name of a local variable that is assigned the given expression."""
+        name = self.name("v")
+        self.lines.append(f"{name} = {expression}")
+        return name
+
+    def getter(self, keys: tuple) -> str:
+        """:return: The name of a module level ``itemgetter`` for the given keys."""
+        name = self.name("_getter")
+        if self.standalone:
+            self.constant_lines.append(f"{name} = itemgetter({', '.join(_literal(k) for k in keys)})")
+        else:
+            self.namespace[name] = itemgetter(*keys)
+        return name
+
+    def helper(self, name: str) -> str:
+        if name not in self.helpers:
+            self.helpers.append(name)
+            if not self.standalone:
+                exec(_HELPERS[name], self.namespace)
+        return name
+
+
+def _literal(value: any) -> str:
+    # source code of a value, for standalone modules
+    if isinstance(value, float) and math.isnan(value):
+        return "_nan"
+    if isinstance(value, (set, frozenset)):
+        return f"frozenset({_literal(tuple(value))})" if value else "frozenset()"
+    if isinstance(value, tuple):
+        return f"({''.join(_literal(v) + ', ' for v in value)})"
+    if isinstance(value, list):
+        return f"[{', '.join(_literal(v) for v in value)}]"
+    if isinstance(value, dict):
+        return f"{{{', '.join(f'{_literal(k)}: {_literal(v)}' for k, v in value.items())}}}"
+    source = repr(value)
+    try:
+        if ast.literal_eval(source) == value and type(ast.literal_eval(source)) is type(value):
+            return source
+    except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+        pass
+    raise ValueError(f"Cannot write {source} of type {type(value).__name__} into a standalone module.")
+
+
+def _compile_converter(conv: Converter, builder: _SourceBuilder, inputs: list[str]) -> list[str] | None:
+    """
+    Generates code for a fitted converter.
+    :param inputs: Expressions for the input values (the elements of the input row).
+    :return: Expressions for the output values, or ``None`` if the converter can't be compiled.
+    """
+    compile_func = _COMPILERS.get(type(conv))
+    if compile_func is None:
+        return None
+    return compile_func(conv, builder, inputs)
+
+
+def _compile_float(conv, builder: _SourceBuilder, inputs: list[str]) -> list[str] | None:
+    if len(inputs) != 1 or isinstance(conv.default, str):  # "mean" etc. if not fitted
+        return None
+    default = builder.constant(conv.default, "_default")
+    return [f"{builder.helper('_float')}({inputs[0]}, {default})"]
+
+
+def _compile_binary(conv, builder: _SourceBuilder, inputs: list[str]) -> list[str] | None:
+    if len(inputs) != 1:
+        return None
+    if conv.positive and conv.negative:
+        positive = builder.constant(frozenset(conv.positive), "_positive")
+        negative = builder.constant(frozenset(conv.negative), "_negative")
+        return [f"{builder.helper('_binary')}({inputs[0]}, {positive}, {negative})"]
+    if conv.positive:
+        return [f"int({inputs[0]} in {builder.constant(frozenset(conv.positive), '_positive')})"]
+    return [f"1 - int({inputs[0]} in {builder.constant(frozenset(conv.negative), '_negative')})"]
+
+
+def _compile_enumerate(conv, builder: _SourceBuilder, inputs: list[str]) -> list[str] | None:
+    if len(inputs) != 1 or conv.extend:
+        return None
+    index = {}
+    try:
+        for i, val in enumerate(conv.values):
+            index.setdefault(val, i)  # like tuple.index(), the first occurrence counts
+    except TypeError:  # unhashable values
+        return None
+    if conv.capped:
+        return [f"{builder.constant(index, '_index')}.get({inputs[0]}, {len(conv.values)})"]  # unknown -> other
+    return [f"{builder.constant(index, '_index')}[{inputs[0]}]"]  # unknown values raise a KeyError
+
+
+def _compile_one_hot(conv, builder: _SourceBuilder, inputs: list[str]) -> list[str] | None:
+    if len(inputs) != 1 or conv.extend:
+        return None
+    val = inputs[0] if inputs[0].isidentifier() else builder.variable(inputs[0])  # evaluate only once
+    outputs = [f"int({val} == {builder.constant(v, '_value')})" for v in conv.values]
+    if conv.capped:
+        outputs = [builder.variable(output) for output in outputs]
+        matched = " or ".join(outputs) or "0"
+        outputs.append(f"int({val} is not None and not ({matched}))")  # the other column
+    return outputs
+
+
+def _compile_map(conv, builder: _SourceBuilder, inputs: list[str]) -> list[str] | None:
+    if len(inputs) != 1:
+        return None
+    widths = {len(val) for val in conv.lookup_table.values()}
+    if conv.default_value is not None:
+        widths.add(len(conv.default_value))
+    if len(widths) != 1:
+        return None
+    width = widths.pop()
+
+    if width == 1:
+        table = builder.constant({key: val[0] for key, val in conv.lookup_table.items()}, "_map")
+        if conv.default_value is None:
+            return [f"{table}[{inputs[0]}]"]  # unknown values raise a KeyError
+        return [f"{table}.get({inputs[0]}, {builder.constant(conv.default_value[0], '_default')})"]
+
+    table = builder.constant(conv.lookup_table, "_map")
+    if conv.default_value is None:
+        row = builder.variable(f"{table}[{inputs[0]}]")
+    else:
+        row = builder.variable(f"{table}.get({inputs[0]}, {builder.constant(conv.default_value, '_default')})")
+    return [f"{row}[{i}]" for i in range(width)]
+
+
+def _compile_id(conv, builder: _SourceBuilder, inputs: list[str]) -> list[str] | None:
+    return list(inputs)
+
+
+def _compile_ignore(conv, builder: _SourceBuilder, inputs: list[str]) -> list[str] | None:
+    return []
+
+
+def _compile_const(conv, builder: _SourceBuilder, inputs: list[str]) -> list[str] | None:
+    return [builder.constant(val, "_const") for val in conv.transform((None,))]
+
+
+def _compile_pipeline(conv, builder: _SourceBuilder, inputs: list[str]) -> list[str] | None:
+    outputs = _compile_converter(conv.first, builder, inputs)
+    if outputs is None:
+        return None
+    return _compile_converter(conv.second, builder, outputs)
+
+
+def _compile_infer(conv, builder: _SourceBuilder, inputs: list[str]) -> list[str] | None:
+    if conv.inferred is None:
+        return None
+    return _compile_converter(conv.inferred, builder, inputs)
+
+
+def _compilers() -> dict[type, Callable]:
+    # dynamic imports in order to break circular dependency
+    from .Binary import Binary
+    from .Const import Const
+    from .Enumerate import Enumerate
+    from .Float import Float
+    from .Id import Id
+    from .Ignore import Ignore
+    from .Infer import Infer
+    from .Label import Label
+    from .Map import Map
+    from .OneHot import OneHot
+    from .Pipeline import Pipeline
+
+    # exact types: e.g. List is a Pipeline, but must not be compiled like one
+    return {
+        Float: _compile_float,
+        Binary: _compile_binary,
+        Enumerate: _compile_enumerate,
+        OneHot: _compile_one_hot,
+        Map: _compile_map,
+        Id: _compile_id,
+        Label: _compile_id,
+        Ignore: _compile_ignore,
+        Const: _compile_const,
+        Pipeline: _compile_pipeline,
+        Infer: _compile_infer,
+    }
+
+
+_COMPILERS: dict[type, Callable] = {}
+
+
+def _compile_profile(record_profile: RecordProfile,
+                     fallback: Callable[[dict], dict],
+                     pre_processing: Callable[[any], any] | None = None,
+                     path: str = None) -> Callable[[dict], dict]:
+    """
+    Compiles the fitted profile into a function that transforms a single record.
+    If the compiled code raises an exception, the record is transformed again with ``fallback``,
+    which raises the error with helpful context (or handles cases that the compiled code doesn't, like new labels).
+
+    :param path: If given, a standalone module is written to this file.
+    """
+    profile = record_profile._profile
+    output_keys = record_profile.keys
+    if path is not None:
+        source, _, _ = _generate_source(profile, output_keys, True, pre_processing)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(source)
+
+    source, namespace, _ = _generate_source(profile, output_keys, False, pre_processing)
+    exec(compile(source, "<compiled profile>", "exec"), namespace)
+    compiled = namespace["transform"]
+
+    def transform(record: dict) -> dict:
+        try:
+            return compiled(record)
+        except Exception:
+            return fallback(record)
+
+    transform.source = source
+    return transform
+
+
+def _generate_source(profile: dict[any, Converter],
+                     output_keys: dict[any, tuple],
+                     standalone: bool,
+                     pre_processing: Callable[[any], any] | None = None) -> tuple[str, dict, list]:
+    """
+    Generates the source of a module with a function ``transform(record: dict) -> dict``
+    that is equivalent to ``RecordProfile.transform()`` for the given fitted converters.
+    Converters that can't be compiled are called through ``transform()``, unless ``standalone`` is ``True``.
+
+    :param profile: The fitted converters of each key.
+    :param output_keys: The output keys of each key.
+    :param pre_processing: A function that is applied to all values of the record first.
+    :return: The source, the namespace to execute it in, and the keys whose converters were not compiled.
+    """
+    if not _COMPILERS:
+        _COMPILERS.update(_compilers())
+    builder = _SourceBuilder(standalone)
+    if pre_processing is not None:
+        builder.lines.append("record = _pre_process_record(record)")
+
+    outputs = []  # (output key expression, value expression)
+    not_compiled = []
+    for key, conv in profile.items():
+        if isinstance(key, tuple):
+            inputs = _unpack_tuple_key(key, builder)
+        else:
+            inputs = [builder.variable(f"record[{builder.constant(key, '_key')}]")]
+
+        n_lines = len(builder.lines)
+        values = _compile_converter(conv, builder, inputs)
+        if values is None or len(values) != len(output_keys[key]):
+            del builder.lines[n_lines:]  # remove the partial code of this converter
+            not_compiled.append(key)
+            if standalone:
+                continue
+            # call the converter itself
+            row = f"({''.join(val + ', ' for val in inputs)})"
+            values = [builder.name("v") for _ in output_keys[key]]
+            # unpacking fails if the output length changed (e.g. in extend mode), like the checks of transform()
+            builder.lines.append(f"[{', '.join(values)}] = {builder.constant(conv, '_converter')}.transform({row})")
+
+        for output_key, value in zip(output_keys[key], values):
+            outputs.append((builder.constant(output_key, "_label"), value))
+
+    if standalone and not_compiled:
+        raise ValueError(f"Cannot generate a standalone module, because the converters of these keys"
+                         f" cannot be compiled: {', '.join(repr(key) for key in not_compiled)}")
+
+    source = ['"""Generated by clevertable from a fitted profile."""']
+    if standalone:
+        source.append("from math import isfinite as _isfinite, isnan as _isnan, nan as _nan")
+        source.append("from operator import itemgetter")
+    source.extend(_HELPERS[name] for name in builder.helpers)
+    if pre_processing is not None:
+        source.append(_pre_processing_source(pre_processing, builder))
+    source.append("")
+    source.extend(builder.constant_lines)
+    source.append("\n")
+    source.append("def transform(record):")
+    source.extend(f"    {line}" for line in builder.lines)
+    source.append("    return {")
+    source.extend(f"        {label}: {value}," for label, value in outputs)
+    source.append("    }")
+    return "\n".join(source) + "\n", builder.namespace, not_compiled
+
+
+def _unpack_tuple_key(key: tuple, builder: _SourceBuilder) -> list[str]:
+    """
+    Generates code that looks up the values of a tuple of keys, like ``_getitem_nested()``.
+    Flat tuples of keys are looked up with a single ``itemgetter``.
+    :return: The names of the variables holding the elements of the row.
+    """
+    if len(key) > 1 and not any(isinstance(k, tuple) for k in key):
+        names = [builder.name("v") for _ in key]
+        builder.lines.append(f"{', '.join(names)} = {builder.getter(key)}(record)")
+        return names
+    return [builder.variable(_nested_expression(k, builder)) for k in key]
+
+
+def _nested_expression(key: any, builder: _SourceBuilder) -> str:
+    if isinstance(key, tuple):
+        return f"({''.join(_nested_expression(k, builder) + ', ' for k in key)})"
+    return f"record[{builder.constant(key, '_key')}]"
+
+
+def _pre_processing_source(pre_processing: Callable[[any], any], builder: _SourceBuilder) -> str:
+    from .ConversionProfile import default_preprocessing
+
+    record_function = '''
+def _pre_process_record(record):
+    result = {}
+    for k, v in record.items():
+        try:
+            result[k] = _pre_process(v)
+        except Exception:
+            result[k] = v
+    return result
+'''
+    if pre_processing is default_preprocessing:
+        return _DEFAULT_PREPROCESSING_SOURCE + record_function
+    if pre_processing is str.lower:
+        return "\n_pre_process = str.lower\n" + record_function
+    if builder.standalone:
+        raise ValueError(f"Cannot write the pre-processing function {pre_processing} into a standalone module."
+                         f" Only the default pre-processing, str.lower and None are supported.")
+    builder.namespace["_pre_process"] = pre_processing
+    return record_function
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from .Progress import Progress
+
+
+class _ProgressTracker:
+    """
+    Measures the phases and the processed rows of a job and reports them to a callback as :class:`Progress`.
+    Without a callback, only the time of each phase is measured, which costs next to nothing.
+    """
+
+    def __init__(self, callback: Callable[[Progress], None] | None):
+        self.callback = callback
+        self.depth = 0  # number of nested _tracking() blocks, the outermost one finishes the job
+        self.start_time = time.perf_counter()
+        self.phase_seconds: dict[str, float] = {}
+        self.current_phase: str | None = None
+        self.current_key: any = None
+        self.phase_start = self.start_time
+        # the current pass (fit or transform)
+        self.rows = 0
+        self.total_rows: int | None = None
+        self.pass_start = self.start_time
+
+    def start_pass(self, total_rows: int | None):
+        """Starts counting the rows of a new pass over the data, e.g. the transform after the fit."""
+        self.rows = 0
+        self.total_rows = total_rows
+        self.pass_start = time.perf_counter()
+
+    def phase(self, name: str, key: any = None):
+        """Ends the current phase and starts the given one."""
+        now = self.__end_phase()
+        self.current_phase, self.current_key = name, key
+        self.phase_start = now
+        self.__report(now)
+
+    def advance(self, n_rows: int):
+        """Counts rows of the current pass that are processed completely."""
+        self.rows += n_rows
+        self.__report(time.perf_counter())
+
+    def finish(self) -> Progress:
+        """Ends the job and reports the metrics of the whole job with the phase ``"done"``."""
+        now = self.__end_phase()
+        self.current_phase, self.current_key = None, None
+        elapsed = now - self.start_time
+        progress = Progress(phase="done",
+                            rows=self.rows,
+                            total_rows=self.total_rows,
+                            elapsed=elapsed,
+                            rows_per_second=self.rows / elapsed if elapsed > 0 else None,
+                            remaining=0.0,
+                            phase_seconds=dict(self.phase_seconds))
+        if self.callback is not None:
+            self.callback(progress)
+        return progress
+
+    def __end_phase(self) -> float:
+        now = time.perf_counter()
+        if self.current_phase is not None:
+            seconds = self.phase_seconds.get(self.current_phase, 0.0)
+            self.phase_seconds[self.current_phase] = seconds + (now - self.phase_start)
+        return now
+
+    def __report(self, now: float):
+        if self.callback is None:
+            return
+        pass_elapsed = now - self.pass_start
+        rows_per_second = self.rows / pass_elapsed if self.rows and pass_elapsed > 0 else None
+        remaining = None
+        if rows_per_second and self.total_rows is not None:
+            remaining = max(self.total_rows - self.rows, 0) / rows_per_second
+        # the time of the current phase so far is included
+        phase_seconds = dict(self.phase_seconds)
+        if self.current_phase is not None:
+            phase_seconds[self.current_phase] = phase_seconds.get(self.current_phase, 0.0) + (now - self.phase_start)
+        self.callback(Progress(phase=self.current_phase,
+                               rows=self.rows,
+                               total_rows=self.total_rows,
+                               elapsed=now - self.start_time,
+                               rows_per_second=rows_per_second,
+                               remaining=remaining,
+                               phase_seconds=phase_seconds,
+                               key=self.current_key))
+
+
+@contextmanager
+def _tracking(progress: Callable[[Progress], None] | _ProgressTracker | None) -> Iterator[_ProgressTracker]:
+    """
+    Tracks a job. A callback (or ``None``) starts a new job, which is finished at the end of the block.
+    A tracker continues the job of an enclosing block, e.g. the reading of a file before ``fit()``.
+    If the block raises an exception, the job is not finished.
+    """
+    tracker = progress if isinstance(progress, _ProgressTracker) else _ProgressTracker(progress)
+    tracker.depth += 1
+    try:
+        yield tracker
+    finally:
+        tracker.depth -= 1
+    if tracker.depth == 0:
+        tracker.finish()
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from itertools import islice
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def _open_workbook(path: str):
+    from openpyxl import load_workbook
+
+    # read-only workbooks parse the rows lazily while iterating, instead of loading all cells into memory
+    return load_workbook(path, read_only=True, data_only=True, keep_links=False)
+
+
+def _xlsx_sheet_names(path: str, sheets: str | int | list[str | int] | None = None) -> list[str]:
+    """
+    :param sheets: A sheet name or index, a list of them, ``"*"`` for all sheets, or ``None`` for the first sheet.
+    :return: The names of the selected sheets, in the given order.
+    """
+    workbook = _open_workbook(path)
+    try:
+        names = workbook.sheetnames
+    finally:
+        workbook.close()
+    if sheets is None:
+        return names[:1]
+    if sheets == "*":
+        return names
+    if not isinstance(sheets, list):
+        sheets = [sheets]
+    selected = []
+    for sheet in sheets:
+        if isinstance(sheet, int):
+            selected.append(names[sheet])
+        elif sheet in names:
+            selected.append(sheet)
+        else:
+            raise ValueError(f"Worksheet {repr(sheet)} not found in {path}. Available worksheets: {names}")
+    return selected
+
+
+def _count_xlsx_rows(path: str, sheet: str) -> int | None:
+    """
+    :return: The number of data rows (without the header) according to the dimensions stored in the file,
+             or ``None`` if the file doesn't store them.
+    """
+    workbook = _open_workbook(path)
+    try:
+        max_row = workbook[sheet].max_row
+    finally:
+        workbook.close()
+    if max_row is None:
+        return None
+    return max(max_row - 1, 0)
+
+
+def _iter_xlsx_chunks(path: str, chunk_size: int, sheet: str = None, columns: list[str] = None
+                      ) -> Iterator[pd.DataFrame]:
+    """
+    Reads a worksheet chunk by chunk, so that only one chunk of rows is in memory at a time.
+    The first row is used as column names, like ``pd.read_excel()``, and empty cells become NaN.
+    Empty rows at the end of the worksheet (e.g. formatted, but empty cells) are dropped, like in ``pd.read_excel()``.
+    The index of each chunk is the position of its rows in the worksheet (without the header).
+
+    :param sheet: The worksheet name. ``None`` reads the first worksheet.
+    :param columns: The columns to read. ``None`` reads all columns.
+    """
+    import pandas as pd  # imported here, as pandas is slow to import
+
+    workbook = _open_workbook(path)
+    try:
+        worksheet = workbook[sheet] if sheet is not None else workbook.worksheets[0]
+        rows = _without_trailing_empty_rows(worksheet.iter_rows(values_only=True))
+        header = next(rows, None)
+        if header is None:
+            return
+        header = _column_names(header)
+
+        positions = list(range(len(header)))
+        if columns is not None:
+            missing = [col for col in columns if col not in header]
+            if missing:
+                raise ValueError(f"Columns not found in worksheet {repr(worksheet.title)}: {missing}")
+            positions = [header.index(col) for col in columns]
+        names = [header[i] for i in positions]
+
+        start = 0
+        while True:
+            batch = list(islice(rows, chunk_size))
+            if not batch:
+                break
+            # rows may be shorter than the header if their last cells are empty
+            values = [tuple(row[i] if i < len(row) else None for i in positions) for row in batch]
+            chunk = pd.DataFrame.from_records(values, columns=names,
+                                              index=pd.RangeIndex(start, start + len(batch)))
+            yield chunk.fillna(float("nan"))  # empty cells are None, but NaN in pd.read_excel()
+            start += len(batch)
+    finally:
+        workbook.close()
+
+
+def _without_trailing_empty_rows(rows: Iterator[tuple]) -> Iterator[tuple]:
+    # empty rows are held back until a non-empty row follows, so that the empty rows at the end are never yielded
+    empty_rows = []
+    for row in rows:
+        if all(val is None for val in row):
+            empty_rows.append(row)
+            continue
+        yield from empty_rows
+        empty_rows.clear()
+        yield row
+
+
+def _column_names(header: tuple) -> list:
+    # like pd.read_excel(): unnamed columns are numbered, and duplicate names are made unique
+    names = []
+    seen = set()
+    for i, name in enumerate(header):
+        if name is None:
+            name = f"Unnamed: {i}"
+        unique, k = name, 0
+        while unique in seen:
+            k += 1
+            unique = f"{name}.{k}"
+        seen.add(unique)
+        names.append(unique)
+    return names
+
+
+def _read_xlsx(path: str, sheet: str = None, columns: list[str] = None) -> pd.DataFrame:
+    """Reads a whole worksheet with the streaming reader, see :func:`_iter_xlsx_chunks`."""
+    import pandas as pd  # imported here, as pandas is slow to import
+
+    chunks = list(_iter_xlsx_chunks(path, 100_000, sheet, columns))
+    if not chunks:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(chunks)
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+
+def _mix64(h: np.ndarray) -> np.ndarray:
+    """
+    Scrambles 64-bit hashes (finalizer of splitmix64).
+    This is needed because Python's ``hash()`` is not uniformly distributed, e.g. ``hash(5) == 5``.
+    """
+    h = h.copy()
+    with np.errstate(over="ignore"):
+        h ^= h >> np.uint64(30)
+        h *= np.uint64(0xBF58476D1CE4E5B9)
+        h ^= h >> np.uint64(27)
+        h *= np.uint64(0x94D049BB133111EB)
+        h ^= h >> np.uint64(31)
+    return h
+
+
+class _HyperLogLog:
+
+    def __init__(self, precision: int = 12):
+        """
+        Estimates the number of distinct values in a stream with constant memory (HyperLogLog).
+        Values are considered equal if they are equal in a ``set``.
+        :param precision: Uses ``2 ** precision`` registers. The relative standard error is ``1.04 / sqrt(2 ** precision)``.
+        """
+        self.precision = precision
+        self.registers = np.zeros(2 ** precision, dtype=np.uint8)
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def update(self, values: list):
+        hashes = np.fromiter(map(hash, values), dtype=np.int64, count=len(values)).view(np.uint64)
+        hashes = _mix64(hashes)
+
+        p = self.precision
+        index = (hashes >> np.uint64(64 - p)).astype(np.intp)  # the first p bits choose the register
+        rest = hashes & np.uint64((1 << (64 - p)) - 1)  # the remaining bits
+        # position of the first 1-bit in the remaining bits, counted from the left, starting at 1
+        _, exponent = np.frexp(rest.astype(np.float64))  # exponent == bit length (for rest > 0)
+        rank = (64 - p) - exponent + 1
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+
+    def estimate(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros > 0:
+            return m * math.log(m / zeros)  # small range correction (linear counting)
+        return float(raw)
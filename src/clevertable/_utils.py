@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+from collections import Counter
+from fractions import Fraction
 from typing import Iterable, Callable
 
 from .Converter import Converter
 
+_COUNTING_CHUNK_SIZE = 4096  # number of values that are processed at once when counting distinct values
+
 
 def _parse_converter(value: any) -> Converter:
     # dynamic imports in order to break circular dependency
@@ -46,6 +50,7 @@ def _index_duplicates(labels: tuple[str], index_func: Callable[[str, int], str])
     Add index suffix to all duplicate strings.
     This is done repeatedly until no duplicates are left,
     i.e. the returned list is guaranteed to have no duplicates.
+    Every repetition takes linear time.
     :param labels: Tuple of strings, may contain duplicates.
     :param index_func: (label, occurrence_count) -> new_label
     :return:
@@ -55,18 +60,211 @@ def _index_duplicates(labels: tuple[str], index_func: Callable[[str, int], str])
     # add index suffix to all duplicate strings
     # e.g. ["apple", "banana", "apple"] -> ["apple_1", "banana", "apple_2"]
     # for complete safety, repeat this until no duplicates are left
-    while len(set(labels)) != len(labels):  # while duplicates are present
-        counts = {label: labels.count(label) for label in set(labels)}
-        occurrence_count = {label: 0 for label in set(labels)}
+    counts = Counter(labels)
+    while len(counts) != len(labels):  # while duplicates are present
+        occurrence_count = Counter()
         labels = list(labels)  # need write access
         for i, label in enumerate(labels):
-            count = counts[label]
-            occurrence_count[label] += 1
-            if count > 1:
+            if counts[label] > 1:
+                occurrence_count[label] += 1
                 labels[i] = index_func(label, occurrence_count[label])
         labels = tuple(labels)
+        counts = Counter(labels)
     return labels
 
 
 def _flatten_tuples(tuple_of_tuples: tuple[tuple]) -> tuple:
     return tuple(e for inner_list in tuple_of_tuples for e in inner_list)
+
+
+def _transform_nested(converter: Converter, row: tuple) -> tuple:
+    """
+    Calls ``converter.transform(row)`` for a converter that is nested in another one (e.g. in a ``Pipeline``),
+    and records the converter in the exception it raises, see ``_converter_path()``.
+    """
+    try:
+        return converter.transform(row)
+    except Exception as e:
+        # the path is built from the innermost converter outwards, while the exception is re-raised
+        e._converter_names = (converter.__class__.__name__,) + getattr(e, "_converter_names", ())
+        raise
+
+
+def _converter_path(exception: Exception, converter: Converter) -> str:
+    """
+    Returns the chain of converters through which the given exception was raised,
+    e.g. ``"Pipeline > Try > Float"``.
+    :param converter: The outermost converter, which raised the exception.
+    """
+    return " > ".join((converter.__class__.__name__,) + getattr(exception, "_converter_names", ()))
+
+
+def _in_extend_mode(converter: Converter) -> bool:
+    # searches the converter and all nested converters (e.g. of pipelines) for one in extend mode
+    stack = [converter]
+    seen = set()
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, Converter):
+            if getattr(obj, "extend", False) is True:
+                return True
+            stack.extend(vars(obj).values())
+        elif isinstance(obj, (list, tuple)):
+            stack.extend(val for val in obj if isinstance(val, (Converter, list, tuple)))
+    return False
+
+
+def _isin(values: list, test_values: Iterable) -> list[bool]:
+    """
+    Checks for all values at once whether they are contained in ``test_values``, using a hash table.
+    Plain set lookups are faster than ``pandas.Series.isin()`` for any batch size,
+    as the values would have to be copied into an object array first.
+    :return: List of booleans with one entry per value.
+    :raises TypeError: If a value is unhashable.
+    """
+    test_values = test_values if isinstance(test_values, (set, frozenset)) else frozenset(test_values)
+    return [val in test_values for val in values]
+
+
+def _describe_rows(values: list, positions: Iterable[int], max_count: int = 10) -> str:
+    # e.g. "'foo' (row 3), 'bar' (row 7), ... (12 in total)"
+    positions = list(positions)
+    s = ", ".join(f"{repr(values[i])} (row {i})" for i in positions[:max_count])
+    if len(positions) > max_count:
+        s += f", ... ({len(positions)} in total)"
+    return s
+
+
+def _count_unique_up_to(values: list, limit: int) -> int:
+    """
+    Counts the distinct values, but stops as soon as more than ``limit`` distinct values are found.
+    :return: The exact number of distinct values if it is at most ``limit``, otherwise ``limit + 1``.
+    """
+    unique = set()
+    for start in range(0, len(values), _COUNTING_CHUNK_SIZE):
+        unique.update(values[start:start + _COUNTING_CHUNK_SIZE])
+        if len(unique) > limit:
+            return limit + 1
+    return len(unique)
+
+
+def _has_fewer_unique_than(values: list, threshold: float) -> bool:
+    """
+    Checks whether there are fewer than ``threshold`` distinct values,
+    without building a set of all values if possible:
+    The number of distinct values is estimated with a HyperLogLog sketch,
+    which stops early as soon as the threshold is clearly exceeded.
+    Only if the estimate is too close to the threshold, the values are counted exactly.
+    """
+    if threshold <= 100:
+        # small columns: a set of all values is not expensive
+        return len(set(values)) < threshold
+
+    from ._sketch import _HyperLogLog  # imported here, as NumPy is slow to import
+
+    sketch = _HyperLogLog()
+    margin = 3 * sketch.relative_error
+    for start in range(0, len(values), _COUNTING_CHUNK_SIZE):
+        sketch.update(values[start:start + _COUNTING_CHUNK_SIZE])
+        if sketch.estimate() > threshold * (1 + margin):
+            return False  # early termination, remaining values can only increase the count
+    estimate = sketch.estimate()
+    if estimate < threshold * (1 - margin):
+        return True
+    return len(set(values)) < threshold
+
+
+def _check_category_caps(max_categories: int | None, min_frequency: int | None, extend: bool):
+    if max_categories is not None and (not isinstance(max_categories, int) or max_categories < 1):
+        raise ValueError(f"max_categories must be a positive integer, but got {repr(max_categories)}")
+    if min_frequency is not None and (not isinstance(min_frequency, int) or min_frequency < 1):
+        raise ValueError(f"min_frequency must be a positive integer, but got {repr(min_frequency)}")
+    if extend and (max_categories is not None or min_frequency is not None):
+        raise ValueError("extend=True cannot be combined with max_categories or min_frequency,"
+                         " as unknown values are counted as 'other' instead of being appended.")
+
+
+def _weighted_counts(values: Iterable, counts: Iterable[int]) -> Counter:
+    """
+    :return: How often each value occurs, given values and how often each of them occurs.
+             Equal values are added up, e.g. categories that are equal after pre-processing.
+    """
+    weighted = Counter()
+    for val, count in zip(values, counts):
+        weighted[val] += count
+    return weighted
+
+
+def _cap_categories(counts: Counter, max_categories: int | None, min_frequency: int | None) -> tuple[tuple, tuple]:
+    """
+    Splits the counted values into the values that are kept and those that are merged into a single "other" category:
+    Values that occur less than ``min_frequency`` times are merged, and of the remaining values,
+    only the ``max_categories`` most frequent ones are kept.
+    Values that occur equally often are kept in their sorted order, so that the result doesn't depend on the order
+    of the data (if the values can be sorted).
+    :return: The kept values and the merged values, both sorted if possible.
+    """
+    values = list(counts)
+    try:
+        values.sort()
+    except TypeError:
+        pass
+    ranked = sorted(values, key=lambda val: -counts[val])  # stable, i.e. ties stay in sorted order
+    if min_frequency is not None:
+        ranked = [val for val in ranked if counts[val] >= min_frequency]
+    kept = set(ranked[:max_categories])  # max_categories=None -> all
+    return tuple(val for val in values if val in kept), tuple(val for val in values if val not in kept)
+
+
+def _merge_summaries(a: any, b: any) -> any:
+    """
+    Combines the summaries of two parts of the data (see ``Converter.partial_fit()``)
+    into the summary of both parts. Apart from the order of dict keys, the result doesn't depend on the order
+    in which the summaries are combined.
+    Keys that are missing in one of two dicts are taken from the other dict.
+    """
+    if isinstance(a, Counter) and isinstance(b, Counter):
+        return a + b
+    if isinstance(a, dict) and isinstance(b, dict):
+        merged = dict(a)
+        for key, summary in b.items():
+            merged[key] = _merge_summaries(merged[key], summary) if key in merged else summary
+        return merged
+    if isinstance(a, (set, frozenset)) and isinstance(b, (set, frozenset)):
+        return a | b
+    if isinstance(a, tuple) and isinstance(b, tuple) and len(a) == len(b):
+        return tuple(_merge_summaries(x, y) for x, y in zip(a, b))
+    if isinstance(a, (int, Fraction)) and isinstance(b, (int, Fraction)) \
+            and not isinstance(a, bool) and not isinstance(b, bool):
+        return a + b
+    raise TypeError(f"Cannot merge the summaries {repr(a)[:100]} and {repr(b)[:100]}")
+
+
+def _lookup_array(values: Iterable) -> "numpy.ndarray":
+    """
+    :return: An object array of the given values (which may also be tuples), followed by ``None``,
+             so that index ``-1`` can be used for rows that can't be decoded.
+    """
+    import numpy as np  # imported here, as NumPy is slow to import
+
+    values = list(values)
+    lookup = np.empty(len(values) + 1, dtype=object)
+    for i, val in enumerate(values):
+        lookup[i] = val  # not lookup[:-1] = values, which would unpack tuples
+    return lookup
+
+
+def _output_matrix(outputs: "numpy.ndarray", width: int, converter: Converter) -> "numpy.ndarray":
+    """:return: The given outputs as 2-dimensional array, after checking that it has the given number of columns."""
+    import numpy as np  # imported here, as NumPy is slow to import
+
+    outputs = np.asarray(outputs)
+    if outputs.ndim == 1 and width == 1:
+        outputs = outputs.reshape(-1, 1)
+    if outputs.ndim != 2 or outputs.shape[1] != width:
+        raise ValueError(f"{converter.__class__.__name__} expects {width} output columns,"
+                         f" but got an array of shape {outputs.shape}")
+    return outputs
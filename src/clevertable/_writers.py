@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class _OutputWriter(ABC):
+    """
+    Writes transformed chunks of a table to a file, one chunk at a time.
+    Only the current chunk has to be held in memory.
+    """
+
+    def __init__(self, path: str, labels: list, n_rows: int = None):
+        """
+        :param path: Path to the output file.
+        :param labels: The output column names, in output order.
+        :param n_rows: Total number of rows that will be written. Only required by some formats.
+        """
+        self.path = path
+        self.labels = list(labels)
+        self.n_rows = n_rows
+
+    @abstractmethod
+    def write(self, df: pd.DataFrame):
+        """Writes the next chunk, whose columns are the output columns."""
+        pass
+
+    @abstractmethod
+    def close(self):
+        """Finishes the file, which must be valid even if no chunks were written."""
+        pass
+
+    def _check_columns(self, df: pd.DataFrame, header: list):
+        # all rows of a file must have the columns of its header,
+        # but a converter in extend mode adds output columns for values that are first seen in a later chunk
+        if list(df.columns) != header:
+            added = [col for col in df.columns if col not in header]
+            missing = [col for col in header if col not in df.columns]
+            raise ValueError(f"The output columns of a chunk differ from the columns of the file"
+                             f" (added: {added}, missing: {missing}), e.g. because a converter in extend mode"
+                             f" found new values. Fit the profile to all data, or transform it at once.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class _CsvWriter(_OutputWriter):
+
+    def __init__(self, path: str, labels: list, n_rows: int = None, sep: str = ","):
+        super().__init__(path, labels, n_rows)
+        self.sep = sep
+        self._file = open(path, "w", newline="")
+        self._header: list | None = None  # the columns of the first chunk
+
+    def write(self, df: pd.DataFrame):
+        first = self._header is None
+        if first:
+            self._header = list(df.columns)
+        else:
+            self._check_columns(df, self._header)
+        df.to_csv(self._file, sep=self.sep, header=first)
+
+    def close(self):
+        if self._header is None:
+            # no chunks were written, still produce a valid file with a header
+            import pandas as pd  # imported here, as pandas is slow to import
+            pd.DataFrame(columns=self.labels).to_csv(self._file, sep=self.sep)
+        self._file.close()
+
+
+class _XlsxWriter(_OutputWriter):
+
+    def __init__(self, path: str, labels: list, n_rows: int = None):
+        super().__init__(path, labels, n_rows)
+        from openpyxl import Workbook
+
+        # write-only workbooks stream rows to disk instead of keeping all cells in memory
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet()
+        self._sheet.append([None] + [str(label) for label in self.labels])
+
+    def write(self, df: pd.DataFrame):
+        self._check_columns(df, self.labels)  # the header is written in advance
+        for row in df.itertuples(name=None):  # (index, value_1, value_2, ...)
+            self._sheet.append([_excel_value(val) for val in row])
+
+    def close(self):
+        self._workbook.save(self.path)
+
+
+def _excel_value(val: any) -> any:
+    # empty cells instead of NaN, like DataFrame.to_excel()
+    if isinstance(val, float) and math.isnan(val):
+        return None
+    return val
+
+
+class _NpyWriter(_OutputWriter):
+
+    def __init__(self, path: str, labels: list, n_rows: int = None):
+        super().__init__(path, labels, n_rows)
+        if n_rows is None:
+            raise ValueError("The number of rows must be known in advance to write a .npy file.")
+        from numpy.lib.format import open_memmap
+
+        self._array = open_memmap(path, mode="w+", dtype="float64", shape=(n_rows, len(self.labels)))
+        self._offset = 0
+
+        # numpy arrays have no column names -> store them in a sidecar file
+        labels_path = os.path.splitext(path)[0] + ".labels.json"
+        with open(labels_path, "w") as f:
+            json.dump(self.labels, f, default=str, indent=1)
+
+    def write(self, df: pd.DataFrame):
+        self._check_columns(df, self.labels)  # the labels are written in advance
+        n = len(df)
+        self._array[self._offset:self._offset + n] = df.to_numpy(dtype="float64")
+        self._offset += n
+
+    def close(self):
+        self._array.flush()
+        if self._offset == len(self._array):
+            del self._array
+            return
+        # fewer rows than expected, e.g. because empty rows at the end of an .xlsx file were dropped
+        import numpy as np  # imported here, as NumPy is slow to import
+
+        rows = np.array(self._array[:self._offset])
+        del self._array
+        np.save(self.path, rows)
+
+
+class _ParquetWriter(_OutputWriter):
+
+    def __init__(self, path: str, labels: list, n_rows: int = None):
+        super().__init__(path, labels, n_rows)
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Writing .parquet files requires pyarrow (pip install pyarrow).") from e
+        self._pa = pa
+        self._pq = pq
+        self._writer = None
+
+    def write(self, df: pd.DataFrame):
+        df = df.set_axis([str(label) for label in df.columns], axis=1)
+        table = self._pa.Table.from_pandas(df, preserve_index=False)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self.path, table.schema)
+        else:
+            # each chunk infers its own types, so they may differ slightly (e.g. int vs. float)
+            table = table.cast(self._writer.schema)
+        self._writer.write_table(table)  # every chunk becomes a row group
+
+    def close(self):
+        if self._writer is None:
+            schema = self._pa.schema([(str(label), self._pa.null()) for label in self.labels])
+            self._writer = self._pq.ParquetWriter(self.path, schema)
+        self._writer.close()
+
+
+def _open_writer(path: str, labels: list, n_rows: int = None) -> _OutputWriter:
+    # choose the output format based on the file extension
+    if path.endswith(".xlsx"):
+        return _XlsxWriter(path, labels, n_rows)
+    elif path.endswith(".csv"):
+        return _CsvWriter(path, labels, n_rows)
+    elif path.endswith(".tsv"):
+        return _CsvWriter(path, labels, n_rows, sep="\t")
+    elif path.endswith(".npy"):
+        return _NpyWriter(path, labels, n_rows)
+    elif path.endswith(".parquet"):
+        return _ParquetWriter(path, labels, n_rows)
+    else:
+        raise ValueError(f"Unexpected file extension: {path}")
@@ -0,0 +1,126 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from clevertable import ConversionProfile, Float
+from clevertable.__main__ import main, run, run_fit, run_transform_jsonl
+from clevertable._writers import _open_writer
+
+
+def _write_survey(path):
+    pd.DataFrame({
+        "Country": ["China", "France", "Italy", "Germany", "Nigeria", "India"],
+        "Age": [32, 45, 19, 56, 23, 34],
+        "Hospitalized": ["no", "yes", "yes", "yes", "no", "yes"],
+    }).to_csv(path, index=False)
+
+
+def test_chunked_csv_output(tmp_path):
+    src = str(tmp_path / "survey.csv")
+    out = str(tmp_path / "out.csv")
+    _write_survey(src)
+
+    run(src, out, ignore_columns=["Country"], chunk_size=4)
+
+    df = pd.read_csv(out, index_col=0)
+    assert sorted(df.columns) == ["Age", "Hospitalized"]
+    assert df.index.tolist() == [0, 1, 2, 3, 4, 5]
+    assert df["Age"].tolist() == [32, 45, 19, 56, 23, 34]
+    assert df["Hospitalized"].tolist() == [0, 1, 1, 1, 0, 1]
+
+
+def test_chunk_columns_must_match_header(tmp_path):
+    # e.g. a converter in extend mode adds a column for a value that is first seen in the second chunk
+    for name in ("out.csv", "out.xlsx"):
+        with _open_writer(str(tmp_path / name), ["Color=red"]) as writer:
+            writer.write(pd.DataFrame({"Color=red": [1]}))
+            with pytest.raises(ValueError, match="added: \\['Color=blue'\\], missing: \\[\\]"):
+                writer.write(pd.DataFrame({"Color=red": [0], "Color=blue": [1]}))
+
+
+def test_chunked_npy_output(tmp_path):
+    src = str(tmp_path / "survey.csv")
+    out = str(tmp_path / "out.npy")
+    _write_survey(src)
+
+    run(src, out, ignore_columns=["Country"], chunk_size=4)
+
+    arr = np.load(out)
+    with open(tmp_path / "out.labels.json") as f:
+        labels = json.load(f)
+    assert sorted(labels) == ["Age", "Hospitalized"]
+    assert arr.shape == (6, 2)
+    assert arr[:, labels.index("Age")].tolist() == [32, 45, 19, 56, 23, 34]
+    assert arr[:, labels.index("Hospitalized")].tolist() == [0, 1, 1, 1, 0, 1]
+
+
+def test_transform_jsonl(tmp_path):
+    src = str(tmp_path / "survey.csv")
+    profile_file = str(tmp_path / "survey.ct")
+    _write_survey(src)
+    run_fit(src, profile_file, ignore_columns=["Country"])
+
+    records_file = tmp_path / "records.jsonl"
+    records_file.write_text('{"Country": "Peru", "Age": 40, "Hospitalized": "yes"}\n'
+                            '\n'
+                            '{"Country": "Chile", "Age": "12", "Hospitalized": "No"}\n')
+    out = str(tmp_path / "out.jsonl")
+
+    run_transform_jsonl(profile_file, str(records_file), out, chunk_size=1)
+
+    with open(out) as f:
+        records = [json.loads(line) for line in f]
+    assert records == [{"Age": 40.0, "Hospitalized": 1},
+                       {"Age": 12.0, "Hospitalized": 0}]
+
+
+def test_main(tmp_path):
+    src = str(tmp_path / "survey.csv")
+    _write_survey(src)
+
+    # without a command, 'convert' is assumed
+    main([src, str(tmp_path / "out.csv"), "-i", "Country"])
+    main(["convert", src, str(tmp_path / "convert.csv"), "--ignore", "Country", "-c", "4"])
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "out.csv"), pd.read_csv(tmp_path / "convert.csv"))
+
+    # NaN is written as null in JSON Lines
+    profile_file = str(tmp_path / "survey.ct")
+    ConversionProfile({"Country": None, "Age": Float(default=float("nan"))}).fit(src).save(profile_file)
+    records_file = tmp_path / "records.jsonl"
+    records_file.write_text('{"Country": "Peru", "Age": "unknown", "Hospitalized": "yes"}\n')
+    main(["transform", profile_file, str(records_file), str(tmp_path / "out.jsonl"), "--jsonl"])
+    assert (tmp_path / "out.jsonl").read_text() == '{"Age": null, "Hospitalized": 1}\n'
+
+
+def test_file_named_like_command(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(SystemExit):
+        main(["fit", "out.csv"])  # the 'fit' command, which lacks the profile argument
+
+    # with a file of that name, it is converted as before there were commands
+    (tmp_path / "fit").write_text("")
+    with pytest.raises(ValueError, match="Cannot read file fit because the file extension is not supported"):
+        main(["fit", "out.csv"])
+
+
+def test_progress_metrics(tmp_path):
+    import io
+
+    from clevertable.__main__ import _ProgressPrinter
+
+    src = str(tmp_path / "survey.csv")
+    out = str(tmp_path / "out.csv")
+    _write_survey(src)
+    stderr = io.StringIO()
+
+    run(src, out, ignore_columns=["Country"], chunk_size=4, progress=_ProgressPrinter(stderr))
+
+    lines = stderr.getvalue().splitlines()
+    metrics = json.loads(lines[-1])
+    assert metrics["phase"] == "done"
+    assert (metrics["rows"], metrics["total_rows"]) == (6, 6)
+    assert set(metrics["phase_seconds"]) == {"read", "pre-process", "fit", "infer", "transform", "write"}
+    assert metrics["rows_per_second"] > 0
+    assert "read" in lines[0]  # the first report is printed right away, the others at most once per second
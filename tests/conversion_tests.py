@@ -1,5 +1,6 @@
 import numpy as np
 import pandas as pd
+import pytest
 
 from clevertable import *
 
@@ -307,7 +308,27 @@ def test_function_label_generation():
 
 
 def test_duplicated_column_names():
-    pass  # todo
+    df = pd.DataFrame({
+        "a": [1, 2, 3],
+        "b": [4, 5, 6],
+        "c": [7, 8, 9],
+    })
+
+    profile = ConversionProfile({
+        "a": Label("x"),
+        "b": Label("x"),
+        "c": [lambda v: (v, v), Label("x_1", "y")],
+    })
+    df = profile.fit_transform(df)
+
+    assert profile.column_names == {
+        "a": ("x_1_1",),
+        "b": ("x_2",),
+        "c": ("x_1_2", "y"),
+    }
+    assert profile.output_labels == ("x_1_1", "x_2", "x_1_2", "y")
+    assert df.columns.tolist() == ["x_1_1", "x_2", "x_1_2", "y"]
+    assert df["x_2"].tolist() == [4, 5, 6]
 
 
 def test_add_to_pipeline():
@@ -349,3 +370,308 @@ def test_profile_del():
     del profile["Test"]
     assert "Test" not in profile
 
+
+
+def test_fit_transform_evaluates_once():
+    calls = []
+
+    def double(x):
+        calls.append(x)
+        return 2 * x
+
+    df = pd.DataFrame({
+        "a": [1, 2, 3, 4],
+        "b": ["x", "5", "y", "6"],
+    })
+    profile = ConversionProfile({
+        "a": [double, double, Label("A")],
+        "b": [(Float(), Enumerate()), double],
+    }, pre_processing=None)
+    transformed = profile.fit_transform(df)
+
+    assert len(calls) == 3 * len(df)  # each function is called once per row
+    assert transformed["A"].tolist() == [4, 8, 12, 16]
+    assert transformed["b"].tolist() == [0, 10, 2, 12]
+    assert transformed.equals(profile.transform(df))
+
+
+def test_batch_transform():
+    binary = Binary(positive="yes", negative="no")
+    assert binary.transform_batch([("yes",), ("no",), ("yes",)]) == [(1,), (0,), (1,)]
+    try:
+        binary.transform_batch([("yes",), ("maybe",), ("no",), ("perhaps",)])
+        assert False, "expected ValueError"
+    except ValueError as e:
+        assert "'maybe' (row 1)" in str(e) and "'perhaps' (row 3)" in str(e)
+
+    int_map = Map({0: "zero", 1: "one", 3: "three"}, default="other")
+    rows = [(3,), (0,), (2,), (7,), ("x",)]
+    assert int_map.transform_batch(rows) == [int_map.transform(row) for row in rows]
+
+    strict_map = Map({"a": 1, "b": 2})
+    try:
+        strict_map.transform_batch([("a",), ("c",)])
+        assert False, "expected KeyError"
+    except KeyError as e:
+        assert "'c' (row 1)" in str(e)
+
+    df = pd.DataFrame({
+        "Diagnosis": ["benign", "cancer", "benign"],
+        "Hospitalized": ["no", "yes", "yes"],
+    })
+    profile = ConversionProfile({
+        "Diagnosis": Binary(positive="cancer", negative="benign"),
+        "Hospitalized": {"no": 0, "yes": 1},
+    }).fit(df)
+    records = df.to_dict(orient="records")
+    assert profile.transform(df).to_dict(orient="records") == [profile.transform_single(r) for r in records]
+
+
+def test_hashed_one_hot():
+    conv = HashedOneHot(8, signed=True)
+    assert conv.labels(("Name",)) == tuple(f"Name[{i}]" for i in range(8))
+
+    a, b = conv.transform(("alice",)), conv.transform(("bob",))
+    assert len(a) == 8 and sum(map(abs, a)) == 1
+    assert conv.transform(("alice",)) == HashedOneHot(8, signed=True).transform(("alice",))  # stable
+    assert conv.transform(("alice", "bob")) == tuple(x + y for x, y in zip(a, b))
+    assert conv.transform((None,)) == (0,) * 8
+    rows = [("alice",), ("bob",), ("alice", "bob"), ("carol",)]
+    assert conv.transform_batch(rows) == [conv.transform(row) for row in rows]
+
+    # high-cardinality columns are hashed instead of failing inference
+    df = pd.DataFrame({"id": [f"user {i}" for i in range(200)]})
+    profile = ConversionProfile(hash_buckets=16)
+    transformed = profile.fit_transform(df)
+    assert type(profile["id"]) is HashedOneHot
+    assert transformed.shape == (200, 16)
+    assert (transformed.sum(axis=1) == 1).all()
+
+
+def test_infer_cardinality_sketch():
+    from clevertable._sketch import _HyperLogLog
+    from clevertable._utils import _count_unique_up_to, _has_fewer_unique_than
+
+    sketch = _HyperLogLog()
+    sketch.update([f"id {i}" for i in range(20_000)] * 2)
+    assert abs(sketch.estimate() - 20_000) < 20_000 * 3 * sketch.relative_error
+
+    assert _count_unique_up_to(list(range(50)) * 3, 100) == 50
+    assert _count_unique_up_to(list(range(1000)), 100) == 101
+    assert _has_fewer_unique_than([i % 500 for i in range(20_000)], 2000)
+    assert not _has_fewer_unique_than(list(range(20_000)), 2000)
+
+    # 500 distinct values in 20000 rows (< 10%) -> Enumerate, near-unique -> cannot be inferred
+    df = pd.DataFrame({"a": [f"v{i % 500}" for i in range(20_000)], "b": [f"w{i}" for i in range(20_000)]})
+    profile = ConversionProfile(ignore_uninferrable=True)
+    profile.fit(df)
+    assert type(profile["a"]) is Enumerate
+    assert type(profile["b"]) is Ignore
+
+
+def test_scalar_transform():
+    for conv, values in [
+        (Float(default=0.0), [1, "2.5", "x", None]),
+        (Binary(positive="yes"), ["yes", "no"]),
+        (Enumerate("a", "b", "c"), ["c", "a"]),
+        (Map({"low": 0, "high": 1}, default=-1), ["low", "high", "mid"]),
+        (Pipeline(Id(), Float()), [3, "4"]),
+    ]:
+        scalar = conv.scalar_transform()
+        assert [scalar(val) for val in values] == [conv.transform((val,))[0] for val in values]
+    assert OneHot("a", "b").scalar_transform() is None
+    assert Map({"low": 0, "high": 1}, default=(-1, -1)).scalar_transform() is None
+
+    # unknown values of a capped Enumerate all get the 'other' code, and are not remembered one by one
+    capped = Enumerate(min_frequency=2)
+    capped.fit([("a",), ("a",), ("b",)])
+    scalar = capped.scalar_transform()
+    assert [scalar(f"unknown {i}") for i in range(100)] == [1] * 100
+    index = next(cell.cell_contents for cell in scalar.__closure__ if isinstance(cell.cell_contents, dict))
+    assert list(index) == ["a"]
+
+    # the fast path of transform() keeps the error context
+    profile = ConversionProfile({"Grade": Enumerate("a", "b"), "Color": OneHot()})
+    profile.fit(pd.DataFrame({"Grade": ["a", "b"], "Color": ["red", "blue"]}))
+    assert profile.transform_single({"Grade": "b", "Color": "red"}) == {"Grade": 1, "Color=red": 1, "Color=blue": 0}
+    with pytest.raises(ValueError, match="at key 'Grade'"):
+        profile.transform_single({"Grade": "z", "Color": "red"})
+
+
+def test_extend():
+    profile = ConversionProfile({"Color": OneHot(extend=True),
+                                 "Size": Enumerate(extend=True),
+                                 "Tags": List(extend=True)})
+    profile.fit(pd.DataFrame({"Color": ["red", "blue"], "Size": ["s", "m"], "Tags": ["a, b", "b"]}))
+    assert profile.transform_single({"Color": "red", "Size": "m", "Tags": "a"}) \
+           == {"Color=blue": 0, "Color=red": 1, "Size": 0, "Tags=a": 1, "Tags=b": 0}
+
+    transformed = profile.transform(pd.DataFrame({"Color": ["green", "red"], "Size": ["l", "s"], "Tags": ["b", "c"]}))
+    # existing codes and columns are unchanged, new ones are appended
+    assert list(transformed.columns) == ["Color=blue", "Color=red", "Color=green", "Size", "Tags=a", "Tags=b", "Tags=c"]
+    assert transformed["Color=green"].tolist() == [1, 0]
+    assert transformed["Size"].tolist() == [2, 1]
+    assert transformed["Tags=c"].tolist() == [0, 1]
+    assert profile.added_labels == ("Color=green", "Tags=c")
+    assert profile["Size"].added_values == ("l",)
+    assert repr(profile["Size"]) == "Enumerate('m', 's', 'l', extend=True)"
+
+    with pytest.raises(ValueError):
+        Enumerate("a").transform(("b",))
+
+
+def test_try_batch(monkeypatch):
+    rows = [("1.5",), ("x",), (7,), ("y",), ("z",)]
+    for conv in [Try(Float(), Enumerate()),
+                 Try({"x": 1, "y": 2}, Const(0)),
+                 Try(Binary(positive="x", negative="y"), Float(), Const(-1))]:
+        conv.fit(rows)
+        expected = [conv.transform(row) for row in rows]
+        # the rows that the converters cannot handle are passed on in bulk, without exceptions
+        for converter in (Float, Enumerate, Binary):
+            monkeypatch.setattr(converter, "transform", lambda *args: pytest.fail("transform() was called"))
+        assert conv.transform_batch(rows) == expected
+        monkeypatch.undo()
+
+    # exceptions that are not ignored are still raised
+    conv = Try(Enumerate("x"), exceptions=[KeyError])
+    with pytest.raises(ValueError):
+        conv.transform_batch([("y",)])
+
+    # an Infer() converter that gets no rows to fit cannot be used
+    for fit in (Try(Float(), Infer()).fit, Try(Float(), Infer()).fit_transform):
+        with pytest.warns(UserWarning), pytest.raises(ValueError, match="position 1 did not infer a converter"):
+            fit([("1",), ("2",)])
+
+
+def test_date_time():
+    from datetime import datetime
+
+    df = pd.DataFrame({
+        "Visit": ["04.03.2021", "31.12.2020", "", "01.01.1970"],
+        "Born": [datetime(1990, 5, 6), datetime(1985, 1, 2), datetime(2000, 12, 31), datetime(1970, 1, 1)],
+        "Country": ["China", "France", "Italy", "Germany"],
+    })
+    profile = ConversionProfile({"Born": DateTime(components=("year", "weekday"))})
+    transformed = profile.fit_transform(df)
+    # the format is detected once, and missing values become NaN
+    assert repr(profile["Visit"]) == "DateTime(format='%d.%m.%Y', default=nan)"
+    assert transformed["Visit"].tolist()[:2] == [1614816000.0, 1609372800.0]
+    assert np.isnan(transformed["Visit"][2]) and transformed["Visit"][3] == 0.0
+    assert transformed["Born.year"].tolist() == [1990, 1985, 2000, 1970]
+    assert transformed["Born.weekday"].tolist() == [6, 2, 6, 3]
+    assert isinstance(profile["Country"], OneHot)
+    # the whole column is parsed at once, with the same results as single values
+    assert profile.transform_single(df.iloc[0].to_dict()) == transformed.iloc[0].to_dict()
+
+    with pytest.raises(ValueError, match="'not a date' \\(row 1\\)"):
+        DateTime(format="%Y-%m-%d").transform_batch([("2021-03-04",), ("not a date",)])
+    # single strings that don't fit, e.g. the first one of the sample, don't prevent the detection
+    dates = [f"2021-03-{day:02d}" for day in range(1, 29)]
+    converter = DateTime(default=float("nan"))
+    converter.fit([(val,) for val in dates + ["junk21"]])
+    assert converter.format == "%Y-%m-%d"
+
+
+def test_date_time_inference_is_bounded():
+    import tracemalloc
+
+    from clevertable.DateTime import _FORMAT_SAMPLE_SIZE, _format_sample, _infer_date_time
+
+    values = [f"user {i}" for i in range(100_000)]  # distinct strings that are no dates
+    tracemalloc.start()
+    try:
+        # a set of all distinct strings would take megabytes
+        sample = _format_sample(values)
+        assert tracemalloc.get_traced_memory()[1] < 100_000
+        tracemalloc.reset_peak()
+        assert _infer_date_time(values) is None
+        assert tracemalloc.get_traced_memory()[1] < 100_000
+    finally:
+        tracemalloc.stop()
+    assert len(sample) == _FORMAT_SAMPLE_SIZE
+    # the same sample for any order of the values, and for the samples of parts of the values
+    assert _format_sample(values[::-1]) == sample
+    assert _format_sample(_format_sample(values[:50_000]) | _format_sample(values[50_000:])) == sample
+
+
+def test_inverse_transform():
+    assert OneHot("a", "b", "c").inverse_transform(np.array([[0.1, 0.7, 0.2], [0, 0, 0], [1, 0, 0]])).tolist() \
+           == ["b", None, "a"]
+    assert Enumerate("a", "b", "c").inverse_transform(np.array([[1.2], [-3], [7], [np.nan]])).tolist() \
+           == ["b", "a", "c", None]
+    assert Binary(positive="yes", negative="no").inverse_transform(np.array([0.9, 0.1])).tolist() == ["yes", "no"]
+    lookup = Map({"low": 0, "mid": 1, "high": 2, "none": 0})
+    assert lookup.inverse_transform(np.array([[1.4], [-1], [0]])).tolist() == ["mid", "low", "low"]
+    pairs = Map({"a": ("x", "y"), "b": ("z", "w")})
+    assert pairs.inverse_transform(np.array([["z", "w"], ["x", "w"]], dtype=object)).tolist() == ["b", None]
+    with pytest.raises(ValueError, match="expects 3 output columns"):
+        OneHot("a", "b", "c").inverse_transform(np.zeros((2, 2)))
+
+    df = pd.DataFrame({
+        "Country": ["China", "France", "Italy", "China"],
+        "Level": ["low", "high", "mid", "low"],
+        "Smoker": ["yes", "no", "no", "yes"],
+        "Age": [32, 45, 19, 56],
+        "User": ["a", "b", "c", "d"],
+    })
+    profile = ConversionProfile({"Level": {"low": 0, "mid": 1, "high": 2}, "User": HashedOneHot(4)})
+    transformed = profile.fit_transform(df)
+    decoded = profile.inverse_transform(transformed.to_numpy())
+    assert "User" not in decoded  # can't be inverted
+    assert decoded.to_dict(orient="list") == {
+        "Level": ["low", "high", "mid", "low"],
+        "Country": ["china", "france", "italy", "china"],  # pre-processed values
+        "Smoker": ["yes", "no", "no", "yes"],
+        "Age": [32.0, 45.0, 19.0, 56.0],
+    }
+    # e.g. predicted probabilities of a single input column
+    predicted = (transformed[list(profile.column_names["Country"])] * 0.8).set_axis([5, 6, 7, 8])
+    decoded = profile.inverse_transform(predicted)
+    assert decoded.index.tolist() == [5, 6, 7, 8]
+    assert decoded.to_dict(orient="list") == {"Country": ["china", "france", "italy", "china"]}
+
+
+def test_category_caps():
+    n = 100
+    df = pd.DataFrame({
+        "Country": [["China", "France", "Italy", "Peru", "Chile"][min(i % 10, 4)] for i in range(n)],
+        "Code": [f"c{i % 20 if i < 60 else 0}" for i in range(n)],
+        "Symptoms": [["cough, fever", "fever", "cough", "rash, fever"][i % 4] for i in range(n)],
+    })
+
+    def declared():
+        return {"Country": OneHot(max_categories=2), "Code": Enumerate(min_frequency=3),
+                "Symptoms": List(max_categories=2)}
+
+    profile = ConversionProfile(declared()).fit(df)
+    # chile is the most frequent value, the others occur equally often -> sorted order
+    assert repr(profile["Country"]) == "OneHot('chile', 'china', max_categories=2," \
+                                       " other_values=('france', 'italy', 'peru'))"
+    assert profile["Code"].values == ("c0", "c1", "c10", "c11", "c12", "c13", "c14", "c15", "c16", "c17", "c18",
+                                      "c19", "c2", "c3", "c4", "c5", "c6", "c7", "c8", "c9")
+    assert profile["Symptoms"].values == ("cough", "fever") and profile["Symptoms"].other_values == ("rash",)
+    assert profile.column_names["Country"] == ("Country=chile", "Country=china", "Country=other")
+    assert profile.column_names["Symptoms"] == ("Symptoms=cough", "Symptoms=fever", "Symptoms=other")
+
+    # unknown values are counted as other, too
+    assert profile.transform_single({"Country": "Japan", "Code": "x", "Symptoms": "rash, cough"}) == \
+           {"Country=chile": 0, "Country=china": 0, "Country=other": 1, "Code": 20,
+            "Symptoms=cough": 1, "Symptoms=fever": 0, "Symptoms=other": 1}
+    assert profile.transform_single({"Country": "China", "Code": "c3", "Symptoms": ""})["Country=other"] == 0
+    assert profile.compile()({"Country": "Japan", "Code": "x", "Symptoms": "rash"}) == \
+           profile.transform_single({"Country": "Japan", "Code": "x", "Symptoms": "rash"})
+    # the cap doesn't depend on how the data is fitted
+    merged = ConversionProfile(declared())
+    merged.merge(*(merged.partial_fit(part) for part in (df.iloc[:30], df.iloc[30:])))
+    assert repr(merged) == repr(profile)
+    assert repr(ConversionProfile(declared()).fit(df.astype("category"))) == repr(profile)
+
+    inferred = ConversionProfile(max_categories=3).fit(df)
+    assert repr(inferred["Code"]) == "Enumerate('c0', 'c1', 'c10', max_categories=3, other_values=('c11', 'c12'," \
+                                     " 'c13', 'c14', 'c15', 'c16', 'c17', 'c18', 'c19', 'c2', 'c3', 'c4', 'c5'," \
+                                     " 'c6', 'c7', 'c8', 'c9'))"
+    assert inferred.transform(df)["Code"].max() == 3
+
+    with pytest.raises(ValueError, match="extend=True cannot be combined"):
+        OneHot(extend=True, max_categories=3)
@@ -0,0 +1,466 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import pandas as pd
+import pytest
+
+from clevertable import *
+
+
+def _survey() -> pd.DataFrame:
+    return pd.DataFrame({
+        "Country": ["China", "France", "Italy", "Germany", "Nigeria", "India"],
+        "Age": [32, 45, 19, 56, 23, 34],
+        "Diagnosis": ["benign", "cancer", "benign", "cancer", "benign", "benign"],
+    })
+
+
+def test_transform_async():
+    df = _survey()
+    profile = ConversionProfile({
+        "Country": Enumerate(),
+        "Diagnosis": Binary(positive="cancer", negative="benign"),
+    }).fit(df)
+
+    batch_sizes = []
+    transform_records = profile.transform_records
+
+    def counting_transform_records(rows):
+        batch_sizes.append(len(rows))
+        return transform_records(rows)
+
+    profile.transform_records = counting_transform_records
+    profile.set_async_batching(max_batch_size=4, max_wait=0.01)
+
+    records = df.to_dict(orient="records")
+
+    async def transform_all():
+        return await asyncio.gather(*(profile.transform_async(record) for record in records))
+
+    results = asyncio.run(transform_all())
+
+    assert results == [profile.transform_single(record) for record in records]
+    assert batch_sizes == [4, 2]
+
+
+def test_transform_async_error_is_isolated():
+    profile = ConversionProfile({"Country": Enumerate()}).fit(pd.DataFrame({"Country": ["China", "France"]}))
+
+    async def transform_all():
+        return await asyncio.gather(profile.transform_async({"Country": "China"}),
+                                    profile.transform_async({"Country": "Atlantis"}),
+                                    return_exceptions=True)
+
+    good, bad = asyncio.run(transform_all())
+    assert good == {"Country": 0}
+    assert isinstance(bad, ValueError)
+
+
+def test_transform_errors():
+    profile = ConversionProfile({
+        "Country": Enumerate(),
+        "Age": [str, Float()],
+    }).fit(_survey()[["Country", "Age"]])
+
+    df = pd.DataFrame({
+        "Country": ["China", "Atlantis", "Italy"],
+        "Age": ["12", "13", "unknown"],
+    }, index=[10, 11, 12])
+
+    coerced = profile.transform(df, errors="coerce")
+    assert coerced["Country"].tolist()[::2] == [0, 4]
+    assert coerced["Country"].isna().tolist() == [False, True, False]
+    assert coerced["Age"].isna().tolist() == [False, False, True]
+
+    collected, failures = profile.transform(df, errors="collect")
+    assert collected.equals(coerced)
+    assert collected.index.tolist() == [10, 11, 12]  # the rows of the failures are found in the output
+    assert [(f.row, f.key, f.value, f.exception) for f in failures] == [
+        (11, "Country", "Atlantis", "ValueError"),
+        (12, "Age", "unknown", "ValueError"),
+    ]
+    assert failures[0].converter == "Enumerate"
+    assert failures[1].converter == "Pipeline > Float"
+    nested = ConversionProfile({"Age": Try([str, Float()], exceptions=[KeyError])}).fit(_survey()[["Age"]])
+    assert [f.converter for f in nested.transform(df[["Age"]], errors="collect")[1]] == ["Try > Pipeline > Float"]
+
+
+def test_transform_error_row():
+    calls = []
+
+    def check(val):
+        calls.append(val)
+        if val == "unknown":
+            raise ValueError("not an age")
+        return float(val)
+
+    profile = ConversionProfile({"Age": Function(check), "Country": Enumerate()}).fit(_survey()[["Age", "Country"]])
+    df = pd.DataFrame({"Age": ["12", "13", "unknown", "14"], "Country": ["china"] * 4})
+    for table in (df, df.astype("category")):
+        calls.clear()
+        with pytest.raises(Exception, match="row 2:\n    at key 'Age':\n    ValueError during Function.transform"):
+            profile.transform(table)
+        # only the failing converter is called again, up to the failing row
+        assert calls == ["12", "13", "unknown"] * 2
+    with pytest.raises(ValueError, match="'Country':\nColumn is missing"):
+        profile.transform(df[["Age"]])
+
+    # for a single record, the keys that were transformed before the failing one are not transformed again
+    calls.clear()
+    with pytest.raises(ValueError, match="at key 'Country':\nValueError during Enumerate.transform"):
+        profile.transform_single({"Age": "12", "Country": "Atlantis"})
+    assert calls == ["12"]
+
+    # fit_transform() reports a wrong number of outputs with the same context as transform()
+    profile = ConversionProfile({"n": Function(lambda v: [0] * int(v), labels=lambda label: ("a", "b"))})
+    with pytest.raises(Exception, match="row 2:\n    at 'n': Output length of Function converter mismatches"):
+        profile.fit_transform(pd.DataFrame({"n": ["2", "2", "3"]}))
+
+    # an error of labels() for an output of a new length is not hidden by the length check
+    label_calls = []
+
+    def labels(label):
+        label_calls.append(label)
+        if len(label_calls) > 1:
+            raise RuntimeError("no labels after fit()")
+        return "a", "b"
+
+    profile = ConversionProfile({"n": Function(lambda v: [0] * int(v), labels=labels)}).fit(pd.DataFrame({"n": ["2"]}))
+    with pytest.raises(ValueError, match="at key 'n':\nRuntimeError during Function.labels\\(\\):\n    no labels"):
+        profile.transform_single({"n": "3"})
+
+
+def test_lazy_imports():
+    # converters and RecordProfile must not load pandas or NumPy
+    code = ("import sys, clevertable\n"
+            "from clevertable.RecordProfile import RecordProfile\n"
+            "rows = [({'a': 'x', 'b': 'yes'},), ({'a': 'z', 'b': 'no'},)]\n"
+            "profile = RecordProfile({'b': clevertable.Binary()})\n"
+            "profile.fit(rows)\n"
+            "profile.fit_transform(rows), profile.transform(rows[0]), profile.transform_batch(rows)\n"
+            "list(profile.transform_many(row[0] for row in rows))\n"
+            "list(profile.transform_many((row[0] for row in rows), as_columns=True))\n"
+            "print(sorted(m for m in ('pandas', 'numpy', 'openpyxl') if m in sys.modules))")
+    import clevertable
+    env = {**os.environ, "PYTHONPATH": os.path.dirname(os.path.dirname(clevertable.__file__))}
+    output = subprocess.run([sys.executable, "-c", code], env=env, check=True, capture_output=True, text=True).stdout
+    assert output.strip() == "[]"
+
+    assert clevertable.Binary is Binary  # the class, not the submodule of the same name
+    assert "ListAndOr" in dir(clevertable)
+
+
+def test_fit_cache(tmp_path, monkeypatch):
+    source = str(tmp_path / "survey.csv")
+    _survey().to_csv(source, index=False)
+    cache = FitCache(str(tmp_path / "cache"))
+
+    expected = ConversionProfile({"Diagnosis": Binary(positive="cancer")}).fit(source, cache=cache).transform(source)
+    assert len(os.listdir(cache.directory)) == 1
+
+    # a cache hit neither fits nor reads the file
+    from clevertable.RecordProfile import RecordProfile
+    monkeypatch.setattr(RecordProfile, "fit", lambda *args: pytest.fail("fit() was called"))
+    monkeypatch.setattr(pd, "read_csv", lambda *args, **kwargs: pytest.fail("file was read"))
+    profile = ConversionProfile({"Diagnosis": Binary(positive="cancer")}).fit(source, cache=cache)
+    monkeypatch.undo()
+    pd.testing.assert_frame_equal(profile.transform(source), expected)
+
+    # a different configuration or different data is a cache miss
+    ConversionProfile({"Diagnosis": Binary(positive="benign")}).fit(source, cache=cache)
+    ConversionProfile({"Diagnosis": Binary(positive="cancer")}).fit(_survey().iloc[:3], cache=cache)
+    assert len(os.listdir(cache.directory)) == 3
+
+    # edited functions and the complete state of converters are part of the fingerprint
+    def clean(val):
+        return val
+
+    fingerprint = cache.fingerprint(source, ConversionProfile(pre_processing=clean))
+    assert fingerprint == cache.fingerprint(source, ConversionProfile(pre_processing=clean))
+
+    def clean(val):
+        return val.strip()
+
+    assert fingerprint != cache.fingerprint(source, ConversionProfile(pre_processing=clean))
+    assert cache.fingerprint(source, ConversionProfile({"Age": Try(Float(), exceptions=[ValueError])})) \
+           != cache.fingerprint(source, ConversionProfile({"Age": Try(Float(), exceptions=[TypeError])}))
+
+    # eviction by age and by size
+    old = time.time() - 3600
+    for name in os.listdir(cache.directory)[:1]:
+        os.utime(os.path.join(cache.directory, name), (old, old))
+    FitCache(cache.directory, max_age=60).evict()
+    assert len(os.listdir(cache.directory)) == 2
+    FitCache(cache.directory, max_size=1).evict()
+    assert os.listdir(cache.directory) == []
+
+
+def test_transform_xlsx_chunks(tmp_path):
+    path = str(tmp_path / "survey.xlsx")
+    df = _survey()
+    with pd.ExcelWriter(path) as writer:
+        df.to_excel(writer, sheet_name="first", index=False)
+        df.iloc[::-1].to_excel(writer, sheet_name="second", index=False)
+
+    profile = ConversionProfile({"Diagnosis": Binary(positive="cancer")}).fit(df[["Age", "Diagnosis"]])
+    expected = profile.transform(df)
+
+    # the worksheet is read chunk by chunk
+    chunks = list(profile.transform_chunks(path, chunk_size=4, columns=["Age", "Diagnosis"]))
+    assert [len(chunk) for chunk in chunks] == [4, 2]
+    pd.testing.assert_frame_equal(pd.concat(chunks), expected, check_dtype=False)
+    assert chunks[0].attrs["sheet"] == "first"
+
+    # several worksheets, in parallel
+    for n_jobs in (1, 2):
+        chunks = list(profile.transform_chunks(path, chunk_size=4, sheets="*", n_jobs=n_jobs))
+        assert [chunk.attrs["sheet"] for chunk in chunks] == ["first", "first", "second", "second"]
+        second = pd.concat(chunks[2:])
+        assert second["Diagnosis"].tolist() == expected["Diagnosis"].tolist()[::-1]
+
+    with pytest.raises(ValueError, match="not found"):
+        list(profile.transform_chunks(path, sheets="third"))
+
+
+
+def test_read_xlsx_formatted_empty_rows(tmp_path):
+    from openpyxl import Workbook
+    from openpyxl.styles import Font
+
+    path = str(tmp_path / "formatted.xlsx")
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.append(["Smoker", "Count"])
+    for row in [["yes", 1], ["no", 2], ["yes", 3]]:
+        worksheet.append(row)
+    worksheet["A10"].font = Font(bold=True)  # formatted, but empty -> the worksheet seems to have 10 rows
+    workbook.save(path)
+
+    expected = pd.read_excel(path)
+    profile = ConversionProfile().fit(path)
+    assert repr(profile["Smoker"]) == "Binary()"
+    assert repr(profile["Count"]) == "Float()"
+    pd.testing.assert_frame_equal(profile.transform(path), profile.transform(expected))
+    chunks = list(profile.transform_chunks(path, chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+
+def test_compile(tmp_path):
+    df = _survey()
+    df["Symptoms"] = ["cough, fever", "fever", "cough", "fever, cough", "", "cough"]
+    profile = ConversionProfile({
+        "Diagnosis": Binary(positive="cancer", negative="benign"),
+        ("Country", "Age"): [Id(), Label("C", "A")],
+    }).fit(df)
+    records = df.to_dict(orient="records")
+
+    # List() is not compiled, but called as usual
+    transform = profile.compile()
+    assert [transform(record) for record in records] == [profile.transform_single(record) for record in records]
+
+    # errors are raised by the interpreted path
+    with pytest.raises(ValueError, match="at key 'Diagnosis'"):
+        transform({**records[0], "Diagnosis": "unknown"})
+
+    with pytest.raises(ValueError, match="'Symptoms'"):
+        profile.compile(str(tmp_path / "compiled.py"))
+    del profile["Symptoms"]
+    profile.compile(str(tmp_path / "compiled.py"))
+    # the standalone module doesn't need clevertable
+    result = subprocess.run([sys.executable, "-c", f"import compiled; print(compiled.transform({records[1]}))"],
+                            cwd=tmp_path, capture_output=True, text=True, check=True)
+    assert eval(result.stdout) == profile.transform_single(records[1])
+
+
+def test_transform_many():
+    from clevertable.RecordProfile import RecordProfile
+
+    records = _survey().to_dict(orient="records")
+    profile = RecordProfile({"Country": Ignore(), "Diagnosis": Binary(positive="cancer")})
+    profile.fit([(record,) for record in records])
+    expected = [profile.transform((record,))[0] for record in records]
+
+    def stream():  # a generator, which can only be consumed once
+        yield from records
+
+    transformed = profile.transform_many(stream(), batch_size=4)
+    assert next(transformed) == expected[0]  # lazy
+    assert [expected[0]] + list(transformed) == expected
+
+    batches = list(profile.transform_many(stream(), batch_size=4, as_columns=True))
+    assert [batch["Diagnosis"] for batch in batches] == [[0, 1, 0, 1], [0, 0]]
+
+    with pytest.raises(ValueError, match="at key 'Age'"):
+        list(profile.transform_many([{"Country": "Peru", "Diagnosis": "benign"}]))
+
+
+def test_frozen_profile_concurrent():
+    from concurrent.futures import ThreadPoolExecutor
+
+    df = pd.concat([_survey()] * 50, ignore_index=True)
+    profile = ConversionProfile({"Country": OneHot(), "Diagnosis": {"benign": 0, "cancer": 1}}).fit(df)
+    frozen = profile.freeze()
+    expected = profile.transform(df)
+    records = df.to_dict(orient="records")
+    expected_records = [profile.transform_single(record) for record in records]
+
+    profile.fit(df.iloc[:2])  # the frozen copy doesn't change
+    with pytest.raises(AttributeError):
+        frozen.pre_processing = None
+
+    def work(i: int):
+        if i % 2:
+            pd.testing.assert_frame_equal(frozen.transform(df, n_threads=3), expected)
+        else:
+            assert [frozen.transform_single(record) for record in records] == expected_records
+
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(work, range(64)))  # re-raises any failure
+
+    with pytest.raises(ValueError, match="extend mode"):
+        ConversionProfile({"Country": [Id(), OneHot(extend=True)]}).fit(df).freeze()
+
+
+def test_transform_columns():
+    df = _survey()
+    df["Symptoms"] = ["cough, fever", "fever", "cough", "fever, cough", "", "cough"]
+    df["User"] = [f"user {i}" for i in range(len(df))]
+    profile = ConversionProfile({"Country": OneHot(), "User": HashedOneHot(4)}).fit(df)
+    expected = profile.transform(df)
+
+    columns = ["Symptoms=fever", "User[2]", "Country=italy", "Age"]
+    pd.testing.assert_frame_equal(profile.transform(df, columns=columns), expected[columns])
+    # input keys stand for all of their output columns
+    pd.testing.assert_frame_equal(profile.transform(df, columns=["Symptoms"]),
+                                  expected[list(profile.column_names["Symptoms"])])
+
+    # only the requested values are computed, and other columns are not even read
+    projected, _ = profile._record_profile._project(columns)
+    assert projected["Country"].values == ("italy",)
+    assert projected["Symptoms"].values == ("fever",)
+    assert "Diagnosis" not in projected
+    df["Diagnosis"] = ["unknown"] * len(df)  # would fail to transform
+    pd.testing.assert_frame_equal(profile.transform(df, columns=columns), expected[columns])
+
+    with pytest.raises(ValueError, match="'Height'"):
+        profile.transform(df, columns=["Height"])
+    extending = ConversionProfile({"Country": [Id(), OneHot(extend=True)]}).fit(df)
+    with pytest.raises(ValueError, match="extend mode: 'Country'"):
+        extending.transform(df, columns=["Country=italy"])
+
+
+def test_merge():
+    import pickle
+
+    n = 300
+    df = pd.DataFrame({
+        "Country": [["China", "France", "Italy", "Germany", "Nigeria"][i % 5] for i in range(n)],
+        "Smoker": [["yes", "no"][i % 3 == 0] for i in range(n)],
+        "Age": [(i * 7) % 80 + 0.1 * (i % 3) for i in range(n)],
+        "Height": [150 + (i * 13) % 50 if i % 11 else None for i in range(n)],
+        "Weight": [60 + (i * 3) % 40 for i in range(n)],
+        "Admission": [f"2024-{(i % 12) + 1:02d}-{(i % 28) + 1:02d}" for i in range(n)],
+        "Symptoms": [["cough", "fever", "cough, fever", "headache"][i % 4] for i in range(n)],
+        "Code": [f"c{i % 150}" for i in range(n)],
+        "Zone": [i % 4 for i in range(n)],
+    })
+    df.loc[250:, "Country"] = "Peru"  # only in the last part
+    def declared():
+        return {
+            "Height": Float(default="median"),
+            "Weight": Float(default="mean"),
+            "Zone": Float(default="mode"),
+            "Smoker": Binary(),
+            "Code": Enumerate(),
+        }
+
+    expected = ConversionProfile(declared()).fit(df)
+
+    profile = ConversionProfile(declared())
+    parts = [df.iloc[:100], df.iloc[100:130], df.iloc[130:]]
+    summaries = [pickle.loads(pickle.dumps(profile.partial_fit(part))) for part in parts]
+    assert repr(profile["Code"]) == "Enumerate()"  # not changed by partial_fit()
+    profile.merge(*summaries)
+
+    assert repr(profile) == repr(expected)
+    assert profile["Weight"].default == expected["Weight"].default
+    assert (profile["Smoker"].positive, profile["Smoker"].negative) == ({"yes"}, {"no"})
+    assert profile["Country"].values[-1] == "peru"
+    pd.testing.assert_frame_equal(profile.transform(df), expected.transform(df))
+
+    with pytest.raises(ValueError, match="doesn't support fitting on parts"):
+        ConversionProfile({"Age": [str, Float()]}).partial_fit(df)
+
+
+def test_categorical_columns():
+    n = 400
+    df = pd.DataFrame({
+        "Country": [["China", "France", None, "Italy"][i % 4] for i in range(n)],
+        "Smoker": [["yes", "no"][i % 3 == 0] for i in range(n)],
+        "Zone": [[3, 1, 2][i % 3] for i in range(n)],
+        "Weight": [[60.0, 75.5, 80.0, None][i % 4] for i in range(n)],
+        "Symptoms": [["cough", "fever", "cough, fever"][i % 3] for i in range(n)],
+    })
+    categorical = df.astype("category")
+    assert isinstance(categorical["Zone"].dtype, pd.CategoricalDtype)
+
+    def declared():
+        return {"Zone": Float(default="mode"), "Weight": Float(default="mean"), "Symptoms": List()}
+
+    expected = ConversionProfile(declared()).fit(df)
+    profile = ConversionProfile(declared()).fit(categorical)
+
+    assert repr(profile) == repr(expected)
+    assert profile["Weight"].default == expected["Weight"].default
+    pd.testing.assert_frame_equal(profile.transform(categorical), expected.transform(df))
+    pd.testing.assert_frame_equal(profile.transform(categorical.iloc[::-7]), expected.transform(df.iloc[::-7]))
+
+
+def test_progress(tmp_path):
+    df = pd.DataFrame({
+        "Country": ["China", "France", "Italy", "Germany", "Nigeria", "India"] * 5,
+        "Age": list(range(30)),
+    })
+    path = str(tmp_path / "survey.csv")
+    df.to_csv(path, index=False)
+
+    reports = []
+    profile = ConversionProfile({"Age": Float()}).fit(path, progress=reports.append)
+    assert [(p.phase, p.key) for p in reports] == [("read", None), ("pre-process", None), ("fit", "Age"),
+                                                   ("infer", "Country"), ("infer", "Country"), ("done", None)]
+    done = reports[-1]
+    assert (done.rows, done.total_rows, done.remaining) == (30, 30, 0.0)
+    assert set(done.phase_seconds) == {"read", "pre-process", "fit", "infer"}
+    assert done.rows_per_second > 0
+
+    reports = []
+    chunks = list(profile.transform_chunks(df, chunk_size=8, progress=reports.append))
+    assert len(chunks) == 4
+    assert sorted({p.rows for p in reports}) == [0, 8, 16, 24, 30]  # counted after each chunk
+    assert all(p.total_rows == 30 for p in reports)
+    assert reports[-1].phase == "done" and reports[-1].rows == 30
+    assert [p.phase for p in reports].count("done") == 1
+
+    reports = []
+    profile.transform(df, progress=reports.append)
+    assert reports[-1].as_dict()["rows"] == 30
+    # the column of each key is reported while it is transformed
+    assert [p.key for p in reports if p.phase == "transform" and p.rows == 0] == ["Age", "Country"]
+
+
+def test_categorical_columns_merged_by_pre_processing():
+    # 'Yes' and 'yes' are different categories, but the same value after pre-processing
+    values = ["Yes"] * 5 + ["yes"] * 5 + ["No"] * 3 + ["maybe"] * 4
+    df = pd.DataFrame({"Answer": values, "Inferred": values})
+    categorical = df.astype("category")
+
+    def declared():
+        return {"Answer": OneHot(min_frequency=6)}
+
+    expected = ConversionProfile(declared(), max_categories=2).fit(df)
+    profile = ConversionProfile(declared(), max_categories=2).fit(categorical)
+    assert repr(expected["Answer"]) == "OneHot('yes', min_frequency=6, other_values=('maybe', 'no'))"
+    assert repr(profile) == repr(expected)
+    pd.testing.assert_frame_equal(profile.transform(categorical), expected.transform(df))